@@ -1,9 +1,31 @@
-from .rag_agent import RAGAgent
-from .stores import TextStore, MetaStore, TableStore, ExternalDBStore
-from .loaders import TextLoader, TableLoader
-from .connectors import ExternalDBConnector
-from .tasks import QuestionAnsweringTask, ChartGenerationTask
-from .retrievers import TableRetriever, SQLRetriever, VectorRetriever
+from typing import TYPE_CHECKING
+
+from agenticrag.utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .rag_agent import RAGAgent
+    from .stores import TextStore, MetaStore, TableStore, ExternalDBStore
+    from .loaders import TextLoader, TableLoader
+    from .connectors import ExternalDBConnector
+    from .tasks import QuestionAnsweringTask, ChartGenerationTask
+    from .retrievers import TableRetriever, SQLRetriever, VectorRetriever
+
+# Submodules are imported on first attribute access, keeping `import agenticrag` cheap.
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RAGAgent": ".rag_agent",
+    "TextStore": ".stores",
+    "MetaStore": ".stores",
+    "TableStore": ".stores",
+    "ExternalDBStore": ".stores",
+    "TextLoader": ".loaders",
+    "TableLoader": ".loaders",
+    "ExternalDBConnector": ".connectors",
+    "QuestionAnsweringTask": ".tasks",
+    "ChartGenerationTask": ".tasks",
+    "TableRetriever": ".retrievers",
+    "SQLRetriever": ".retrievers",
+    "VectorRetriever": ".retrievers",
+})
 
 
 __all__ = [
@@ -20,4 +42,4 @@ __all__ = [
     "VectorRetriever",
     "QuestionAnsweringTask",
     "ChartGenerationTask"
-]
\ No newline at end of file
+]
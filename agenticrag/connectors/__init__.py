@@ -1 +1,15 @@
-from .external_db_connector import ExternalDBConnector
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from agenticrag.utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .external_db_connector import ExternalDBConnector
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "ExternalDBConnector": ".external_db_connector",
+})
+
+
+__all__ = [
+    "ExternalDBConnector"
+]
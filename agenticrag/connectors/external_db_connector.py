@@ -6,8 +6,9 @@ from agenticrag.connectors.utils.extract_db_structure import extract_db_structur
 from agenticrag.stores import ExternalDBStore, MetaStore
 from agenticrag.types.core import DataFormat
 from agenticrag.types.core import ExternalDBData, MetaData
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_gateway
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.scheduler import Priority, priority
 from agenticrag.types.exceptions import ConnectorError
 
 logger = setup_logger(__name__)
@@ -20,7 +21,7 @@ class ExternalDBConnector(BaseDataConnector):
     def __init__(self, store: ExternalDBStore, meta_store: MetaStore, llm:BaseChatModel =None):
         self.store = store
         self.meta_store = meta_store
-        self.llm = llm or get_default_llm()
+        self.llm = get_gateway(llm)
 
     def connect_db(
         self,
@@ -56,7 +57,8 @@ class ExternalDBConnector(BaseDataConnector):
             logger.debug(f"Structure extraction successful for '{name}'.")
 
             if not description:
-                description = summarize_db(db_structure=structure, llm = self.llm)
+                with priority(Priority.BACKGROUND):
+                    description = summarize_db(db_structure=structure, llm = self.llm)
                 logger.debug(f"Auto-generated description for '{name}'.")
 
             # Store structure without connection string if env var is used
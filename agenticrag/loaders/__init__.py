@@ -1,9 +1,21 @@
-from .text_loader import TextLoader
-from .table_loader import TableLoader
-from .base import BaseLoader
+from typing import TYPE_CHECKING
+
+from agenticrag.utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .text_loader import TextLoader
+    from .table_loader import TableLoader
+    from .base import BaseLoader
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TextLoader": ".text_loader",
+    "TableLoader": ".table_loader",
+    "BaseLoader": ".base",
+})
+
 
 __all__ = [
     "TextLoader",
     "TableLoader",
     "BaseLoader"
-]
\ No newline at end of file
+]
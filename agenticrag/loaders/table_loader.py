@@ -9,8 +9,9 @@ from agenticrag.stores import MetaStore, TableStore
 from agenticrag.types.core import DataFormat
 from agenticrag.types.exceptions import LoaderError
 from agenticrag.types.core import MetaData, TableData
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_default_llm, get_gateway
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.scheduler import Priority, priority
 
 
 logger = setup_logger(__name__)
@@ -32,7 +33,7 @@ class TableLoader(BaseLoader):
         self.persistence_dir = persistence_dir
         self.store = store
         self.meta_store = meta_store
-        self.llm = llm 
+        self.llm = get_gateway(llm) if llm else None
 
     def load_csv(self, file_path: str, name: str = None, description: str = None, source: str = None) -> MetaData:
         """
@@ -51,8 +52,9 @@ class TableLoader(BaseLoader):
 
             table_name = name or os.path.basename(file_path)
             if not description:
-                self.llm = get_default_llm()
-                description = csv_to_desc(destination, llm=self.llm)
+                self.llm = self.llm or get_default_llm()
+                with priority(Priority.BACKGROUND):
+                    description = csv_to_desc(destination, llm=self.llm)
             table_description = description
             table_source = source or file_path
 
@@ -1,7 +1,7 @@
 from langchain_core.language_models.chat_models import BaseChatModel
 import os
 
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_default_llm, get_gateway
 
 from .base import BaseLoader
 from agenticrag.loaders.utils.description_generators import text_to_desc
@@ -14,6 +14,7 @@ from agenticrag.types.core import DataFormat
 from agenticrag.types.exceptions import LoaderError
 from agenticrag.types.core import MetaData, TextData
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.scheduler import Priority, priority
 
 logger = setup_logger(__name__)
 
@@ -33,7 +34,7 @@ class TextLoader(BaseLoader):
         self.store = store
         self.meta_store = meta_store
         self.splitter = MarkdownSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        self.llm = llm 
+        self.llm = get_gateway(llm) if llm else None
 
     def load_text(self, text: str, name: str, description: str = None, source: str = None) -> MetaData:
         """
@@ -49,7 +50,8 @@ class TextLoader(BaseLoader):
             if not description:
                 if not self.llm:
                     self.llm = get_default_llm()
-                description = text_to_desc(text, self.llm)
+                with priority(Priority.BACKGROUND):
+                    description = text_to_desc(text, self.llm)
             if not source:
                 source = name
 
@@ -65,14 +67,13 @@ class TextLoader(BaseLoader):
             )
             meta = self.meta_store.add(metadata)
             try:
-                for i, chunk in enumerate(chunks):
-                    chunk_id = f"{name}_{i}"
-                    data = TextData(id=chunk_id, name=name, text=chunk)
-                    self.store.add(data)
-                    logger.debug(f"Stored chunk {chunk_id}")
+                self.store.add_many([TextData(id=f"{name}_{i}", name=name, text=chunk) for i, chunk in enumerate(chunks)])
+                logger.debug(f"Stored {len(chunks)} chunks of '{name}'")
                 logger.info(f"Text  loaded successfully with Meta_id: {meta.id}")
                 return metadata
             except Exception as e:
+                # Batches written before the failure would otherwise stay behind as orphaned chunks.
+                self.store.delete_where(name=name)
                 self.meta_store.delete(meta.id)
                 raise e
 
@@ -1,6 +1,5 @@
 import re
 import markdown
-from bs4 import BeautifulSoup
 from typing import Union, List
 
 class MarkdownTextChunks:
@@ -80,6 +79,8 @@ class MarkdownDocumentConverter:
                     table_lines.append(lines[i])
                     i += 1
 
+                from bs4 import BeautifulSoup
+
                 html_table = markdown.markdown('\n'.join(table_lines), extensions=['tables'])
                 soup = BeautifulSoup(html_table, 'html.parser')
                 table = soup.find('table')
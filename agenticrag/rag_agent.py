@@ -1,25 +1,67 @@
+import asyncio
+import contextvars
+import json
 import os
+import threading
+import time
 from collections import deque
-from typing import List
-from langchain.tools import StructuredTool
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator, List
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.prompts import HumanMessagePromptTemplate, ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 from agenticrag.tasks import QuestionAnsweringTask, BaseTask
 from agenticrag.retrievers import BaseRetriever, VectorRetriever, TableRetriever, SQLRetriever
-from agenticrag.stores import TextStore, MetaStore
-from agenticrag.types.core import RAGAgentResponse
-from agenticrag.utils.generate_args_schema import generate_args_schema_from_method
+from agenticrag.stores import TextStore, MetaStore, MetaIndex, AnswerCache, BaseSessionStore, InMemorySessionStore
+from agenticrag.types.core import (
+    MetaData,
+    RAGAgentResponse,
+    RAGAgentEvent,
+    TasksSelectedEvent,
+    DatasetsSelectedEvent,
+    RetrieversSelectedEvent,
+    ToolCallEvent,
+    ToolOutputEvent,
+    AnswerRetractedEvent,
+    AnswerTokenEvent,
+    ResponseEvent,
+)
 from agenticrag.utils.logging_config import setup_logger
 from agenticrag.types.exceptions import RAGAgentError
 from agenticrag.utils.prompts import DATA_SOURCE_SELECTION_PROMPT, CONTROLLER_PROMPT, TASK_SELECTION_PROMPT
-from agenticrag.utils.helpers import extract_json_blocks, format_datasets, format_tool_metadata
+from agenticrag.utils.helpers import extract_json_blocks, format_datasets, run_in_executor, FinalAnswerStreamer
+from agenticrag.utils.tool_registry import ToolRegistry
+from agenticrag.utils.message_budget import MessageBudget
+from agenticrag.utils.router import Router
+from agenticrag.utils.artifacts import ArtifactStore
+from agenticrag.utils.tracing import Tracer, span, traced
+from agenticrag.utils.scheduler import Priority, priority
 from agenticrag.utils.rag_agent_loader_mixin import RAGAgentLoaderMixin
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_gateway
 
 logger = setup_logger(__name__)
 
+DEFAULT_SESSION_ID = "default"
+
+TASK_SELECTION_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        SystemMessage(TASK_SELECTION_PROMPT),
+        HumanMessagePromptTemplate.from_template(
+            "Chat History: {query}\nTasks and Descriptions:\n```json\n{task_list}\n```"
+        )
+    ]
+)
+
+DATA_SOURCE_SELECTION_TEMPLATE = ChatPromptTemplate.from_messages(
+    [
+        SystemMessage(DATA_SOURCE_SELECTION_PROMPT),
+        HumanMessagePromptTemplate.from_template(
+            "Query: {query}\nDatasets and Descriptions:\n```json\n{data_list}\n```"
+        )
+    ]
+)
+
 class RAGAgent(RAGAgentLoaderMixin):
     """
     A controller agent for managing data loading, retrieval, and task execution.
@@ -32,7 +74,16 @@ class RAGAgent(RAGAgentLoaderMixin):
         meta_store: MetaStore = None,
         tasks: List[BaseTask] = None,
         retrievers: List[BaseRetriever] = None,
-        chat_history_queue_size: int = 10
+        chat_history_queue_size: int = 10,
+        meta_index: MetaIndex = None,
+        answer_cache: AnswerCache = None,
+        tool_timeout: float = None,
+        max_parallel_tools: int = 4,
+        session_store: BaseSessionStore = None,
+        message_budget: MessageBudget = None,
+        router: Router = None,
+        artifact_store: ArtifactStore = None,
+        tracer: Tracer = None
     ):
         """
         Initializes the RAGAgent with LLM, storage directory, metadata store, tasks, and retrievers.
@@ -42,28 +93,43 @@ class RAGAgent(RAGAgentLoaderMixin):
             meta_store (MetaStore, optional): Store for managing dataset and retriever metadata, if not provided a new one will be created.
             tasks (List[BaseTask], optional): List of task tools the agent can use, if not provided default to Question Answering Task only.
             retrievers (List[BaseRetriever], optional): List of retrievers available to fetch context, if not provided default to VectorRetriever.
+            chat_history_queue_size (int): Number of chat messages kept as conversation context, used when `session_store` is not provided.
+            meta_index (MetaIndex, optional): Embedding index over dataset descriptions, used to shortlist datasets before LLM selection.
+            answer_cache (AnswerCache, optional): Semantic cache returning stored answers for near-duplicate queries.
+            tool_timeout (float, optional): Seconds a tool call may run before a timeout is reported to the controller, the tool itself keeps running in the background.
+            max_parallel_tools (int): Maximum number of tool calls from one controller turn executed at the same time.
+            session_store (BaseSessionStore, optional): Store holding chat history per session, defaults to an in-memory LRU store.
+            message_budget (MessageBudget, optional): Policy capping and compacting tool outputs in the controller loop, tool outputs are passed on whole if not provided.
+            router (Router, optional): Resolves task and dataset selection locally when possible, defaults to picking single candidates without the LLM.
+            artifact_store (ArtifactStore, optional): Keeps retrieved data in memory per invocation instead of writing files.
+            tracer (Tracer, optional): Records spans of each invocation into `response.trace` and passes them to its exporters.
         """
-        self.llm = llm or get_default_llm()
+        self.llm = get_gateway(llm)
         self.persistence_dir = persistent_dir.rstrip("/")
-        self.chat_history = deque(maxlen=chat_history_queue_size)
+        self.session_store = session_store or InMemorySessionStore(max_messages=chat_history_queue_size)
+        self.tool_timeout = tool_timeout
+        self.message_budget = message_budget
+        self.router = router or Router()
+        self.artifact_store = artifact_store or ArtifactStore()
+        self.tracer = tracer or Tracer()
+        self.max_parallel_tools = max_parallel_tools
 
         os.mkdir(self.persistence_dir) if not os.path.exists(self.persistence_dir) else None
+        self._tasks = None
+        self._retrievers = None
+        self.tool_registry = None
+
         if not tasks:
             tasks = [QuestionAnsweringTask(llm=llm)]
-        else:
-            seen_type = set()
-            for agent in tasks:
-                if not isinstance(agent, BaseTask):
-                    raise RAGAgentError(f"Task {agent} is not an instance of BaseTask")
-                agent_type = type(agent)
-                if agent_type in seen_type:
-                    raise RAGAgentError(f"Duplicate agent type {agent_type} (name:{agent.name}) found.")
-                seen_type.add(agent_type)
         self.tasks = tasks
 
         if not meta_store:
-            meta_store = MetaStore(connection_url=f"sqlite:///{self.persistence_dir}/agenticrag.db")
+            meta_store = meta_index.meta_store if meta_index else MetaStore(connection_url=f"sqlite:///{self.persistence_dir}/agenticrag.db")
+        if meta_index and meta_index.meta_store is not meta_store:
+            raise RAGAgentError("Meta index must be built over the same meta store used by the agent")
         self.meta_store = meta_store
+        self.meta_index = meta_index
+        self.answer_cache = answer_cache
         self.text_store = None
         self.external_db_store = None
         self.table_store = None
@@ -71,24 +137,61 @@ class RAGAgent(RAGAgentLoaderMixin):
         if not retrievers:
             self.text_store = TextStore(persistent_dir=persistent_dir)
             retrievers = [VectorRetriever(store=self.text_store, persistent_dir=persistent_dir + "/retrieved_data")]
-        else:
-            seen_types = set()
-            for retriever in retrievers:
-                if not isinstance(retriever, BaseRetriever):
-                    raise RAGAgentError(f"Retriever {retriever} is not an instance of BaseRetriever")
-                retriever_type = type(retriever)
-                if retriever_type in seen_types:
-                    raise RAGAgentError(f"Duplicate retriever type detected: {retriever_type.__name__} (name: {retriever.name})")
-                seen_types.add(retriever_type)
-                if isinstance(retriever, VectorRetriever):
-                    self.text_store = retriever.store
-                elif isinstance(retriever, TableRetriever):
-                    self.table_store = retriever.store
-                elif isinstance(retriever, SQLRetriever):
-                    self.external_db_store = retriever.store
         self.retrievers = retrievers
 
-    def invoke(self, query: str, max_iterations: int=10) -> RAGAgentResponse:
+    @property
+    def tasks(self) -> List[BaseTask]:
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks: List[BaseTask]):
+        """Validates tasks and rebuilds controller tools. Assign a new list to change tasks."""
+        seen_type = set()
+        for agent in tasks:
+            if not isinstance(agent, BaseTask):
+                raise RAGAgentError(f"Task {agent} is not an instance of BaseTask")
+            agent_type = type(agent)
+            if agent_type in seen_type:
+                raise RAGAgentError(f"Duplicate agent type {agent_type} (name:{agent.name}) found.")
+            seen_type.add(agent_type)
+        self._tasks = list(tasks)
+        self._refresh_tool_registry()
+
+    @property
+    def retrievers(self) -> List[BaseRetriever]:
+        return self._retrievers
+
+    @retrievers.setter
+    def retrievers(self, retrievers: List[BaseRetriever]):
+        """Validates retrievers, links their stores and rebuilds controller tools. Assign a new list to change retrievers."""
+        seen_types = set()
+        for retriever in retrievers:
+            if not isinstance(retriever, BaseRetriever):
+                raise RAGAgentError(f"Retriever {retriever} is not an instance of BaseRetriever")
+            retriever_type = type(retriever)
+            if retriever_type in seen_types:
+                raise RAGAgentError(f"Duplicate retriever type detected: {retriever_type.__name__} (name: {retriever.name})")
+            seen_types.add(retriever_type)
+            if isinstance(retriever, VectorRetriever):
+                self.text_store = retriever.store
+            elif isinstance(retriever, TableRetriever):
+                self.table_store = retriever.store
+            elif isinstance(retriever, SQLRetriever):
+                self.external_db_store = retriever.store
+        self._retrievers = list(retrievers)
+        self._refresh_tool_registry()
+
+    @property
+    def chat_history(self) -> List[dict]:
+        """Chat history of the default session, used when no `session_id` is passed."""
+        return self.session_store.get_history(DEFAULT_SESSION_ID)
+
+    def _refresh_tool_registry(self):
+        if self._tasks is None or self._retrievers is None:
+            return
+        self.tool_registry = ToolRegistry(retrievers=self._retrievers, tasks=self._tasks)
+
+    def invoke(self, query: str, max_iterations: int=10, session_id: str = DEFAULT_SESSION_ID) -> RAGAgentResponse:
         """
         Main method to invoke rag agent, for given query it will:
         - select tasks to perform
@@ -101,134 +204,548 @@ class RAGAgent(RAGAgentLoaderMixin):
         Args:
             query (str): The query to be processed by the agent.
             max_iterations (int, optional): The maximum number of iterations (retriever or task call) for the agent. Defaults to 10.
+            session_id (str, optional): Conversation the query belongs to, only its history is used as context.
+        """
+        return self._collect(self.stream(query=query, max_iterations=max_iterations, session_id=session_id))
+
+    async def ainvoke(self, query: str, max_iterations: int=10, session_id: str = DEFAULT_SESSION_ID) -> RAGAgentResponse:
+        """
+        Async version of `invoke`. Task and dataset selection run concurrently, and the controller loop
+        awaits the LLM and tool calls, so a single event loop can serve many queries at once.
+
+        Args:
+            query (str): The query to be processed by the agent.
+            max_iterations (int, optional): The maximum number of iterations (retriever or task call) for the agent. Defaults to 10.
+            session_id (str, optional): Conversation the query belongs to, only its history is used as context.
         """
-        self.chat_history.append({"role": "user", "content": query})
-        query = self._chat_history_to_str()
+        return await self._acollect(self.astream(query=query, max_iterations=max_iterations, session_id=session_id))
+
+    def stream(self, query: str, max_iterations: int=10, session_id: str = DEFAULT_SESSION_ID) -> Iterator[RAGAgentEvent]:
+        """
+        Runs the same pipeline as `invoke`, yielding events as they happen: selected tasks, datasets and retrievers,
+        each tool call and its output, tokens of the final answer as the LLM streams them, and finally a `ResponseEvent`
+        holding the complete `RAGAgentResponse`.
+
+        Args:
+            query (str): The query to be processed by the agent.
+            max_iterations (int, optional): The maximum number of iterations (retriever or task call) for the agent. Defaults to 10.
+            session_id (str, optional): Conversation the query belongs to, only its history is used as context.
+        """
+        history = self.session_store.append(session_id, {"role": "user", "content": query})
+        yield from self._stream(query=self._format_chat_history(history), max_iterations=max_iterations, cache_query=self._cache_query(query, history))
+
+    def _stream(
+        self, query: str, max_iterations: int, catalogue: List[MetaData] = None, level: Priority = Priority.INTERACTIVE, cache_query: str = None
+    ) -> Iterator[RAGAgentEvent]:
+        with self.tracer.start_trace("rag_agent.invoke") as trace, self.artifact_store.scope(), priority(level):
+            for event in self._run(query=query, max_iterations=max_iterations, catalogue=catalogue, cache_query=cache_query):
+                if isinstance(event, ResponseEvent):
+                    event.response.trace = trace
+                yield event
+
+    def _run(self, query: str, max_iterations: int, catalogue: List[MetaData] = None, cache_query: str = None) -> Iterator[RAGAgentEvent]:
+        cached = self._cached_response(cache_query)
+        if cached:
+            yield AnswerTokenEvent(token=cached.content)
+            yield ResponseEvent(response=cached)
+            return
+
         tasks = self._select_tasks(query=query)
+        yield TasksSelectedEvent(tasks=tasks)
         if not tasks:
-            return RAGAgentResponse(
-                success=False,
-                content="I'm not capable of performing desired task asked in query."
-            )
-        logger.info(f"Tasks to perform: {[task.name for task in tasks]}")
-
-        datasets = self._select_relevant_data(query=query)
-        if not datasets:
-            return RAGAgentResponse(
-                success=False,
-                content="Sorry! No dataset relevant to query found.",
-                tasks=tasks
-            )
-        logger.info(f"Relevant datasets selected: {[dataset.name for dataset in datasets]}")
-
-        selected_retrievers = self._select_retrievers(datasets=datasets)
+            yield ResponseEvent(response=self._failure_response())
+            return
+
+        datasets = self._select_relevant_data(query=query, catalogue=catalogue)
+        yield DatasetsSelectedEvent(datasets=datasets)
+        selected_retrievers = self._select_retrievers(datasets=datasets) if datasets else []
         if not selected_retrievers:
-            return RAGAgentResponse(
-                success=False,
-                content="Unable to select retriever for provided datasets.",
-                tasks=tasks,
-                datasets=datasets
-            )
-        logger.info(f"Retriever selected: {[retriever.name for retriever in selected_retrievers]}")
-
-        tools_dict = {}
-        for retriever in selected_retrievers:
-            retriever_tool = StructuredTool.from_function(
-                func=retriever.retrieve,
-                name=retriever.name,
-                description=f"Type: `retriever tool`\n{retriever.description}",
-                args_schema=generate_args_schema_from_method(retriever.retrieve)
-            )
-            tools_dict[retriever.name] = retriever_tool
-
-        for task in tasks:
-            task_tool = StructuredTool.from_function(
-                func=task.execute,
-                name=task.name,
-                description=f"Type: `agent tool`\n{task.description}",
-                args_schema=generate_args_schema_from_method(task.execute)
-            )
-            tools_dict[task.name] = task_tool
-
-        def call_tool(tool_name, args):
-            logger.debug(f"Tool `{tool_name}` Called with args: {args}")
-            return tools_dict[tool_name].invoke(args)
+            yield ResponseEvent(response=self._failure_response(tasks=tasks, datasets=datasets))
+            return
+        yield RetrieversSelectedEvent(retrievers=selected_retrievers)
 
-        def final_answer(answer: str):
-            return answer
+        tools_dict = self._build_tools(tasks=tasks, retrievers=selected_retrievers)
+        messages = self._build_controller_messages(query=query, tools_dict=tools_dict, datasets=datasets)
+        tokens_saved = 0
 
-        tool_metadata = format_tool_metadata(tools_dict)
-        dataset_metadata = format_datasets(datasets)
+        for i in range(max_iterations):
+            streamer = FinalAnswerStreamer()
+            try:
+                for chunk in self.llm.stream(messages):
+                    token = streamer.feed(chunk.content)
+                    if token:
+                        yield AnswerTokenEvent(token=token)
+                tool_calls = self._parse_tool_calls(extract_json_blocks(streamer.content))
+            except Exception as e:
+                if streamer.emitted:
+                    yield AnswerRetractedEvent(iteration=i)
+                tokens_saved += self._append_parse_error(messages, streamer.content, e, query)
+                continue
 
-        messages = [
-            SystemMessage(
-                content=CONTROLLER_PROMPT + f"""
-Available tools:
-{tool_metadata}
+            final_call = next((call for call in tool_calls if call["tool"] == "final_answer"), None)
 
-Relevant datasets:
-{dataset_metadata}
-"""
-            ),
-            HumanMessage(content=query)
-        ]
+            if final_call:
+                answer = final_call["args"].get("answer", "")
+                if not answer.startswith(streamer.emitted):
+                    yield AnswerRetractedEvent(iteration=i)
+                    remainder = answer
+                else:
+                    remainder = streamer.remainder(answer)
+                if remainder:
+                    yield AnswerTokenEvent(token=remainder)
+                logger.info(f"Final answer generated by controller: {answer}")
+                response = RAGAgentResponse(
+                    success=True,
+                    content=answer,
+                    datasets=datasets,
+                    tasks=tasks,
+                    retrievers=selected_retrievers,
+                    iterations=i,
+                    tokens_saved=tokens_saved
+                )
+                self._cache_response(cache_query, response)
+                yield ResponseEvent(response=response)
+                return
+
+            for call in tool_calls:
+                yield ToolCallEvent(tool=call["tool"], args=call["args"], iteration=i)
+            tool_outputs = self._call_tools(tools_dict, tool_calls)
+            for call, tool_output in zip(tool_calls, tool_outputs):
+                yield ToolOutputEvent(tool=call["tool"], output=tool_output, iteration=i)
+            tokens_saved += self._append_tool_outputs(messages, streamer.content, tool_calls, tool_outputs, query)
+
+        yield ResponseEvent(response=self._max_iterations_response(tasks, datasets, selected_retrievers, max_iterations, tokens_saved))
+
+    async def astream(self, query: str, max_iterations: int=10, session_id: str = DEFAULT_SESSION_ID) -> AsyncIterator[RAGAgentEvent]:
+        """
+        Async version of `stream`. Task and dataset selection run concurrently, and each selection
+        event is yielded as soon as its LLM call completes.
+
+        Args:
+            query (str): The query to be processed by the agent.
+            max_iterations (int, optional): The maximum number of iterations (retriever or task call) for the agent. Defaults to 10.
+            session_id (str, optional): Conversation the query belongs to, only its history is used as context.
+        """
+        history = await run_in_executor(self.session_store.append, session_id, {"role": "user", "content": query})
+        async for event in self._astream(query=self._format_chat_history(history), max_iterations=max_iterations, cache_query=self._cache_query(query, history)):
+            yield event
+
+    async def _astream(
+        self, query: str, max_iterations: int, catalogue: List[MetaData] = None, level: Priority = Priority.INTERACTIVE, cache_query: str = None
+    ) -> AsyncIterator[RAGAgentEvent]:
+        with self.tracer.start_trace("rag_agent.invoke") as trace, self.artifact_store.scope(), priority(level):
+            async for event in self._arun(query=query, max_iterations=max_iterations, catalogue=catalogue, cache_query=cache_query):
+                if isinstance(event, ResponseEvent):
+                    event.response.trace = trace
+                yield event
+
+    async def _arun(self, query: str, max_iterations: int, catalogue: List[MetaData] = None, cache_query: str = None) -> AsyncIterator[RAGAgentEvent]:
+        cached = await run_in_executor(self._cached_response, cache_query)
+        if cached:
+            yield AnswerTokenEvent(token=cached.content)
+            yield ResponseEvent(response=cached)
+            return
+
+        datasets_future = asyncio.ensure_future(self._aselect_relevant_data(query=query, catalogue=catalogue))
+        try:
+            tasks = await self._aselect_tasks(query=query)
+        except BaseException:
+            datasets_future.cancel()
+            raise
+        yield TasksSelectedEvent(tasks=tasks)
+        if not tasks:
+            datasets_future.cancel()
+            yield ResponseEvent(response=self._failure_response())
+            return
+
+        datasets = await datasets_future
+        yield DatasetsSelectedEvent(datasets=datasets)
+        selected_retrievers = self._select_retrievers(datasets=datasets) if datasets else []
+        if not selected_retrievers:
+            yield ResponseEvent(response=self._failure_response(tasks=tasks, datasets=datasets))
+            return
+        yield RetrieversSelectedEvent(retrievers=selected_retrievers)
+
+        tools_dict = self._build_tools(tasks=tasks, retrievers=selected_retrievers)
+        messages = self._build_controller_messages(query=query, tools_dict=tools_dict, datasets=datasets)
+        tokens_saved = 0
 
         for i in range(max_iterations):
+            streamer = FinalAnswerStreamer()
             try:
-                tool_call_msg = self.llm.invoke(messages)
-                tool_call = extract_json_blocks(tool_call_msg.content)
+                async for chunk in self.llm.astream(messages):
+                    token = streamer.feed(chunk.content)
+                    if token:
+                        yield AnswerTokenEvent(token=token)
+                tool_calls = self._parse_tool_calls(extract_json_blocks(streamer.content))
             except Exception as e:
-                logger.exception("Failed to parse tool call")
-                error = f"Error parsing tool call: {e}"
-                messages.append(tool_call_msg)
-                messages.append(HumanMessage(name="error", content=f"Error: {error}\nOriginal User query: {query}"))
+                if streamer.emitted:
+                    yield AnswerRetractedEvent(iteration=i)
+                tokens_saved += self._append_parse_error(messages, streamer.content, e, query)
                 continue
 
-            tool_name = tool_call.get("tool")
-            args = tool_call.get("args", {})
+            final_call = next((call for call in tool_calls if call["tool"] == "final_answer"), None)
 
-            if tool_name == "final_answer":
-                answer = args.get("answer", "")
+            if final_call:
+                answer = final_call["args"].get("answer", "")
+                if not answer.startswith(streamer.emitted):
+                    yield AnswerRetractedEvent(iteration=i)
+                    remainder = answer
+                else:
+                    remainder = streamer.remainder(answer)
+                if remainder:
+                    yield AnswerTokenEvent(token=remainder)
                 logger.info(f"Final answer generated by controller: {answer}")
-                return RAGAgentResponse(
+                response = RAGAgentResponse(
                     success=True,
                     content=answer,
                     datasets=datasets,
                     tasks=tasks,
                     retrievers=selected_retrievers,
-                    iterations=i
+                    iterations=i,
+                    tokens_saved=tokens_saved
                 )
+                await run_in_executor(self._cache_response, cache_query, response)
+                yield ResponseEvent(response=response)
+                return
+
+            for call in tool_calls:
+                yield ToolCallEvent(tool=call["tool"], args=call["args"], iteration=i)
+            tool_outputs = await self._acall_tools(tools_dict, tool_calls)
+            for call, tool_output in zip(tool_calls, tool_outputs):
+                yield ToolOutputEvent(tool=call["tool"], output=tool_output, iteration=i)
+            tokens_saved += self._append_tool_outputs(messages, streamer.content, tool_calls, tool_outputs, query)
+
+        yield ResponseEvent(response=self._max_iterations_response(tasks, datasets, selected_retrievers, max_iterations, tokens_saved))
+
+    def batch(self, queries: List[str], max_concurrency: int = 4, max_iterations: int = 10, level: Priority = Priority.BACKGROUND) -> List[RAGAgentResponse]:
+        """
+        Runs independent queries in parallel on a thread pool and returns their responses in the same order.
+        Queries neither use nor update chat history, and share one snapshot of dataset metadata and the compiled tools.
+        A query that raises is returned as an unsuccessful response with `error` set, without affecting others.
+
+        Args:
+            queries (List[str]): Queries to be processed.
+            max_concurrency (int, optional): Maximum number of queries processed at the same time. Defaults to 4.
+            max_iterations (int, optional): The maximum number of iterations (retriever or task call) per query. Defaults to 10.
+            level (Priority, optional): Priority their LLM calls are queued at, by default behind interactive queries.
+        """
+        catalogue = None if self.meta_index else self.meta_store.get_all()
+
+        def run(query):
+            try:
+                conversation = self._format_chat_history([{"role": "user", "content": query}])
+                return self._collect(self._stream(query=conversation, max_iterations=max_iterations, catalogue=catalogue, level=level, cache_query=query))
+            except Exception as e:
+                logger.exception(f"Batch query failed: {query}")
+                return RAGAgentResponse(success=False, content=f"Failed to process query: {e}", error=str(e))
 
-            if tool_name not in tools_dict:
-                logger.error(f"Unknown tool called: {tool_name}")
-                tool_output = f"Unknown tool called: {tool_name}"
-            else:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(run, queries))
+
+    async def abatch(self, queries: List[str], max_concurrency: int = 4, max_iterations: int = 10, level: Priority = Priority.BACKGROUND) -> List[RAGAgentResponse]:
+        """
+        Async version of `batch`, running queries concurrently on the current event loop.
+
+        Args:
+            queries (List[str]): Queries to be processed.
+            max_concurrency (int, optional): Maximum number of queries processed at the same time. Defaults to 4.
+            max_iterations (int, optional): The maximum number of iterations (retriever or task call) per query. Defaults to 10.
+            level (Priority, optional): Priority their LLM calls are queued at, by default behind interactive queries.
+        """
+        catalogue = None if self.meta_index else await run_in_executor(self.meta_store.get_all)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(query):
+            async with semaphore:
                 try:
-                    tool_output = call_tool(tool_name, args)
-                    logger.info(f"{tool_name} output: {tool_output}")
+                    conversation = self._format_chat_history([{"role": "user", "content": query}])
+                    return await self._acollect(self._astream(query=conversation, max_iterations=max_iterations, catalogue=catalogue, level=level, cache_query=query))
                 except Exception as e:
-                    logger.exception(f"{tool_name} tool execution failed")
-                    tool_output = f"Error executing {tool_name} tool: {e}"
+                    logger.exception(f"Batch query failed: {query}")
+                    return RAGAgentResponse(success=False, content=f"Failed to process query: {e}", error=str(e))
 
-            messages.append(tool_call_msg)
-            messages.append(HumanMessage(name=tool_name, content=f"Tool Output: {tool_output}\nOriginal User query: {query}"))
+        return list(await asyncio.gather(*(run(query) for query in queries)))
 
-    def _select_tasks(self, query):
-        task_list = [{"name": task.name, "description": task.description} for task in self.tasks]
-        messages = ChatPromptTemplate.from_messages(
-            [
-                SystemMessage(TASK_SELECTION_PROMPT),
-                HumanMessagePromptTemplate.from_template(
-                    "Chat History: {query}\nTasks and Descriptions:\n```json\n{task_list}\n```"
-                )
+    def _collect(self, events: Iterator[RAGAgentEvent]) -> RAGAgentResponse:
+        # Events are exhausted, not abandoned at the response, so the per-invocation scope closes right here.
+        response = None
+        for event in events:
+            if isinstance(event, ResponseEvent):
+                response = event.response
+        return response
+
+    async def _acollect(self, events: AsyncIterator[RAGAgentEvent]) -> RAGAgentResponse:
+        response = None
+        async for event in events:
+            if isinstance(event, ResponseEvent):
+                response = event.response
+        return response
+
+    @staticmethod
+    def _cache_query(query, history):
+        # A follow-up is answered in the context of earlier turns, so only standalone questions use the answer cache.
+        return query if len(history) <= 1 else None
+
+    @traced("answer_cache.lookup")
+    def _cached_response(self, query):
+        if self.answer_cache is None or query is None:
+            return None
+        try:
+            entry = self.answer_cache.lookup(query)
+        except Exception as e:
+            logger.error(f"Answer cache lookup failed: {e}")
+            return None
+        if entry is None:
+            return None
+        datasets = [data for name in json.loads(entry.dataset_versions) for data in self.meta_store.index(name=name)]
+        return RAGAgentResponse(success=True, content=entry.answer, datasets=datasets, iterations=0, cached=True)
+
+    @traced("answer_cache.put")
+    def _cache_response(self, query, response):
+        if self.answer_cache is None or query is None or not response.success:
+            return
+        try:
+            self.answer_cache.put(query, response.content, response.datasets)
+        except Exception as e:
+            logger.error(f"Failed to cache answer: {e}")
+
+    def _parse_tool_calls(self, parsed):
+        """
+        Normalize a controller turn into a list of tool calls, accepting a single call, a list, or `{"tool_calls": [...]}`.
+        Raises ValueError if `final_answer` is called together with other tools, whose outputs the answer couldn't have seen.
+        """
+        if isinstance(parsed, dict) and "tool_calls" in parsed:
+            parsed = parsed["tool_calls"]
+        calls = parsed if isinstance(parsed, list) else [parsed]
+        tool_calls = [{"tool": call.get("tool"), "args": call.get("args", {})} for call in calls if isinstance(call, dict)]
+        if len(tool_calls) > 1 and any(call["tool"] == "final_answer" for call in tool_calls):
+            raise ValueError("final_answer must be called on its own, after the outputs of other tools are known")
+        return tool_calls or [{"tool": None, "args": {}}]
+
+    def _call_tools(self, tools_dict, tool_calls):
+        """
+        Run the tool calls of one controller turn, at most `max_parallel_tools` at a time. Each call's timeout starts
+        when it begins running, and a call that times out gives its slot to the next one, so a turn takes at most
+        `tool_timeout` per round of `max_parallel_tools` calls. Python threads can't be stopped, so a tool that
+        times out keeps running in the background, it only stops holding up the controller.
+        """
+        if len(tool_calls) == 1 and self.tool_timeout is None:
+            return [self._call_tool(tools_dict, tool_calls[0]["tool"], tool_calls[0]["args"])]
+
+        condition = threading.Condition()
+        started = [None] * len(tool_calls)
+        outputs = [None] * len(tool_calls)
+        finished = [False] * len(tool_calls)
+        queued = deque(range(len(tool_calls)))
+
+        def run(index, call):
+            output = self._call_tool(tools_dict, call["tool"], call["args"])
+            with condition:
+                outputs[index] = output
+                finished[index] = True
+                condition.notify_all()
+
+        with condition:
+            while True:
+                now = time.monotonic()
+                running = [i for i in range(len(tool_calls)) if started[i] is not None and not finished[i] and not self._timed_out(started[i], now)]
+                while queued and len(running) < self.max_parallel_tools:
+                    index = queued.popleft()
+                    started[index] = now
+                    running.append(index)
+                    threading.Thread(
+                        target=contextvars.copy_context().run, args=(run, index, tool_calls[index]),
+                        name=f"agenticrag-tool-{index}", daemon=True,
+                    ).start()
+                if not running:
+                    break
+                deadlines = [started[i] + self.tool_timeout for i in running] if self.tool_timeout is not None else []
+                condition.wait(timeout=min(deadlines) - now if deadlines else None)
+            return [
+                outputs[i] if finished[i] else self._timeout_output(call["tool"])
+                for i, call in enumerate(tool_calls)
             ]
-        ).format_messages(query=query, task_list=task_list)
+
+    async def _acall_tools(self, tools_dict, tool_calls):
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def run(call):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self._acall_tool(tools_dict, call["tool"], call["args"]), timeout=self.tool_timeout)
+                except asyncio.TimeoutError:
+                    return self._timeout_output(call["tool"])
+        return list(await asyncio.gather(*(run(call) for call in tool_calls)))
+
+    def _timed_out(self, started, now):
+        return started is not None and self.tool_timeout is not None and now - started >= self.tool_timeout
+
+    def _timeout_output(self, tool_name):
+        logger.error(f"{tool_name} tool timed out after {self.tool_timeout} seconds")
+        return f"Error executing {tool_name} tool: timed out after {self.tool_timeout} seconds"
+
+    def _call_tool(self, tools_dict, tool_name, args):
+        if tool_name not in tools_dict:
+            logger.error(f"Unknown tool called: {tool_name}")
+            return f"Unknown tool called: {tool_name}"
+        try:
+            logger.debug(f"Tool `{tool_name}` Called with args: {args}")
+            with span(f"tool.{tool_name}"):
+                tool_output = tools_dict[tool_name].invoke(args)
+            logger.info(f"{tool_name} output: {tool_output}")
+            return tool_output
+        except Exception as e:
+            logger.exception(f"{tool_name} tool execution failed")
+            return f"Error executing {tool_name} tool: {e}"
+
+    async def _acall_tool(self, tools_dict, tool_name, args):
+        if tool_name not in tools_dict:
+            logger.error(f"Unknown tool called: {tool_name}")
+            return f"Unknown tool called: {tool_name}"
+        try:
+            logger.debug(f"Tool `{tool_name}` Called with args: {args}")
+            with span(f"tool.{tool_name}"):
+                tool_output = await tools_dict[tool_name].ainvoke(args)
+            logger.info(f"{tool_name} output: {tool_output}")
+            return tool_output
+        except Exception as e:
+            logger.exception(f"{tool_name} tool execution failed")
+            return f"Error executing {tool_name} tool: {e}"
+
+    def _append_parse_error(self, messages, content, error, query):
+        """Append a parse error turn and compact messages, returns tokens saved."""
+        logger.exception("Failed to parse tool call")
+        messages.append(AIMessage(content=content))
+        messages.append(HumanMessage(name="error", content=f"Error: Error parsing tool call: {error}\nOriginal User query: {query}"))
+        return self.message_budget.compact(messages) if self.message_budget else 0
+
+    def _append_tool_outputs(self, messages, content, tool_calls, tool_outputs, query):
+        """Append a tool call turn with capped outputs and compact messages, returns tokens saved."""
+        saved = 0
+        capped_outputs = []
+        for output in tool_outputs:
+            capped, output_saved = self.message_budget.cap(str(output)) if self.message_budget else (str(output), 0)
+            capped_outputs.append(capped)
+            saved += output_saved
+
+        messages.append(AIMessage(content=content))
+        if len(tool_calls) == 1:
+            messages.append(HumanMessage(name=tool_calls[0]["tool"], content=f"Tool Output: {capped_outputs[0]}\nOriginal User query: {query}"))
+        else:
+            outputs = "\n\n".join(f"Tool Output ({call['tool']}): {output}" for call, output in zip(tool_calls, capped_outputs))
+            messages.append(HumanMessage(name="tool_outputs", content=f"{outputs}\nOriginal User query: {query}"))
+        if self.message_budget:
+            saved += self.message_budget.compact(messages)
+        if saved:
+            logger.debug(f"Message budget saved {saved} tokens")
+        return saved
+
+    def _failure_response(self, tasks=None, datasets=None):
+        if not tasks:
+            content = "I'm not capable of performing desired task asked in query."
+        elif not datasets:
+            content = "Sorry! No dataset relevant to query found."
+        else:
+            content = "Unable to select retriever for provided datasets."
+        return RAGAgentResponse(success=False, content=content, tasks=tasks or [], datasets=datasets or [])
+
+    def _max_iterations_response(self, tasks, datasets, retrievers, max_iterations, tokens_saved=0):
+        logger.warning(f"Controller did not produce final answer within {max_iterations} iterations")
+        return RAGAgentResponse(
+            success=False,
+            content="Unable to complete the task within allowed number of iterations.",
+            datasets=datasets,
+            tasks=tasks,
+            retrievers=retrievers,
+            iterations=max_iterations,
+            tokens_saved=tokens_saved
+        )
+
+    def _build_tools(self, tasks, retrievers):
+        names = [retriever.name for retriever in retrievers] + [task.name for task in tasks]
+        return self.tool_registry.get_tools(names)
+
+    def _build_controller_messages(self, query, tools_dict, datasets):
+        tool_metadata = self.tool_registry.tool_metadata(tools_dict.keys())
+        dataset_metadata = format_datasets(datasets)
+        return [
+            SystemMessage(
+                content=CONTROLLER_PROMPT + f"""
+Available tools:
+{tool_metadata}
+
+Relevant datasets:
+{dataset_metadata}
+"""
+            ),
+            HumanMessage(content=query)
+        ]
+
+    @traced("select_tasks")
+    def _select_tasks(self, query):
+        routed = self.router.route_tasks(query, self.tasks)
+        if routed is not None:
+            return routed
+        messages = self._task_selection_messages(query)
         llm_resp = self.llm.invoke(messages).content
+        selected = self._parse_selected_tasks(llm_resp)
+        self.router.record_tasks(query, selected)
+        return selected
+
+    @traced("select_tasks")
+    async def _aselect_tasks(self, query):
+        routed = await run_in_executor(self.router.route_tasks, query, self.tasks)
+        if routed is not None:
+            return routed
+        messages = self._task_selection_messages(query)
+        llm_resp = (await self.llm.ainvoke(messages)).content
+        selected = self._parse_selected_tasks(llm_resp)
+        await run_in_executor(self.router.record_tasks, query, selected)
+        return selected
+
+    def _task_selection_messages(self, query):
+        return TASK_SELECTION_TEMPLATE.format_messages(query=query, task_list=self.tool_registry.task_list)
+
+    def _parse_selected_tasks(self, llm_resp):
         result = extract_json_blocks(llm_resp)
         return [task for task in self.tasks if task.name in result.get('tasks', [])]
 
-    def _select_relevant_data(self, query):
-        all_data = self.meta_store.get_all()
+    @traced("select_datasets")
+    def _select_relevant_data(self, query, catalogue=None):
+        all_data, skip_llm = self._dataset_candidates(query, catalogue)
+        if skip_llm or not all_data:
+            return all_data
+        routed = self.router.route_datasets(query, all_data)
+        if routed is not None:
+            return routed
+        messages = self._data_selection_messages(query, all_data)
+        llm_resp = self.llm.invoke(messages).content
+        selected = self._parse_selected_data(llm_resp, all_data)
+        self.router.record_datasets(query, selected)
+        return selected
+
+    @traced("select_datasets")
+    async def _aselect_relevant_data(self, query, catalogue=None):
+        all_data, skip_llm = await run_in_executor(self._dataset_candidates, query, catalogue)
+        if skip_llm or not all_data:
+            return all_data
+        routed = await run_in_executor(self.router.route_datasets, query, all_data)
+        if routed is not None:
+            return routed
+        messages = self._data_selection_messages(query, all_data)
+        llm_resp = (await self.llm.ainvoke(messages)).content
+        selected = self._parse_selected_data(llm_resp, all_data)
+        await run_in_executor(self.router.record_datasets, query, selected)
+        return selected
+
+    def _dataset_candidates(self, query, catalogue=None):
+        """Return datasets the LLM should choose from, and whether the choice can be skipped."""
+        if self.meta_index is None:
+            return (catalogue if catalogue is not None else self.meta_store.get_all()), False
+        return self.meta_index.shortlist(query)
+
+    def _data_selection_messages(self, query, all_data):
         data_list = []
         seen = set()
         for data in all_data:
@@ -237,18 +754,13 @@ Relevant datasets:
                 seen.add(item)
                 data_list.append({"name": data.name, "description": data.description})
 
-        messages = ChatPromptTemplate.from_messages(
-            [
-                SystemMessage(DATA_SOURCE_SELECTION_PROMPT),
-                HumanMessagePromptTemplate.from_template(
-                    "Query: {query}\nDatasets and Descriptions:\n```json\n{data_list}\n```"
-                )
-            ]
-        ).format_messages(query=query, data_list=data_list)
-        llm_resp = self.llm.invoke(messages).content
+        return DATA_SOURCE_SELECTION_TEMPLATE.format_messages(query=query, data_list=data_list)
+
+    def _parse_selected_data(self, llm_resp, all_data):
         result = extract_json_blocks(llm_resp)
         return [data for data in all_data if data.name in result.get('data_sources', [])]
 
+    @traced("select_retrievers")
     def _select_retrievers(self, datasets):
         selected = []
         for retriever in self.retrievers:
@@ -258,8 +770,9 @@ Relevant datasets:
         return selected
 
 
-    def _chat_history_to_str(self):
+    @staticmethod
+    def _format_chat_history(history):
         string_msg = ""
-        for item in self.chat_history:
+        for item in history:
             string_msg += f"{item['role'].capitalize()}: {item['content']}\n"
         return string_msg
\ No newline at end of file
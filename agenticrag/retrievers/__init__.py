@@ -1,7 +1,24 @@
-from .base import BaseRetriever
-from .vector_retriever import VectorRetriever
-from .table_retriever import TableRetriever
-from .sql_retriever import SQLRetriever
+from typing import TYPE_CHECKING
 
+from agenticrag.utils.lazy_imports import lazy_exports
 
-__all__ = ["BaseRetriever", "VectorRetriever", "TableRetriever", "SQLRetriever"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .base import BaseRetriever
+    from .vector_retriever import VectorRetriever
+    from .table_retriever import TableRetriever
+    from .sql_retriever import SQLRetriever
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseRetriever": ".base",
+    "VectorRetriever": ".vector_retriever",
+    "TableRetriever": ".table_retriever",
+    "SQLRetriever": ".sql_retriever",
+})
+
+
+__all__ = [
+    "BaseRetriever",
+    "VectorRetriever",
+    "TableRetriever",
+    "SQLRetriever"
+]
@@ -6,12 +6,6 @@ from sqlalchemy import text, create_engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
-
-try:
-    import pandas as pd
-except ImportError:
-    raise ImportError("Pandas is required to use SQLRetriever, install it via `pip install pandas`")
-
 from langchain_core.prompts import HumanMessagePromptTemplate, ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -22,9 +16,11 @@ from agenticrag.stores import ExternalDBStore
 from agenticrag.types.exceptions import RetrievalError
 from agenticrag.retrievers.base import BaseRetriever
 from agenticrag.utils.helpers import extract_json_blocks
+from agenticrag.utils.artifacts import save_artifact
+from agenticrag.utils.tracing import traced
 from agenticrag.retrievers.utils.prompts import TABLE_DECIDER_TEMPLATE, SQL_WRITING_TEMPLATE
 from agenticrag.utils.logging_config import setup_logger
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_gateway
 
 logger = setup_logger(__name__)
 
@@ -37,7 +33,7 @@ class SQLRetriever(BaseRetriever):
 
     def __init__(self,  store: ExternalDBStore = None, llm: BaseChatModel = None, persistent_dir: str = ".agenticrag_data/retrieved_data"):
         self.store = store or ExternalDBStore()
-        self.llm = llm or get_default_llm()
+        self.llm = get_gateway(llm)
         self.persistent_dir = persistent_dir
         os.mkdir(self.persistent_dir) if not os.path.exists(self.persistent_dir) else None
 
@@ -50,7 +46,7 @@ class SQLRetriever(BaseRetriever):
         return (
             f"This retriever takes a database name and a query describing the desired data extraction, "
             f"generates an SQL query via an LLM, executes it on the linked database, "
-            f"and saves the result as '{self.persistent_dir}/table_data.csv'."
+            f"saves the result as a table and returns a reference to it, usable as file path for tasks."
             f" It can extract particular row, column or even perform aggregation, grouping etc. on database data."
             f"It is recommended to ask for a specif part with all required aggregations, grouping etc."
         )
@@ -83,11 +79,14 @@ class SQLRetriever(BaseRetriever):
                 logger.info("No data retrieved from SQL query.")
                 return "No data retrieved."
 
+            try:
+                import pandas as pd
+            except ImportError:
+                raise ImportError("Pandas is required to use SQLRetriever, install it via `pip install pandas`")
             df = pd.DataFrame(data)
-            output_path = os.path.join(self.persistent_dir, "table_data.csv")
-            df.to_csv(output_path, index=False)
-            logger.info(f"Data saved to {output_path}")
-            return f"Retrieved data has been saved to `{output_path}`"
+            output_ref = save_artifact(df, self.persistent_dir, "table_data.csv")
+            logger.info(f"Data saved to {output_ref}")
+            return f"Retrieved data has been saved to `{output_ref}`"
 
         except Exception as e:
             logger.error(f"Error during data retrieval: {e}", exc_info=True)
@@ -111,6 +110,7 @@ class SQLRetriever(BaseRetriever):
         logger.debug(f"Selected tables and fields: {table_and_fields}")
         return {"tables": tables, "table_and_fields_data": json.dumps(table_and_fields, indent=2)}
 
+    @traced("sql_retriever.generate_and_execute_sql")
     def _generate_and_execute_sql(self, query: str, db: ExternalDBData, table_and_fields_data: str) -> dict:
         """
         Generate an SQL query using the LLM, check safety, execute it and return the results.
@@ -174,6 +174,7 @@ class SQLRetriever(BaseRetriever):
                 return False
         return True
 
+    @traced("sql_retriever.run_query")
     def _run_query(self, query: str, db: ExternalDBData) -> List[Dict]:
         connection_url = db.connection_url or os.getenv(db.connection_url_env_var or "")
         if not connection_url:
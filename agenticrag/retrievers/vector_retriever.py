@@ -1,17 +1,55 @@
 import os
+from typing import Dict, List, Union
 from agenticrag.retrievers.base import BaseRetriever
-from agenticrag.stores import TextStore
+from agenticrag.stores import BaseVectorBackend, TextStore
 from agenticrag.utils.logging_config import setup_logger
-from agenticrag.types.core import DataFormat
+from agenticrag.types.core import DataFormat, VectorData
+from agenticrag.utils.artifacts import save_artifact
 
 logger = setup_logger(__name__)
 
+
+def reciprocal_rank_fusion(rankings: List[List[VectorData]], k: int = 60) -> List[VectorData]:
+    """
+    Merge ranked result lists, scoring each entry by the sum of 1 / (k + rank) over the lists it appears in.
+    Only ranks are used, so lists scored on different scales, like BM25 and cosine distance, combine fairly.
+    """
+    scores: Dict[str, float] = {}
+    entries: Dict[str, VectorData] = {}
+    for ranking in rankings:
+        for rank, entry in enumerate(ranking, start=1):
+            key = str(entry.id)
+            scores[key] = scores.get(key, 0.0) + 1 / (k + rank)
+            entries.setdefault(key, entry)
+    return [entries[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
 class VectorRetriever(BaseRetriever):
-    def __init__(self, store: TextStore = None, persistent_dir: str = ".agenticrag_data/retrieved_data", top_k: int = 5):
+    def __init__(
+        self,
+        store: BaseVectorBackend = None,
+        persistent_dir: str = ".agenticrag_data/retrieved_data",
+        top_k: int = 5,
+        hybrid: bool = False,
+        rrf_k: int = 60,
+    ):
+        """
+        Args:
+            store (BaseVectorBackend, optional): Store to search, a default `TextStore` if not provided.
+            persistent_dir (str): Directory where retrieved text is saved.
+            top_k (int): Number of chunks retrieved per query.
+            hybrid (bool): Fuse BM25 keyword results with dense results, so exact identifiers like part numbers,
+                column names and error codes are found on the first try. The keyword index is held in memory,
+                one per process, built from every stored chunk on the first search, and doesn't see writes made
+                by other processes.
+            rrf_k (int): Reciprocal rank fusion constant, larger values flatten the advantage of top ranks.
+        """
         self.store = store or TextStore()
         self.persistent_dir = persistent_dir
         os.mkdir(self.persistent_dir) if not os.path.exists(self.persistent_dir) else None
         self.top_k = top_k
+        self.hybrid = hybrid
+        self.rrf_k = rrf_k
 
     @property
     def name(self):
@@ -21,26 +59,36 @@ class VectorRetriever(BaseRetriever):
     def description(self):
         return (
             f"This retriever requires a user query in the input and retrieves relevant text chunks by "
-            f"doing vector search from database. It then saves those chunks in "
-            f"`{self.persistent_dir}/text_data.txt`."
+            f"doing vector search from database, optionally limited to one or more document names. It then saves those chunks as text "
+            f"and returns a reference to them, usable as file path for tasks."
         )
     
     @property
     def working_data_format(self):
         return DataFormat.TEXT
 
-    def retrieve(self, query: str, document_name: str = None) -> str:
+    def retrieve(self, query: str, document_name: Union[str, List[str]] = None) -> str:
         """
-        Retrieve relevant text chunks based on user query.
+        Retrieve relevant text chunks based on user query, from one document, several documents or all of them.
         """
-        chunks = self.store.search_similar(text_query=query, document_name=document_name, top_k=self.top_k)
+        names = [document_name] if isinstance(document_name, str) else list(document_name or [])
+        # Each ranking contributes a wider pool when fused, so chunks ranked moderately by both can still make the cut.
+        pool = self.top_k * 2 if self.hybrid else self.top_k
+        if len(names) > 1:
+            # One batched search across all named documents instead of one search per document.
+            dense = self.store.search_similar_many([query], document_names=names, top_k=pool)[0]
+        else:
+            dense = self.store.search_similar(text_query=query, document_name=names[0] if names else None, top_k=pool)
+        if self.hybrid:
+            keyword = self.store.search_keywords(text_query=query, document_name=names or None, top_k=pool)
+            chunks = reciprocal_rank_fusion([dense, keyword], k=self.rrf_k)[:self.top_k]
+        else:
+            chunks = dense
         if chunks:
             logger.debug(f"{len(chunks)} text chunks relevant to query `{query}` retrieved by vector retriever")
             text = "\n\n---\n\n".join(c.text for c in chunks)
-            output_path = f"{self.persistent_dir}/text_data.txt"
-            with open(output_path, 'w') as f:
-                f.write(text)
-            return f"Relevant text content saved at `{output_path}`"
+            output_ref = save_artifact(text, self.persistent_dir, "text_data.txt")
+            return f"Relevant text content saved at `{output_ref}`"
         else:
             logger.debug(f"No chunks relevant to `{query}` found by vector retriever")
             return "Unable to retrieve any relevant text"
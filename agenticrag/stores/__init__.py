@@ -1,17 +1,56 @@
-from .table_store import TableStore
-from .text_store import TextStore
-from .meta_store import MetaStore
-from .backends.base import BaseBackend, BaseVectorBackend
-from .backends.sql_backend import SQLBackend
-from .external_db_store import ExternalDBStore
+from typing import TYPE_CHECKING
+
+from agenticrag.utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .table_store import TableStore
+    from .text_store import TextStore, NumpyTextStore
+    from .meta_store import MetaStore
+    from .meta_index import MetaIndex
+    from .answer_cache import AnswerCache
+    from .prompt_cache import PromptCache
+    from .embedding_cache import EmbeddingCache
+    from .session_store import BaseSessionStore, InMemorySessionStore, SQLSessionStore
+    from .backends.base import BaseBackend, BaseVectorBackend
+    from .backends.sql_backend import SQLBackend
+    from .backends.numpy_backend import NumpyBackend
+    from .external_db_store import ExternalDBStore
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TableStore": ".table_store",
+    "TextStore": ".text_store",
+    "NumpyTextStore": ".text_store",
+    "MetaStore": ".meta_store",
+    "MetaIndex": ".meta_index",
+    "AnswerCache": ".answer_cache",
+    "PromptCache": ".prompt_cache",
+    "EmbeddingCache": ".embedding_cache",
+    "BaseSessionStore": ".session_store",
+    "InMemorySessionStore": ".session_store",
+    "SQLSessionStore": ".session_store",
+    "BaseBackend": ".backends.base",
+    "BaseVectorBackend": ".backends.base",
+    "SQLBackend": ".backends.sql_backend",
+    "NumpyBackend": ".backends.numpy_backend",
+    "ExternalDBStore": ".external_db_store",
+})
 
 
 __all__ = [
     "TextStore",
+    "NumpyTextStore",
     "TableStore",
     "MetaStore",
+    "MetaIndex",
+    "AnswerCache",
+    "PromptCache",
+    "EmbeddingCache",
+    "BaseSessionStore",
+    "InMemorySessionStore",
+    "SQLSessionStore",
     "ExternalDBStore",
     "BaseBackend",
     "BaseVectorBackend",
-    "SQLBackend"
-]
\ No newline at end of file
+    "SQLBackend",
+    "NumpyBackend"
+]
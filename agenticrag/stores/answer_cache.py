@@ -0,0 +1,206 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Literal, Optional, Union
+import numpy as np
+from sqlalchemy import Column, Float, Integer, LargeBinary, String, delete, select
+
+from agenticrag.stores.backends.sql_backend import Base, SQLBackend
+from agenticrag.stores.meta_store import MetaStore
+from agenticrag.types.core import CachedAnswer, MetaData, Vector
+from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.embeddings import get_embedding_function
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CachedAnswerModel(Base):
+    __tablename__ = "cached_answers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    query = Column(String, nullable=False)
+    answer = Column(String, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    dataset_versions = Column(String, nullable=False)
+    created_at = Column(Float, nullable=False)
+    last_accessed = Column(Float, nullable=False, index=True)
+
+
+def dataset_version(data: MetaData) -> str:
+    """
+    Fingerprint of a dataset entry's content, changes whenever the dataset is edited or reloaded from another source.
+    It doesn't depend on the entry id, so persisted answers still match a rebuilt catalogue with the same content.
+    """
+    return hashlib.sha1(f"{data.format}|{data.description}|{data.source}".encode()).hexdigest()[:16]
+
+
+class AnswerCache(SQLBackend[CachedAnswerModel, CachedAnswer]):
+    """
+    A persistent semantic cache of RAGAgent answers. A query hits the cache when its embedding is close enough
+    to a stored query and every dataset used for the stored answer still exists in the same version.
+    Entries expire after `ttl_seconds`, the least recently used ones are evicted past `max_entries`,
+    and entries are dropped as soon as one of their datasets is reloaded, edited or deleted through the MetaStore.
+    """
+    def __init__(
+        self,
+        meta_store: MetaStore,
+        embedding_function: Union[Literal['default'], Callable[[str], Vector]] = 'default',
+        connection_url: str = "sqlite:///.agenticrag_data/agenticrag.db",
+        similarity_threshold: float = 0.95,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 1000,
+        max_candidates: int = 5,
+    ):
+        """
+        Args:
+            meta_store (MetaStore): Store holding the datasets answers depend on.
+            embedding_function (Callable, optional): Function mapping text to a vector, defaults to `all-MiniLM-L6-v2`.
+            connection_url (str): Database to persist cached answers in.
+            similarity_threshold (float): Minimum cosine similarity between queries to reuse an answer.
+            ttl_seconds (float, optional): Lifetime of an entry, entries never expire if not provided.
+            max_entries (int): Maximum number of entries kept, least recently used ones are evicted first.
+            max_candidates (int): Number of nearest entries above the threshold checked per lookup, so a stale
+                nearest entry doesn't hide a valid one just behind it.
+        """
+        super().__init__(CachedAnswerModel, CachedAnswer, connection_url)
+        if embedding_function == 'default':
+            embedding_function = get_embedding_function()
+        self.embedding_function = embedding_function
+        self.meta_store = meta_store
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_candidates = max_candidates
+
+        self._lock = threading.Lock()
+        self._ids: List[int] = []
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._datasets: Dict[int, set] = {}
+        self._matrix: Optional[np.ndarray] = None
+
+        self.evict_expired()
+        for entry in self.get_all():
+            self._track(entry)
+        meta_store.add_listener(self._on_meta_change)
+
+    def lookup(self, query: str) -> Optional[CachedAnswer]:
+        """Return a cached answer for a similar query, if one is still valid."""
+        query_vector = self._embed(query)
+        with self._lock:
+            if not self._ids:
+                return None
+            if self._matrix is None:
+                self._matrix = np.stack([self._vectors[i] for i in self._ids])
+            scores = self._matrix @ query_vector
+            nearest = np.argsort(-scores, kind="stable")[:self.max_candidates]
+            candidates = [(self._ids[i], float(scores[i])) for i in nearest if scores[i] >= self.similarity_threshold]
+
+        for entry_id, score in candidates:
+            entry = self.get(entry_id)
+            if entry is None:
+                self._untrack(entry_id)
+                continue
+            now = time.time()
+            if self._is_expired(entry, now) or not self._is_current(entry):
+                logger.debug(f"Discarding stale cached answer id={entry_id}")
+                self.delete(entry_id)
+                continue
+
+            self.update(entry_id, last_accessed=now)
+            logger.info(f"Answer cache hit for id={entry_id} with similarity {score:.3f}")
+            return entry
+        return None
+
+    def put(self, query: str, answer: str, datasets: List[MetaData]) -> CachedAnswer:
+        """Cache an answer along with versions of datasets it was produced from."""
+        vector = self._embed(query)
+        now = time.time()
+        entry = self.add(CachedAnswer(
+            query=query,
+            answer=answer,
+            embedding=vector.tobytes(),
+            dataset_versions=json.dumps({data.name: dataset_version(data) for data in datasets}),
+            created_at=now,
+            last_accessed=now,
+        ))
+        self._track(entry)
+        self._evict_lru()
+        return entry
+
+    def delete(self, id: int) -> None:
+        super().delete(id)
+        self._untrack(id)
+
+    def clear(self) -> None:
+        """Remove all cached answers."""
+        self.delete_entries(list(self._ids))
+
+    def delete_entries(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        try:
+            with self.SessionLocal() as session:
+                session.execute(delete(self.model).where(self.model.id.in_(ids)))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to delete cached answers: {e}")
+            raise StoreError("Failed to delete cached answers.") from e
+        for entry_id in ids:
+            self._untrack(entry_id)
+
+    def evict_expired(self) -> None:
+        """Remove entries older than `ttl_seconds`."""
+        if self.ttl_seconds is None:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        with self.SessionLocal() as session:
+            ids = session.scalars(select(self.model.id).where(self.model.created_at < cutoff)).all()
+        self.delete_entries(list(ids))
+
+    def _evict_lru(self) -> None:
+        overflow = len(self._ids) - self.max_entries
+        if overflow <= 0:
+            return
+        with self.SessionLocal() as session:
+            ids = session.scalars(select(self.model.id).order_by(self.model.last_accessed).limit(overflow)).all()
+        logger.debug(f"Evicting {len(ids)} least recently used cached answers")
+        self.delete_entries(list(ids))
+
+    def _on_meta_change(self, event: str, data: MetaData) -> None:
+        with self._lock:
+            stale = [entry_id for entry_id, names in self._datasets.items() if data.name in names]
+        if stale:
+            logger.info(f"Invalidating {len(stale)} cached answers after {event} of dataset '{data.name}'")
+            self.delete_entries(stale)
+
+    def _is_expired(self, entry: CachedAnswer, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.created_at > self.ttl_seconds
+
+    def _is_current(self, entry: CachedAnswer) -> bool:
+        for name, version in json.loads(entry.dataset_versions).items():
+            current = self.meta_store.index(name=name)
+            if not current or dataset_version(current[0]) != version:
+                return False
+        return True
+
+    def _track(self, entry: CachedAnswer) -> None:
+        with self._lock:
+            if entry.id not in self._vectors:
+                self._ids.append(entry.id)
+            self._vectors[entry.id] = np.frombuffer(entry.embedding, dtype=np.float32)
+            self._datasets[entry.id] = set(json.loads(entry.dataset_versions))
+            self._matrix = None
+
+    def _untrack(self, entry_id: int) -> None:
+        with self._lock:
+            if self._vectors.pop(entry_id, None) is not None:
+                self._ids.remove(entry_id)
+                self._datasets.pop(entry_id, None)
+                self._matrix = None
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedding_function(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,7 +1,14 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Generic, List, Optional, TypeVar, Union
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Literal, Optional, Tuple, TypeVar, Union
 
-from agenticrag.types.core import BaseData
+from agenticrag.stores.keyword_index import BM25Index
+from agenticrag.types.core import BaseData, Vector
+from agenticrag.utils.embeddings import get_embedding_function
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
 
 T = TypeVar("T", bound=BaseData)
 
@@ -22,6 +29,15 @@ class BaseBackend(ABC, Generic[T]):
         """Retrieve all stored data objects."""
         pass
 
+    def iter_all(self, batch_size: int = 1000, fields: List[str] = None) -> Iterator[Union[T, Dict[str, Any]]]:
+        """
+        Iterate over all stored entries, reading `batch_size` at a time so memory stays bounded whatever the store size.
+        With fields, e.g. `["id", "name"]`, yields dicts of just those fields and backends read only those columns.
+        This default reads everything with `get_all`, backends override it to page through their storage.
+        """
+        for item in self.get_all():
+            yield item if fields is None else {field: getattr(item, field, None) for field in fields}
+
     @abstractmethod
     def update(self, id: str, **kwargs) -> None:
         """Update a data object by ID."""
@@ -37,9 +53,178 @@ class BaseBackend(ABC, Generic[T]):
         """Index or search entries filters keys"""
         pass
 
+    def delete_where(self, **filters) -> int:
+        """
+        Delete every entry whose fields equal the given values, e.g. `delete_where(name="report")`, and return how many
+        were deleted. This default deletes entries one by one, backends override it with a single filtered delete.
+        """
+        ids = self._ids_where(filters)
+        for id in ids:
+            self.delete(id)
+        return len(ids)
+
+    def update_where(self, filters: Dict[str, Any], **values) -> int:
+        """
+        Set fields to values on every entry matching filters, e.g. `update_where({"name": "old"}, name="new")`, and
+        return how many were updated. This default updates entries one by one, backends override it with a single
+        filtered update.
+        """
+        ids = self._ids_where(filters)
+        for id in ids:
+            self.update(id, **values)
+        return len(ids)
+
+    def _ids_where(self, filters: Dict[str, Any]) -> List[Any]:
+        if not filters:
+            raise ValueError("At least one filter is required, use get_all and delete to change every entry")
+        return [item["id"] for item in self.iter_all(fields=["id", *filters]) if all(item[k] == v for k, v in filters.items())]
+
+
+_keyword_lock_guard = threading.Lock()
+
 
 class BaseVectorBackend(BaseBackend[T], ABC):
+    _keyword_index: Optional[BM25Index] = None
+
+    def add_many(self, data: List[T]) -> List[T]:
+        """Add several data objects, backends override this to embed and write them in batches."""
+        return [self.add(item) for item in data]
+
     @abstractmethod
     def search_similar(self, text_query: str, document_name: str, top_k: int) -> List[T]:
         """Return top-k similar entries based on a text query."""
         pass
+
+    def search_similar_many(self, text_queries: List[str], document_names: List[str] = None, top_k: int = 5) -> List[List[T]]:
+        """
+        Search several queries over several documents, returning the results of each query. An entry matching several
+        queries is kept only once. Backends override this to embed all queries in one batch and search them in one call,
+        keeping each entry under the query it is most similar to. This default searches every pair separately and
+        keeps the first.
+        """
+        seen, groups = set(), []
+        for query in text_queries:
+            rankings = [self.search_similar(query, name, top_k) for name in document_names] if document_names else [self.search_similar(query, None, top_k)]
+            # Interleave documents rank by rank, without scores no document's results can be preferred.
+            merged = [entry for tier in zip_longest(*rankings) for entry in tier if entry is not None][:top_k]
+            groups.append([entry for entry in merged if str(entry.id) not in seen])
+            seen.update(str(entry.id) for entry in merged)
+        return groups
+
+    @staticmethod
+    def _group_best(ranked: List[List[Tuple[Hashable, float]]]) -> List[List[Hashable]]:
+        """Keys ranked per query, each kept only in the results of the query it scored highest for."""
+        best: Dict[Hashable, Tuple[int, float]] = {}
+        for group, results in enumerate(ranked):
+            for key, score in results:
+                if key not in best or score > best[key][1]:
+                    best[key] = (group, score)
+        return [[key for key, _ in results if best[key][0] == group] for group, results in enumerate(ranked)]
+
+    def search_keywords(self, text_query: str, document_name: Union[str, List[str]] = None, top_k: int = 5) -> List[T]:
+        """
+        Return top-k entries ranked by BM25 keyword score, catching exact identifiers dense search can miss.
+        document_name limits results to one document name or a list of them.
+        The keyword index is built in memory from the stored entries on first use, then kept current with writes
+        made through this instance. Writes by other processes or store instances aren't seen until it is rebuilt.
+        """
+        index = self._keyword_index
+        if index is None:
+            with self._keyword_lock:
+                index = self._keyword_index
+                if index is None:
+                    index = BM25Index()
+                    index.add_many((str(item["id"]), item["text"], item["name"]) for item in self.iter_all(fields=["id", "text", "name"]))
+                    self._keyword_index = index
+                    logger.info(f"Built keyword index over {len(index)} entries")
+        return self._get_many([id for id, _ in index.search(text_query, top_k=top_k, name=document_name)])
+
+    def _get_many(self, ids: List[str]) -> List[T]:
+        """Entries with the given ids in the same order, skipping missing ones. Backends override this to read them at once."""
+        results = [self.get(id) for id in ids]
+        return [item for item in results if item is not None]
+
+    @property
+    def _keyword_lock(self) -> threading.Lock:
+        """
+        Per-store lock held while the keyword index is built and while writes update it, so a write made during the
+        build is either read by it or applied to the finished index.
+        """
+        lock = self.__dict__.get("_keyword_index_lock")
+        if lock is None:
+            with _keyword_lock_guard:
+                lock = self.__dict__.setdefault("_keyword_index_lock", threading.Lock())
+        return lock
+
+    def _index_keywords(self, data: Iterable[T], new_only: bool = False) -> None:
+        """
+        Add entries to the keyword index if it has been built, it picks up everything stored when it is.
+        new_only skips ids already indexed, for backends that ignore adds of existing ids.
+        """
+        with self._keyword_lock:
+            index = self._keyword_index
+            if index is not None:
+                index.add_many(
+                    (str(item.id), item.text, getattr(item, "name", None))
+                    for item in data if not (new_only and str(item.id) in index)
+                )
+
+    def _unindex_keywords(self, ids: Iterable[str]) -> None:
+        with self._keyword_lock:
+            if self._keyword_index is not None:
+                for id in ids:
+                    self._keyword_index.remove(str(id))
+
+    def _rename_keywords(self, ids: Iterable[str], name: str) -> None:
+        with self._keyword_lock:
+            if self._keyword_index is not None:
+                for id in ids:
+                    self._keyword_index.rename(str(id), name)
+
+    def _update_keywords(self, id: str, text: str = None, name: str = None) -> None:
+        """Apply an update to the keyword index from the values written, keeping whichever of text and name is unchanged."""
+        with self._keyword_lock:
+            index = self._keyword_index
+            if index is None or str(id) not in index:
+                return
+            if text is not None:
+                index.add(str(id), text, name if name is not None else index.name_of(id))
+            elif name is not None:
+                index.rename(str(id), name)
+
+    def _init_embeddings(self, embedding_function: Union[Literal['default'], Callable[[str], Vector]], embedding_cache) -> None:
+        """Set up the embedding function, shared default model if 'default', and the optional `EmbeddingCache`."""
+        self.embedding_function = get_embedding_function() if embedding_function == 'default' else embedding_function
+        self.embedding_cache = embedding_cache
+        self._embedding_model = self._embedding_model_id() if embedding_cache is not None else None
+
+    def _embed_many(self, texts: List[str]) -> List[Vector]:
+        """Embed texts, taking ones seen before from the embedding cache and encoding only the rest."""
+        if self._embedding_model is None:
+            return self._encode_many(texts)
+        embeddings = self.embedding_cache.get_many(self._embedding_model, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self._encode_many([texts[i] for i in missing])
+            self.embedding_cache.put_many(self._embedding_model, [texts[i] for i in missing], encoded)
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+        return embeddings
+
+    def _encode_many(self, texts: List[str]) -> List[Vector]:
+        # Embedding functions exposing `embed_many`, like the default one, encode a whole batch in one call.
+        embed_many = getattr(self.embedding_function, "embed_many", None)
+        if embed_many is not None:
+            return list(embed_many(texts))
+        return [self.embedding_function(text) for text in texts]
+
+    def _embedding_model_id(self) -> Optional[str]:
+        """Name identifying the embedding function in cache keys, None if it can't be told apart from others."""
+        model_name = getattr(self.embedding_function, "model_name", None)
+        if model_name:
+            return str(model_name)
+        qualname = getattr(self.embedding_function, "__qualname__", "")
+        if not qualname or "<" in qualname:
+            logger.warning("Embedding cache disabled, set `model_name` on a lambda or local embedding function to enable it")
+            return None
+        return f"{self.embedding_function.__module__}.{qualname}"
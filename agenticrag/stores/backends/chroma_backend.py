@@ -1,9 +1,11 @@
 from abc import ABC
-from typing import Type, TypeVar, Generic, Union, Callable, Literal, List, Optional
+from typing import Any, Dict, Iterator, Type, TypeVar, Generic, Union, Callable, Literal, List, Optional
 from agenticrag.types.core import Vector
 from agenticrag.types.core import VectorData
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.tracing import traced
 from agenticrag.stores.backends.base import BaseVectorBackend
+from agenticrag.stores.embedding_cache import EmbeddingCache
 from agenticrag.types.exceptions import StoreError
 
 logger = setup_logger(__name__)
@@ -16,6 +18,8 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
         schema: Type[SchemaType],
         persistent_dir: str = ".chroma",
         embedding_function: Union[Literal['default'], Callable[[str], Vector]] = 'default',
+        batch_size: int = 256,
+        embedding_cache: EmbeddingCache = None,
     ):
                 
         try:
@@ -23,6 +27,7 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
         except ImportError:
             raise ImportError("ChromaDB is not installed. Please install it with `pip install chromadb`.")
         self.schema = schema
+        self.batch_size = batch_size
         try:
             logger.info(f"Initializing ChromaDB client at {persistent_dir}")
             self.chroma_client = PersistentClient(path=persistent_dir)
@@ -31,31 +36,53 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
             logger.error(f"Failed to initialize Chroma client: {e}")
             raise StoreError("ChromaDB initialization failed.") from e
 
-        if embedding_function == 'default':
-            try:
-                from sentence_transformers import SentenceTransformer
-            except ImportError:
-                raise ImportError("SentenceTransformers is not installed, either use own embedding function or install it via `pip install sentence_transformers`.")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.embedding_function = lambda x: self.embedding_model.encode(x)
-        else:
-            self.embedding_function = embedding_function
+        self._init_embeddings(embedding_function, embedding_cache)
 
+    @traced("{cls}.add")
     def add(self, data: SchemaType) -> None:
         try:
-            embedding = self.embedding_function(data.text)
-            metadata = {k: v for k, v in data.model_dump().items() if k not in {'id', 'text'}}
+            embedding = self._embed_many([data.text])[0]
             self.collection.add(
                 documents=[data.text],
                 embeddings=[embedding],
-                metadatas=[metadata],
+                metadatas=[self._metadata(data)],
                 ids=[str(data.id)],
             )
+            # Chroma ignores ids it already has, so only new ids take the given text.
+            self._index_keywords([data], new_only=True)
             logger.info(f"Added data with id: {data.id}")
         except Exception as e:
             logger.error(f"Failed to add data id={data.id}: {e}")
             raise StoreError("Add failed.") from e
 
+    @traced("{cls}.add_many")
+    def add_many(self, data: List[SchemaType], batch_size: int = None) -> List[SchemaType]:
+        """
+        Add entries in batches of `batch_size`, each embedded with one encoder call and written with one collection write.
+
+        Args:
+            data (List[SchemaType]): Entries to add.
+            batch_size (int, optional): Entries per batch, defaults to the backend's `batch_size`.
+        """
+        batch_size = batch_size or self.batch_size
+        try:
+            for start in range(0, len(data), batch_size):
+                batch = data[start:start + batch_size]
+                texts = [item.text for item in batch]
+                self.collection.add(
+                    documents=texts,
+                    embeddings=self._embed_many(texts),
+                    metadatas=[self._metadata(item) for item in batch],
+                    ids=[str(item.id) for item in batch],
+                )
+                self._index_keywords(batch, new_only=True)
+            logger.info(f"Added {len(data)} entries")
+            return data
+        except Exception as e:
+            logger.error(f"Failed to add {len(data)} entries: {e}")
+            raise StoreError("Add many failed.") from e
+
+    @traced("{cls}.get")
     def get(self, id: str) -> Optional[SchemaType]:
         try:
             results = self.collection.get(ids=[id])
@@ -68,6 +95,21 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
             logger.error(f"Failed to get data id={id}: {e}")
             raise StoreError("Get failed.") from e
 
+    def _get_many(self, ids: List[str]) -> List[SchemaType]:
+        if not ids:
+            return []
+        try:
+            results = self.collection.get(ids=ids)
+            found = {
+                rid: self.schema(**{"id": rid, "text": doc, **meta})
+                for rid, doc, meta in zip(results["ids"], results["documents"], results["metadatas"])
+            }
+            return [found[id] for id in ids if id in found]
+        except Exception as e:
+            logger.error(f"Failed to get {len(ids)} entries: {e}")
+            raise StoreError("Get failed.") from e
+
+    @traced("{cls}.get_all")
     def get_all(self) -> List[SchemaType]:
         try:
             results = self.collection.get()
@@ -79,30 +121,125 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
             logger.error("Failed to get all data: {e}")
             raise StoreError("Get all failed.") from e
 
+    def iter_all(self, batch_size: int = 1000, fields: List[str] = None) -> Iterator[Union[SchemaType, Dict[str, Any]]]:
+        """
+        Iterate over the collection one page of `batch_size` entries at a time. Embeddings are never read,
+        and documents only when `text` is requested.
+
+        Args:
+            batch_size (int): Entries read per collection call.
+            fields (List[str], optional): Fields to read, yielding dicts of them instead of full entries.
+        """
+        unknown = [field for field in fields or [] if field not in self.schema.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.schema.__name__}: {unknown}")
+        wanted = set(self.schema.model_fields) if fields is None else set(fields)
+        include = [part for part, needed in (
+            ("documents", "text" in wanted),
+            ("metadatas", bool(wanted - {"id", "text"})),
+        ) if needed]
+        offset = 0
+        while True:
+            try:
+                results = self.collection.get(limit=batch_size, offset=offset, include=include)
+            except Exception as e:
+                logger.error(f"Failed to iterate data: {e}")
+                raise StoreError("Iterate all failed.") from e
+            for i, rid in enumerate(results["ids"]):
+                values = {"id": rid}
+                if "documents" in include:
+                    values["text"] = results["documents"][i]
+                if "metadatas" in include:
+                    values.update(results["metadatas"][i] or {})
+                yield self.schema(**values) if fields is None else {field: values.get(field) for field in fields}
+            if len(results["ids"]) < batch_size:
+                return
+            offset += batch_size
+
+    @traced("{cls}.update")
     def update(self, id: str, **kwargs) -> None:
         try:
             text = kwargs.get("text", None)
-            embedding = self.embedding_function(text) if text else None
+            embedding = self._embed_many([text])[0] if text else None
             metadata = {k: v for k, v in kwargs.items() if k not in {'id', 'text'}}
             self.collection.update(
                 documents=[text] if text else None,
-                embeddings=[embedding] if embedding else None,
-                metadatas=[metadata],
+                embeddings=[embedding] if embedding is not None else None,
+                metadatas=[metadata] if metadata else None,
                 ids=[id],
             )
+            self._update_keywords(id, text=text or None, name=metadata.get("name"))
             logger.info(f"Updated data with id: {id}")
         except Exception as e:
             logger.error(f"Failed to update data id={id}: {e}")
             raise StoreError("Update failed.") from e
 
+    @traced("{cls}.delete")
     def delete(self, id: str) -> None:
         try:
             self.collection.delete(ids=[id])
+            self._unindex_keywords([id])
             logger.info(f"Deleted data with id: {id}")
         except Exception as e:
             logger.error(f"Failed to delete data id={id}: {e}")
             raise StoreError("Delete failed.") from e
 
+    @traced("{cls}.delete_where")
+    def delete_where(self, **filters) -> int:
+        """
+        Delete every entry whose metadata fields equal the given values with one filtered collection delete.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        where_filter = self._where(filters)
+        try:
+            ids = self.collection.get(where=where_filter, include=[])["ids"]
+            if ids:
+                self.collection.delete(where=where_filter)
+                self._unindex_keywords(ids)
+            logger.info(f"Deleted {len(ids)} entries where {filters}")
+            return len(ids)
+        except Exception as e:
+            logger.error(f"Failed to delete data where {filters}: {e}")
+            raise StoreError("Delete where failed.") from e
+
+    @traced("{cls}.update_where")
+    def update_where(self, filters: Dict[str, Any], **values) -> int:
+        """
+        Set metadata fields to values on every entry matching filters, in as few collection updates as Chroma's
+        batch limit allows. Text can't be changed this way since every entry would need re-embedding.
+
+        Returns:
+            int: Number of entries updated.
+        """
+        where_filter = self._where(filters)
+        if {"id", "text"} & set(values):
+            raise ValueError("update_where can't change id or text, use update for each entry")
+        try:
+            ids = self.collection.get(where=where_filter, include=[])["ids"]
+            batch = self.chroma_client.get_max_batch_size()
+            for start in range(0, len(ids), batch):
+                chunk = ids[start:start + batch]
+                self.collection.update(ids=chunk, metadatas=[dict(values)] * len(chunk))
+            if "name" in values:
+                self._rename_keywords(ids, values["name"])
+            logger.info(f"Updated {len(ids)} entries where {filters}")
+            return len(ids)
+        except Exception as e:
+            logger.error(f"Failed to update data where {filters}: {e}")
+            raise StoreError("Update where failed.") from e
+
+    def _where(self, filters: Dict[str, Any]) -> dict:
+        if not filters:
+            raise ValueError("At least one filter is required, use get_all and delete to change every entry")
+        unknown = [field for field in filters if field not in self.schema.model_fields or field in {"id", "text"}]
+        if unknown:
+            raise ValueError(f"Can't filter {self.schema.__name__} on {unknown}, only metadata fields")
+        clauses = [{key: value} for key, value in filters.items()]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @traced("{cls}.index")
     def index(self, **kwargs) -> List[SchemaType]:
         try:
             id = kwargs.pop("id", None)
@@ -119,9 +256,10 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
             logger.error(f"Failed to index data: {e}")
             raise StoreError("Indexing failed.") from e
 
+    @traced("{cls}.search_similar")
     def search_similar(self, text_query: str, document_name: str = None, top_k: int = 5) -> List[SchemaType]:
         try:
-            embedding = self.embedding_function(text_query)
+            embedding = self._embed_many([text_query])[0]
             where_filter = {"name": document_name} if document_name else None
             results = self.collection.query(query_embeddings=[embedding], where=where_filter, n_results=top_k)
 
@@ -132,3 +270,41 @@ class ChromaBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
         except Exception as e:
             logger.error(f"Search similar failed: {e}")
             raise StoreError("Search similar failed.") from e
+
+    @traced("{cls}.search_similar_many")
+    def search_similar_many(self, text_queries: List[str], document_names: List[str] = None, top_k: int = 5) -> List[List[SchemaType]]:
+        """
+        Search several queries over several documents with one encoder batch and one collection query.
+
+        Args:
+            text_queries (List[str]): Queries to search.
+            document_names (List[str], optional): Only search entries with one of these names, all entries if not provided.
+            top_k (int): Maximum results per query.
+
+        Returns:
+            List[List[SchemaType]]: Results per query, most similar first. An entry matching several queries is only
+            kept under the query it is most similar to.
+        """
+        try:
+            if not text_queries:
+                return []
+            where_filter = {"name": {"$in": list(document_names)}} if document_names else None
+            results = self.collection.query(
+                query_embeddings=self._embed_many(list(text_queries)),
+                where=where_filter,
+                n_results=top_k,
+                include=["documents", "metadatas", "distances"],
+            )
+            entries, ranked = {}, []
+            for ids, docs, metas, distances in zip(results["ids"], results["documents"], results["metadatas"], results["distances"]):
+                ranked.append([(rid, -distance) for rid, distance in zip(ids, distances)])
+                for rid, doc, meta in zip(ids, docs, metas):
+                    entries[rid] = self.schema(**{"id": rid, "text": doc, **meta})
+            return [[entries[rid] for rid in group] for group in self._group_best(ranked)]
+        except Exception as e:
+            logger.error(f"Search similar many failed: {e}")
+            raise StoreError("Search similar many failed.") from e
+
+    @staticmethod
+    def _metadata(data: SchemaType) -> dict:
+        return {k: v for k, v in data.model_dump().items() if k not in {'id', 'text'}}
@@ -0,0 +1,532 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Literal, Optional, Tuple, Type, TypeVar, Union
+import numpy as np
+
+from agenticrag.stores.backends.base import BaseVectorBackend
+from agenticrag.stores.embedding_cache import EmbeddingCache
+from agenticrag.types.core import Vector, VectorData
+from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.tracing import traced
+
+logger = setup_logger(__name__)
+
+SchemaType = TypeVar("SchemaType", bound=VectorData)
+
+
+class NumpyBackend(BaseVectorBackend[SchemaType], ABC, Generic[SchemaType]):
+    """
+    In-process vector backend for small and mid-sized corpora. Normalized float32 embeddings are kept in a
+    memory-mapped matrix and ids, texts and metadata in a SQLite side table. `search_similar` is one
+    matrix-vector product with an `argpartition` top-k, and document name filters are boolean masks,
+    so there is no client startup or database round trip per query.
+
+    With `quantization`, a compact copy of the vectors is kept in memory, int8 codes (4x smaller) or sign bits
+    (32x smaller). Search scans the codes for a shortlist of `top_k * rescore_multiplier` candidates and rescores
+    it against the full-precision vectors on disk, so only shortlisted rows of the matrix are ever read.
+    """
+    INITIAL_CAPACITY = 1024
+    SCAN_CHUNK_ROWS = 8192
+
+    def __init__(
+        self,
+        schema: Type[SchemaType],
+        persistent_dir: str = ".agenticrag_data/numpy_store",
+        embedding_function: Union[Literal['default'], Callable[[str], Vector]] = 'default',
+        batch_size: int = 256,
+        embedding_cache: EmbeddingCache = None,
+        quantization: Optional[Literal['int8', 'binary']] = None,
+        rescore_multiplier: int = None,
+    ):
+        """
+        Args:
+            schema (Type[SchemaType]): Data type stored.
+            persistent_dir (str): Directory holding the vector matrix and side table.
+            embedding_function (Callable, optional): Function mapping text to a vector, defaults to `all-MiniLM-L6-v2`.
+            batch_size (int): Number of entries embedded per encoder call by `add_many`.
+            embedding_cache (EmbeddingCache, optional): Cache consulted before encoding text.
+            quantization (str, optional): 'int8' or 'binary' to search compact in-memory codes, exact float32 scan if not provided.
+            rescore_multiplier (int, optional): Shortlist size as a multiple of `top_k` rescored at full precision, defaults to 4 for int8 and 10 for binary.
+        """
+        if quantization not in (None, "int8", "binary"):
+            raise ValueError("quantization must be None, 'int8' or 'binary'")
+        self.schema = schema
+        self.quantization = quantization
+        self.rescore_multiplier = rescore_multiplier or (10 if quantization == "binary" else 4)
+        self.persistent_dir = persistent_dir
+        self.batch_size = batch_size
+        self._init_embeddings(embedding_function, embedding_cache)
+
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._codes: Optional[np.ndarray] = None
+        self._size = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._names = np.zeros(0, dtype=np.int32)
+        self._name_codes: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+        try:
+            os.makedirs(persistent_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(persistent_dir, "entries.sqlite"), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS entries (row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, text TEXT NOT NULL, metadata TEXT NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._load()
+        except Exception as e:
+            logger.error(f"Failed to initialize numpy backend at {persistent_dir}: {e}")
+            raise StoreError("Numpy backend initialization failed.") from e
+        logger.info(f"Numpy backend opened at {persistent_dir} with {len(self._rows)} entries")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def index_nbytes(self) -> int:
+        """Bytes scanned per search, quantized codes held in memory or the full float32 matrix."""
+        array = self._codes if self.quantization else self._matrix
+        return 0 if array is None else int(array[:self._size].nbytes)
+
+    @traced("{cls}.add")
+    def add(self, data: SchemaType) -> SchemaType:
+        try:
+            self._write([data], self._embed_many([data.text]))
+            logger.info(f"Added data with id: {data.id}")
+            return data
+        except Exception as e:
+            logger.error(f"Failed to add data id={data.id}: {e}")
+            raise StoreError("Add failed.") from e
+
+    @traced("{cls}.add_many")
+    def add_many(self, data: List[SchemaType], batch_size: int = None) -> List[SchemaType]:
+        """
+        Add entries, embedding them `batch_size` at a time.
+
+        Args:
+            data (List[SchemaType]): Entries to add, ids already stored are skipped.
+            batch_size (int, optional): Entries per encoder call, defaults to the backend's `batch_size`.
+        """
+        batch_size = batch_size or self.batch_size
+        try:
+            for start in range(0, len(data), batch_size):
+                batch = [item for item in data[start:start + batch_size] if str(item.id) not in self._rows]
+                if batch:
+                    self._write(batch, self._embed_many([item.text for item in batch]))
+            logger.info(f"Added {len(data)} entries")
+            return data
+        except Exception as e:
+            logger.error(f"Failed to add {len(data)} entries: {e}")
+            raise StoreError("Add many failed.") from e
+
+    @traced("{cls}.get")
+    def get(self, id: str) -> Optional[SchemaType]:
+        try:
+            row = self._db.execute("SELECT id, text, metadata FROM entries WHERE id = ?", (str(id),)).fetchone()
+            return self._to_schema(row) if row else None
+        except Exception as e:
+            logger.error(f"Failed to get data id={id}: {e}")
+            raise StoreError("Get failed.") from e
+
+    def _get_many(self, ids: List[str]) -> List[SchemaType]:
+        if not ids:
+            return []
+        try:
+            placeholders = ", ".join("?" for _ in ids)
+            found = {row[0]: self._to_schema(row) for row in self._db.execute(
+                f"SELECT id, text, metadata FROM entries WHERE id IN ({placeholders})", [str(id) for id in ids]
+            )}
+            return [found[str(id)] for id in ids if str(id) in found]
+        except Exception as e:
+            logger.error(f"Failed to get {len(ids)} entries: {e}")
+            raise StoreError("Get failed.") from e
+
+    @traced("{cls}.get_all")
+    def get_all(self) -> List[SchemaType]:
+        try:
+            rows = self._db.execute("SELECT id, text, metadata FROM entries ORDER BY row").fetchall()
+            return [self._to_schema(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to get all data: {e}")
+            raise StoreError("Get all failed.") from e
+
+    def iter_all(self, batch_size: int = 1000, fields: List[str] = None) -> Iterator[Union[SchemaType, Dict[str, Any]]]:
+        """
+        Iterate over entries in storage order, one page of `batch_size` rows at a time. Texts are only read
+        when `text` is requested.
+
+        Args:
+            batch_size (int): Rows read per query.
+            fields (List[str], optional): Fields to read, yielding dicts of them instead of full entries.
+        """
+        unknown = [field for field in fields or [] if field not in self.schema.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.schema.__name__}: {unknown}")
+        wanted = set(self.schema.model_fields) if fields is None else set(fields)
+        text = "text" if "text" in wanted else "NULL"
+        metadata = "metadata" if wanted - {"id", "text"} else "NULL"
+        last = -1
+        while True:
+            try:
+                with self._lock:
+                    page = self._db.execute(
+                        f"SELECT row, id, {text}, {metadata} FROM entries WHERE row > ? ORDER BY row LIMIT ?", (last, batch_size)
+                    ).fetchall()
+            except Exception as e:
+                logger.error(f"Failed to iterate data: {e}")
+                raise StoreError("Iterate all failed.") from e
+            for _, id, text_value, metadata_value in page:
+                values = {"id": id, "text": text_value, **(json.loads(metadata_value) if metadata_value else {})}
+                yield self.schema(**values) if fields is None else {field: values.get(field) for field in fields}
+            if len(page) < batch_size:
+                return
+            last = page[-1][0]
+
+    @traced("{cls}.update")
+    def update(self, id: str, **kwargs) -> None:
+        try:
+            current = self.get(id)
+            if current is None:
+                raise StoreError(f"No data with id {id}")
+            updated = current.model_copy(update={k: v for k, v in kwargs.items() if k != "id"})
+            text = kwargs.get("text")
+            embedding = self._embed_many([text])[0] if text else None
+            with self._lock:
+                row = self._rows[str(id)]
+                if embedding is not None:
+                    vector = self._normalize(embedding)
+                    self._matrix[row] = vector
+                    self._matrix.flush()
+                    if self._codes is not None:
+                        self._codes[row] = self._quantize(vector[None, :])[0]
+                self._names[row] = self._name_code(getattr(updated, "name", None))
+                self._db.execute(
+                    "UPDATE entries SET text = ?, metadata = ? WHERE id = ?",
+                    (updated.text, json.dumps(self._metadata(updated)), str(id)),
+                )
+                self._db.commit()
+            self._index_keywords([updated])
+            logger.info(f"Updated data with id: {id}")
+        except Exception as e:
+            logger.error(f"Failed to update data id={id}: {e}")
+            raise StoreError("Update failed.") from e
+
+    @traced("{cls}.delete")
+    def delete(self, id: str) -> None:
+        try:
+            with self._lock:
+                row = self._rows.pop(str(id), None)
+                if row is None:
+                    return
+                self._alive[row] = False
+                self._names[row] = -1
+                self._free_rows.append(row)
+                self._db.execute("DELETE FROM entries WHERE id = ?", (str(id),))
+                self._db.commit()
+            self._unindex_keywords([id])
+            logger.info(f"Deleted data with id: {id}")
+        except Exception as e:
+            logger.error(f"Failed to delete data id={id}: {e}")
+            raise StoreError("Delete failed.") from e
+
+    @traced("{cls}.delete_where")
+    def delete_where(self, **filters) -> int:
+        """
+        Delete every entry whose metadata fields equal the given values with one filtered delete.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        clauses, params = self._where(filters)
+        try:
+            with self._lock:
+                matched = self._db.execute(f"SELECT row, id FROM entries WHERE {clauses}", params).fetchall()
+                for row, id in matched:
+                    self._rows.pop(id, None)
+                    self._alive[row] = False
+                    self._names[row] = -1
+                    self._free_rows.append(row)
+                self._db.execute(f"DELETE FROM entries WHERE {clauses}", params)
+                self._db.commit()
+            self._unindex_keywords(id for _, id in matched)
+            logger.info(f"Deleted {len(matched)} entries where {filters}")
+            return len(matched)
+        except Exception as e:
+            logger.error(f"Failed to delete data where {filters}: {e}")
+            raise StoreError("Delete where failed.") from e
+
+    @traced("{cls}.update_where")
+    def update_where(self, filters: Dict[str, Any], **values) -> int:
+        """
+        Set metadata fields to values on every entry matching filters with one filtered update.
+        Text can't be changed this way since every entry would need re-embedding.
+
+        Returns:
+            int: Number of entries updated.
+        """
+        clauses, params = self._where(filters)
+        if {"id", "text"} & set(values):
+            raise ValueError("update_where can't change id or text, use update for each entry")
+        unknown = [field for field in values if field not in self.schema.model_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.schema.__name__}: {unknown}")
+        assignments = ", ".join(f"'$.{key}', ?" for key in values)
+        try:
+            with self._lock:
+                matched = self._db.execute(f"SELECT row, id FROM entries WHERE {clauses}", params).fetchall()
+                self._db.execute(f"UPDATE entries SET metadata = json_set(metadata, {assignments}) WHERE {clauses}", [*values.values(), *params])
+                self._db.commit()
+                if "name" in values:
+                    code = self._name_code(values["name"])
+                    self._names[[row for row, _ in matched]] = code
+            if "name" in values:
+                self._rename_keywords((id for _, id in matched), values["name"])
+            logger.info(f"Updated {len(matched)} entries where {filters}")
+            return len(matched)
+        except Exception as e:
+            logger.error(f"Failed to update data where {filters}: {e}")
+            raise StoreError("Update where failed.") from e
+
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, list]:
+        if not filters:
+            raise ValueError("At least one filter is required, use get_all and delete to change every entry")
+        unknown = [field for field in filters if field not in self.schema.model_fields or field in {"id", "text"}]
+        if unknown:
+            raise ValueError(f"Can't filter {self.schema.__name__} on {unknown}, only metadata fields")
+        return " AND ".join(f"json_extract(metadata, '$.{key}') = ?" for key in filters), list(filters.values())
+
+    @traced("{cls}.index")
+    def index(self, **kwargs) -> List[SchemaType]:
+        try:
+            id = kwargs.pop("id", None)
+            where_filter = {k: v for k, v in kwargs.items() if k not in {"id", "text"} and v is not None}
+            if not where_filter:
+                return []
+            clauses = [f"json_extract(metadata, '$.{key}') = ?" for key in where_filter if key.isidentifier()]
+            params = [v for k, v in where_filter.items() if k.isidentifier()]
+            if id is not None:
+                clauses.append("id = ?")
+                params.append(str(id))
+            rows = self._db.execute(f"SELECT id, text, metadata FROM entries WHERE {' AND '.join(clauses)} ORDER BY row", params).fetchall()
+            return [self._to_schema(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to index data: {e}")
+            raise StoreError("Indexing failed.") from e
+
+    @traced("{cls}.search_similar")
+    def search_similar(self, text_query: str, document_name: str = None, top_k: int = 5) -> List[SchemaType]:
+        try:
+            query = self._normalize(self._embed_many([text_query])[0])
+            ranked = self._search([query], [document_name] if document_name else None, top_k)
+            return self._fetch_rows([int(row) for row in ranked[0][0]]) if ranked else []
+        except Exception as e:
+            logger.error(f"Search similar failed: {e}")
+            raise StoreError("Search similar failed.") from e
+
+    @traced("{cls}.search_similar_many")
+    def search_similar_many(self, text_queries: List[str], document_names: List[str] = None, top_k: int = 5) -> List[List[SchemaType]]:
+        """
+        Search several queries over several documents at once: queries are embedded in one encoder batch
+        and scored in one pass over the matrix.
+
+        Args:
+            text_queries (List[str]): Queries to search.
+            document_names (List[str], optional): Only search entries with one of these names, all entries if not provided.
+            top_k (int): Maximum results per query.
+
+        Returns:
+            List[List[SchemaType]]: Results per query, most similar first. An entry matching several queries is only
+            kept under the query it is most similar to.
+        """
+        try:
+            if not text_queries:
+                return []
+            queries = [self._normalize(embedding) for embedding in self._embed_many(list(text_queries))]
+            ranked = self._search(queries, document_names, top_k)
+            if not ranked:
+                return [[] for _ in text_queries]
+            groups = self._group_best([[(int(row), float(score)) for row, score in zip(rows, scores)] for rows, scores in ranked])
+            entries = self._entries_at({row for group in groups for row in group})
+            return [[entries[row] for row in group if row in entries] for group in groups]
+        except Exception as e:
+            logger.error(f"Search similar many failed: {e}")
+            raise StoreError("Search similar many failed.") from e
+
+    def _search(self, queries: List[np.ndarray], document_names: Optional[List[str]], top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(rows, scores) of the `top_k` most similar live rows per query, empty if nothing can match."""
+        with self._lock:
+            matrix, codes, size = self._matrix, self._codes, self._size
+            alive, names = self._alive[:size], self._names[:size]
+            name_codes = [self._name_codes[name] for name in document_names or [] if name in self._name_codes]
+        if matrix is None or (document_names and not name_codes):
+            return []
+
+        if document_names:
+            candidates = np.flatnonzero(np.isin(names, name_codes))
+        else:
+            candidates = np.flatnonzero(alive) if not alive.all() else None
+        return self._rank(np.stack(queries), matrix, codes, candidates, size, top_k)
+
+    def _rank(self, queries: np.ndarray, matrix: np.ndarray, codes: Optional[np.ndarray], candidates: Optional[np.ndarray], size: int, top_k: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(rows, scores) of the `top_k` most similar vectors to each query among candidates, all live rows if candidates is None."""
+        if codes is None:
+            scores = self._scan(matrix, candidates, size, lambda block: block @ queries.T)
+            ranked = []
+            for column in scores.T:
+                top = self._top_k(column, top_k)
+                ranked.append((top if candidates is None else candidates[top], column[top]))
+            return ranked
+
+        if self.quantization == "int8":
+            approx = self._scan(codes, candidates, size, lambda block: block.astype(np.float32) @ queries.T)
+        else:
+            # Set bits are scored against the float query, which ranks far better than Hamming distance between codes.
+            dim = queries.shape[1]
+            approx = self._scan(codes, candidates, size, lambda block: np.unpackbits(block, axis=1, count=dim).astype(np.float32) @ queries.T)
+        ranked = []
+        for query, column in zip(queries, approx.T):
+            shortlist = self._top_k(column, top_k * self.rescore_multiplier)
+            shortlist = np.sort(shortlist if candidates is None else candidates[shortlist])
+            exact = matrix[shortlist] @ query
+            top = self._top_k(exact, top_k)
+            ranked.append((shortlist[top], exact[top]))
+        return ranked
+
+    def _scan(self, array: np.ndarray, rows: Optional[np.ndarray], size: int, score: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """Score the first `size` rows of array, or the given rows, in chunks to bound temporary memory."""
+        total = size if rows is None else len(rows)
+        scores = None
+        # At least one, possibly empty, block is scored so the result has the score function's shape.
+        for start in range(0, max(total, 1), self.SCAN_CHUNK_ROWS):
+            end = min(start + self.SCAN_CHUNK_ROWS, total)
+            block = score(array[start:end] if rows is None else array[rows[start:end]])
+            if scores is None:
+                scores = np.empty((total,) + block.shape[1:], dtype=np.float32)
+            scores[start:end] = block
+        return scores
+
+    def _quantize(self, vectors: np.ndarray) -> np.ndarray:
+        if self.quantization == "int8":
+            # Normalized vectors lie in [-1, 1], so one global scale keeps full int8 range without per-row parameters.
+            return np.clip(np.rint(vectors * 127), -127, 127).astype(np.int8)
+        return np.packbits(vectors > 0, axis=1)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the highest scores in descending order, selected in linear time."""
+        k = min(top_k, scores.shape[0])
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _write(self, data: List[SchemaType], embeddings: List[Vector]) -> None:
+        vectors = np.stack([self._normalize(embedding) for embedding in embeddings])
+        with self._lock:
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                self._db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('dim', ?)", (str(self._dim),))
+            elif vectors.shape[1] != self._dim:
+                raise StoreError(f"Embedding dimension {vectors.shape[1]} doesn't match stored dimension {self._dim}")
+
+            placed = []
+            for item, vector in zip(data, vectors):
+                if str(item.id) in self._rows:
+                    continue
+                row = self._free_rows.pop() if self._free_rows else self._size
+                self._size = max(self._size, row + 1)
+                self._rows[str(item.id)] = row
+                placed.append((row, item, vector))
+            self._ensure_capacity(self._size)
+
+            records = []
+            for row, item, vector in placed:
+                self._matrix[row] = vector
+                if self._codes is not None:
+                    self._codes[row] = self._quantize(vector[None, :])[0]
+                self._alive[row] = True
+                self._names[row] = self._name_code(getattr(item, "name", None))
+                records.append((row, str(item.id), item.text, json.dumps(self._metadata(item))))
+            self._matrix.flush()
+            self._db.executemany("INSERT OR REPLACE INTO entries (row, id, text, metadata) VALUES (?, ?, ?, ?)", records)
+            self._db.commit()
+        self._index_keywords(item for _, item, _ in placed)
+
+    def _load(self) -> None:
+        setting = self._db.execute("SELECT value FROM settings WHERE key = 'dim'").fetchone()
+        if setting is None:
+            return
+        self._dim = int(setting[0])
+        rows = self._db.execute("SELECT row, id, json_extract(metadata, '$.name') FROM entries").fetchall()
+        self._size = max((row for row, _, _ in rows), default=-1) + 1
+        self._ensure_capacity(self._size)
+        for row, id, name in rows:
+            self._rows[id] = row
+            self._alive[row] = True
+            self._names[row] = self._name_code(name)
+        self._free_rows = [row for row in range(self._size) if not self._alive[row]]
+        if self._codes is not None:
+            for start in range(0, self._size, self.SCAN_CHUNK_ROWS):
+                end = min(start + self.SCAN_CHUNK_ROWS, self._size)
+                self._codes[start:end] = self._quantize(np.asarray(self._matrix[start:end]))
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Open the vector matrix, growing the file and masks to hold `size` rows."""
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if self._matrix is not None and capacity >= size:
+            return
+        path = os.path.join(self.persistent_dir, "vectors.f32")
+        row_bytes = self._dim * 4
+        capacity = max(capacity, os.path.getsize(path) // row_bytes if os.path.exists(path) else 0, self.INITIAL_CAPACITY)
+        while capacity < size:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+        with open(path, "ab") as f:
+            f.truncate(capacity * row_bytes)
+        self._matrix = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+        self._names = np.concatenate([self._names, np.full(capacity - len(self._names), -1, dtype=np.int32)])
+        if self.quantization:
+            width = self._dim if self.quantization == "int8" else (self._dim + 7) // 8
+            dtype = np.int8 if self.quantization == "int8" else np.uint8
+            codes = np.zeros((capacity, width), dtype=dtype)
+            if self._codes is not None:
+                codes[:len(self._codes)] = self._codes
+            self._codes = codes
+
+    def _name_code(self, name: Optional[str]) -> int:
+        if name is None:
+            return -1
+        return self._name_codes.setdefault(name, len(self._name_codes))
+
+    def _fetch_rows(self, rows: List[int]) -> List[SchemaType]:
+        entries = self._entries_at(rows)
+        return [entries[row] for row in rows if row in entries]
+
+    def _entries_at(self, rows: Iterable[int]) -> Dict[int, SchemaType]:
+        rows = list(rows)
+        if not rows:
+            return {}
+        placeholders = ", ".join("?" for _ in rows)
+        return {row: self._to_schema((id, text, metadata)) for row, id, text, metadata in self._db.execute(
+            f"SELECT row, id, text, metadata FROM entries WHERE row IN ({placeholders})", rows
+        )}
+
+    def _to_schema(self, row) -> SchemaType:
+        id, text, metadata = row
+        return self.schema(**{"id": id, "text": text, **json.loads(metadata)})
+
+    @staticmethod
+    def _normalize(embedding: Vector) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _metadata(data: SchemaType) -> dict:
+        return {k: v for k, v in data.model_dump().items() if k not in {'id', 'text'}}
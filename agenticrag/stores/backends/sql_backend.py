@@ -1,14 +1,15 @@
 from abc import ABC
 import os
-from typing import TypeVar, Generic, List, Optional, Type
+from typing import Any, Dict, Iterator, TypeVar, Generic, List, Optional, Type, Union
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy import create_engine, select, and_
+from sqlalchemy import create_engine, delete, inspect, select, update, and_
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 from agenticrag.types.exceptions import StoreError
 from agenticrag.stores.backends.base import BaseBackend
 from agenticrag.types.core import BaseData
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.tracing import traced
 
 logger = setup_logger(__name__)
 
@@ -37,6 +38,7 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             logger.error(f"Failed to initialize database engine: {e}")
             raise StoreError("DB engine initialization failed.") from e
 
+    @traced("{cls}.add")
     def add(self, data: SchemaType) -> SchemaType:
         model_instance = self.model(**data.model_dump())
         try:
@@ -49,6 +51,7 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             logger.error(f"Failed to add data: {e}")
             raise StoreError("Failed to add data.") from e
 
+    @traced("{cls}.get")
     def get(self, id: str) -> Optional[SchemaType]:
         try:
             with self.SessionLocal() as session:
@@ -62,6 +65,7 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             logger.error(f"Failed to retrieve data with id={id}: {e}")
             raise StoreError("Failed to retrieve data.") from e
 
+    @traced("{cls}.get_all")
     def get_all(self) -> List[SchemaType]:
         try:
             with self.SessionLocal() as session:
@@ -72,7 +76,41 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             logger.error(f"Failed to retrieve all data: {e}")
             raise StoreError("Failed to retrieve all data.") from e
 
+    def iter_all(self, batch_size: int = 1000, fields: List[str] = None) -> Iterator[Union[SchemaType, Dict[str, Any]]]:
+        """
+        Iterate over all rows in primary key order, one query per `batch_size` rows.
 
+        Args:
+            batch_size (int): Rows read per query.
+            fields (List[str], optional): Columns to read, yielding dicts of them instead of full entries.
+        """
+        unknown = [field for field in fields or [] if not hasattr(self.model, field)]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.model.__name__}: {unknown}")
+        key = inspect(self.model).primary_key[0]
+        last = None
+        while True:
+            try:
+                with self.SessionLocal() as session:
+                    stmt = select(self.model) if fields is None else select(key, *(getattr(self.model, field) for field in fields))
+                    if last is not None:
+                        stmt = stmt.where(key > last)
+                    stmt = stmt.order_by(key).limit(batch_size)
+                    if fields is None:
+                        page = [(getattr(obj, key.key), self.schema.model_validate(obj, from_attributes=True)) for obj in session.scalars(stmt)]
+                    else:
+                        page = [(row[0], dict(zip(fields, row[1:]))) for row in session.execute(stmt)]
+            except Exception as e:
+                logger.error(f"Failed to iterate data: {e}")
+                raise StoreError("Failed to iterate data.") from e
+            # The session is closed before yielding, so slow consumers don't hold a connection.
+            for _, item in page:
+                yield item
+            if len(page) < batch_size:
+                return
+            last = page[-1][0]
+
+    @traced("{cls}.delete")
     def delete(self, id: str) -> None:
         try:
             with self.SessionLocal() as session:
@@ -88,6 +126,7 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             raise StoreError("Failed to delete data.") from e
         
 
+    @traced("{cls}.update")
     def update(self, id: str, **kwargs) -> None:
         try:
             with self.SessionLocal() as session:
@@ -105,6 +144,56 @@ class SQLBackend(BaseBackend[SchemaType], ABC, Generic[ModelType, SchemaType]):
             raise StoreError("Failed to update data.") from e
 
 
+    @traced("{cls}.delete_where")
+    def delete_where(self, **filters) -> int:
+        """
+        Delete every row whose columns equal the given values with one DELETE statement.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        conditions = self._conditions(filters)
+        try:
+            with self.SessionLocal() as session:
+                deleted = session.execute(delete(self.model).where(and_(*conditions))).rowcount
+                session.commit()
+                logger.info(f"Deleted {deleted} entries where {filters}")
+                return deleted
+        except Exception as e:
+            logger.error(f"Failed to delete data where {filters}: {e}")
+            raise StoreError("Failed to delete data.") from e
+
+    @traced("{cls}.update_where")
+    def update_where(self, filters: Dict[str, Any], **values) -> int:
+        """
+        Set columns to values on every row matching filters with one UPDATE statement.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        conditions = self._conditions(filters)
+        unknown = [field for field in values if not hasattr(self.model, field)]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.model.__name__}: {unknown}")
+        try:
+            with self.SessionLocal() as session:
+                updated = session.execute(update(self.model).where(and_(*conditions)).values(**values)).rowcount
+                session.commit()
+                logger.info(f"Updated {updated} entries where {filters}")
+                return updated
+        except Exception as e:
+            logger.error(f"Failed to update data where {filters}: {e}")
+            raise StoreError("Failed to update data.") from e
+
+    def _conditions(self, filters: Dict[str, Any]) -> list:
+        if not filters:
+            raise ValueError("At least one filter is required, use get_all and delete to change every entry")
+        unknown = [field for field in filters if not hasattr(self.model, field)]
+        if unknown:
+            raise ValueError(f"Unknown fields for {self.model.__name__}: {unknown}")
+        return [getattr(self.model, k) == v for k, v in filters.items()]
+
+    @traced("{cls}.index")
     def index(self, **filters) -> List[SchemaType]:
         valid_filters = {
             k: v for k, v in filters.items()
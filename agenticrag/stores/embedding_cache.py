@@ -0,0 +1,179 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from agenticrag.types.core import Vector
+from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class EmbeddingCache:
+    """
+    A persistent, content-addressed cache of embeddings keyed by a hash of model and text, so unchanged text
+    is never encoded twice, across re-ingestion, re-chunking and rebuilt collections. Vectors are kept in
+    memory-mapped arrays, one file per dimension, with a SQLite index of keys and slots. Past `max_entries`
+    the least recently used entries are evicted and their slots reused. One cache can be shared by several stores.
+    """
+    INITIAL_CAPACITY = 1024
+
+    def __init__(
+        self,
+        directory: str = ".agenticrag_data/embedding_cache",
+        max_entries: int = 200_000,
+        dtype: str = "float16",
+    ):
+        """
+        Args:
+            directory (str): Directory holding the vector files and index.
+            max_entries (int): Maximum number of embeddings kept.
+            dtype (str): `float16` halves disk and memory use at a negligible precision cost, `float32` stores vectors exactly.
+        """
+        if dtype not in ("float16", "float32"):
+            raise ValueError("dtype must be 'float16' or 'float32'")
+        self.directory = directory
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._arrays: Dict[int, np.memmap] = {}
+        self._next_slot: Dict[int, int] = {}
+        self._free_slots: Dict[int, List[int]] = {}
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(directory, f"index_{dtype}.sqlite"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, slot INTEGER NOT NULL, last_accessed REAL NOT NULL)"
+            )
+            for key, dim, slot in self._db.execute("SELECT key, dim, slot FROM entries ORDER BY last_accessed"):
+                self._entries[key] = (dim, slot)
+                self._next_slot[dim] = max(self._next_slot.get(dim, 0), slot + 1)
+            for dim, next_slot in self._next_slot.items():
+                used = {slot for d, slot in self._entries.values() if d == dim}
+                self._free_slots[dim] = [slot for slot in range(next_slot) if slot not in used]
+        except Exception as e:
+            logger.error(f"Failed to open embedding cache at {directory}: {e}")
+            raise StoreError("Embedding cache initialization failed.") from e
+        logger.info(f"Embedding cache opened at {directory} with {len(self._entries)} entries")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Hit, miss and eviction counts since creation, along with hit rate."""
+        with self._lock:
+            metrics = dict(self._counters)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return cached embeddings of texts, None for texts not in the cache."""
+        keys = [self.key(model, text) for text in texts]
+        now = time.time()
+        with self._lock:
+            results, touched = [], []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    results.append(None)
+                    continue
+                dim, slot = entry
+                results.append(np.array(self._arrays_for(dim)[slot], dtype=np.float32))
+                self._entries.move_to_end(key)
+                touched.append((now, key))
+            self._counters["hits"] += len(touched)
+            self._counters["misses"] += len(keys) - len(touched)
+            if touched:
+                self._db.executemany("UPDATE entries SET last_accessed = ? WHERE key = ?", touched)
+                self._db.commit()
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Vector]) -> None:
+        """Cache embeddings of texts, evicting least recently used entries past `max_entries`."""
+        now = time.time()
+        with self._lock:
+            rows, written = [], set()
+            for text, vector in zip(texts, vectors):
+                key = self.key(model, text)
+                if key in self._entries:
+                    continue
+                vector = np.asarray(vector, dtype=np.float32).ravel()
+                while len(self._entries) >= self.max_entries:
+                    self._evict_oldest()
+                dim = vector.shape[0]
+                slot = self._allocate(dim)
+                self._arrays_for(dim)[slot] = vector
+                self._entries[key] = (dim, slot)
+                rows.append((key, dim, slot, now))
+                written.add(dim)
+            for dim in written:
+                self._arrays[dim].flush()
+            if rows:
+                self._db.executemany("INSERT OR REPLACE INTO entries (key, dim, slot, last_accessed) VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove all cached embeddings."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._entries.clear()
+            for dim in list(self._arrays):
+                del self._arrays[dim]
+                os.remove(self._path(dim))
+            self._next_slot.clear()
+            self._free_slots.clear()
+
+    def _evict_oldest(self) -> None:
+        key, (dim, slot) = self._entries.popitem(last=False)
+        self._free_slots.setdefault(dim, []).append(slot)
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._counters["evictions"] += 1
+
+    def _allocate(self, dim: int) -> int:
+        free = self._free_slots.setdefault(dim, [])
+        if free:
+            return free.pop()
+        slot = self._next_slot.get(dim, 0)
+        self._next_slot[dim] = slot + 1
+        return slot
+
+    def _path(self, dim: int) -> str:
+        return os.path.join(self.directory, f"vectors_{dim}_{self.dtype.name}.mmap")
+
+    def _arrays_for(self, dim: int) -> np.memmap:
+        """Memory-mapped array holding vectors of a dimension, grown to fit every allocated slot."""
+        array = self._arrays.get(dim)
+        needed = self._next_slot.get(dim, 0)
+        if array is not None and array.shape[0] >= needed:
+            return array
+
+        path = self._path(dim)
+        row_bytes = dim * self.dtype.itemsize
+        existing = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+        capacity = max(existing, self.INITIAL_CAPACITY)
+        while capacity < needed:
+            capacity *= 2
+        capacity = min(capacity, max(self.max_entries, needed))
+        if array is not None:
+            array.flush()
+            del self._arrays[dim]
+        with open(path, "ab") as f:
+            f.truncate(capacity * row_bytes)
+        self._arrays[dim] = np.memmap(path, dtype=self.dtype, mode="r+", shape=(capacity, dim))
+        return self._arrays[dim]
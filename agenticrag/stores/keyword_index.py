@@ -0,0 +1,120 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+TOKEN_PATTERN = re.compile(r"\w+(?:[-.:/]\w+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens. Compound identifiers such as `ERR-4021`, `orders.customer_id` or `v2.3.1` are kept
+    whole and also split into their parts, so both exact and partial mentions match.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(match)
+        parts = re.split(r"[-.:/]", match)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """
+    An in-memory inverted index scoring entries with Okapi BM25. Entries are added and removed one at a time,
+    so the index stays current as a store changes without being rebuilt.
+    """
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1 (float): Term frequency saturation, higher values reward repeated terms more.
+            b (float): Document length normalization, from 0 (none) to 1 (full).
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._names: Dict[str, Optional[str]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, id: str) -> bool:
+        return str(id) in self._lengths
+
+    def add(self, id: str, text: str, name: str = None) -> None:
+        """Index an entry, replacing it if the id is already indexed."""
+        id = str(id)
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(id)
+            for term, count in counts.items():
+                self._postings.setdefault(term, {})[id] = count
+            length = sum(counts.values())
+            self._lengths[id] = length
+            self._terms[id] = list(counts)
+            self._names[id] = name
+            self._total_length += length
+
+    def add_many(self, entries: Iterable[Tuple[str, str, Optional[str]]]) -> None:
+        """Index (id, text, name) triples."""
+        for id, text, name in entries:
+            self.add(id, text, name)
+
+    def name_of(self, id: str) -> Optional[str]:
+        return self._names.get(str(id))
+
+    def rename(self, id: str, name: str) -> None:
+        """Change the name an entry is filtered by, its terms are unchanged."""
+        with self._lock:
+            if str(id) in self._names:
+                self._names[str(id)] = name
+
+    def remove(self, id: str) -> None:
+        with self._lock:
+            self._remove(str(id))
+
+    def search(self, query: str, top_k: int = 5, name: Union[str, Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Return up to top_k (id, score) pairs, best first, for entries sharing at least one term with the query.
+
+        Args:
+            query (str): Free text query.
+            top_k (int): Maximum number of results.
+            name (Union[str, Iterable[str]], optional): Only score entries with this name, or one of these names.
+        """
+        names = None if name is None else {name} if isinstance(name, str) else set(name)
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for id, frequency in postings.items():
+                    if names is not None and self._names[id] not in names:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[id] / average_length)
+                    scores[id] = scores.get(id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def _remove(self, id: str) -> None:
+        terms = self._terms.pop(id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(id)
+        del self._names[id]
@@ -0,0 +1,120 @@
+import threading
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
+import numpy as np
+
+from agenticrag.stores.meta_store import MetaStore
+from agenticrag.types.core import MetaData, Vector
+from agenticrag.utils.embeddings import get_embedding_function
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class MetaIndex:
+    """
+    In-memory embedding index over dataset descriptions in a MetaStore, used to shortlist
+    datasets before asking the LLM to pick among them. The index subscribes to MetaStore
+    writes, so datasets added, renamed or deleted are reflected immediately.
+    """
+    def __init__(
+        self,
+        meta_store: MetaStore,
+        embedding_function: Union[Literal['default'], Callable[[str], Vector]] = 'default',
+        top_n: int = 20,
+        min_similarity: Optional[float] = None,
+        llm_skip_threshold: Optional[int] = None,
+    ):
+        """
+        Args:
+            meta_store (MetaStore): Store whose datasets are indexed.
+            embedding_function (Callable, optional): Function mapping text to a vector, defaults to `all-MiniLM-L6-v2`.
+            top_n (int): Number of candidates handed to the LLM once the catalogue grows past it.
+            min_similarity (float, optional): Cosine similarity below which candidates are dropped.
+            llm_skip_threshold (int, optional): Catalogue size above which the LLM is skipped and the shortlist is used as is.
+        """
+        if embedding_function == 'default':
+            embedding_function = get_embedding_function()
+        self.embedding_function = embedding_function
+        self.meta_store = meta_store
+        self.top_n = top_n
+        self.min_similarity = min_similarity
+        self.llm_skip_threshold = llm_skip_threshold
+
+        self._lock = threading.Lock()
+        self._entries: Dict[int, MetaData] = {}
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._ids: List[int] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        for data in meta_store.get_all():
+            self._upsert(data)
+        meta_store.add_listener(self._on_meta_change)
+        logger.info(f"Meta index built over {len(self._entries)} datasets")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def catalogue(self) -> List[MetaData]:
+        """Return all indexed datasets."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def search(self, query: str, top_n: int = None, min_similarity: float = None) -> List[Tuple[MetaData, float]]:
+        """Return up to `top_n` datasets most similar to the query along with their cosine similarity."""
+        top_n = top_n or self.top_n
+        min_similarity = self.min_similarity if min_similarity is None else min_similarity
+        query_vector = self._embed(query)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.stack([self._vectors[i] for i in self._ids]) if self._ids else np.empty((0, 0))
+            if not self._ids:
+                return []
+            scores = self._matrix @ query_vector
+            ids = list(self._ids)
+            entries = dict(self._entries)
+
+        k = min(top_n, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (entries[ids[i]], float(scores[i]))
+            for i in top
+            if min_similarity is None or scores[i] >= min_similarity
+        ]
+
+    def shortlist(self, query: str) -> Tuple[List[MetaData], bool]:
+        """
+        Return candidate datasets for the query and whether LLM selection can be skipped.
+        Small catalogues are returned as is so the LLM sees every dataset.
+        """
+        size = len(self)
+        if size <= self.top_n:
+            return self.catalogue(), False
+        candidates = [data for data, _ in self.search(query)]
+        skip_llm = self.llm_skip_threshold is not None and size > self.llm_skip_threshold
+        logger.debug(f"Shortlisted {len(candidates)} of {size} datasets, skip_llm={skip_llm}")
+        return candidates, skip_llm
+
+    def _on_meta_change(self, event: str, data: MetaData) -> None:
+        if event == "delete":
+            with self._lock:
+                if self._entries.pop(data.id, None) is not None:
+                    self._vectors.pop(data.id, None)
+                    self._ids.remove(data.id)
+                    self._matrix = None
+        else:
+            self._upsert(data)
+
+    def _upsert(self, data: MetaData) -> None:
+        vector = self._embed(f"{data.name}: {data.description}")
+        with self._lock:
+            if data.id not in self._entries:
+                self._ids.append(data.id)
+            self._entries[data.id] = data
+            self._vectors[data.id] = vector
+            self._matrix = None
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedding_function(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -1,9 +1,15 @@
+from typing import Any, Callable, Dict, List
 from sqlalchemy import Column, Integer, String
 from agenticrag.stores.backends.sql_backend import Base
 
 from agenticrag.types.core import MetaData
 from agenticrag.stores.backends.sql_backend import SQLBackend
 from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+MetaListener = Callable[[str, MetaData], None]
 
 class MetaDataModel(Base):
     __tablename__ = "meta_data"
@@ -18,13 +24,63 @@ class MetaDataModel(Base):
 class MetaStore(SQLBackend[MetaDataModel, MetaData]):
     """
     A specialized store to store metadata of various data.
+    Listeners registered with `add_listener` are notified after every write, so derived indexes and caches can stay in sync.
     """
     def __init__(self, connection_url = "sqlite:///.agenticrag_data/agenticrag.db"):
         super().__init__(MetaDataModel, MetaData, connection_url)
+        self._listeners: List[MetaListener] = []
+
+    def add_listener(self, listener: MetaListener) -> None:
+        """
+        Register a callback called as `listener(event, data)` after each write,
+        where event is one of "add", "update" or "delete".
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: MetaListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, data: MetaData) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.error(f"Meta store listener failed on {event} of '{data.name}': {e}")
         
     def add(self, data: MetaData) -> MetaData:
         if_already_existing = self.index(name=data.name)
         if if_already_existing:
             raise StoreError("Data with same name already exists, can't have 2 entries with same name")
         else:
-            return super().add(data)
\ No newline at end of file
+            meta = super().add(data)
+            self._notify("add", meta)
+            return meta
+
+    def update(self, id: str, **kwargs) -> None:
+        super().update(id, **kwargs)
+        meta = self.get(id)
+        if meta:
+            self._notify("update", meta)
+
+    def delete(self, id: str) -> None:
+        meta = self.get(id) if self._listeners else None
+        super().delete(id)
+        if meta:
+            self._notify("delete", meta)
+
+    def delete_where(self, **filters) -> int:
+        deleted = self.index(**filters) if self._listeners else []
+        count = super().delete_where(**filters)
+        for meta in deleted:
+            self._notify("delete", meta)
+        return count
+
+    def update_where(self, filters: Dict[str, Any], **values) -> int:
+        ids = [meta.id for meta in self.index(**filters)] if self._listeners else []
+        count = super().update_where(filters, **values)
+        for id in ids:
+            meta = self.get(id)
+            if meta:
+                self._notify("update", meta)
+        return count
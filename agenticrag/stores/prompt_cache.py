@@ -0,0 +1,128 @@
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import Column, Float, Integer, String, Text, delete, func, select, update
+
+from agenticrag.stores.backends.sql_backend import Base, SQLBackend
+from agenticrag.types.core import CachedPrompt
+from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CachedPromptModel(Base):
+    __tablename__ = "prompt_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, unique=True, nullable=False, index=True)
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(Float, nullable=False)
+    last_accessed = Column(Float, nullable=False, index=True)
+
+
+class PromptCache(SQLBackend[CachedPromptModel, CachedPrompt]):
+    """
+    A persistent exact-match cache of LLM responses keyed by a hash of model, parameters and messages.
+    Entries expire after `ttl_seconds`, and least recently used ones are evicted past `max_entries` or `max_bytes`.
+    Hits, misses and evictions are counted in `metrics`.
+    """
+    def __init__(
+        self,
+        connection_url: str = "sqlite:///.agenticrag_data/agenticrag.db",
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            connection_url (str): Database to persist cached responses in.
+            ttl_seconds (float, optional): Lifetime of an entry, entries never expire if not provided.
+            max_entries (int): Maximum number of entries kept.
+            max_bytes (int, optional): Maximum total size of cached responses.
+        """
+        super().__init__(CachedPromptModel, CachedPrompt, connection_url)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Hit, miss, eviction and expiration counts since creation, along with hit rate."""
+        with self._lock:
+            metrics = dict(self._counters)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if present and not expired."""
+        now = time.time()
+        try:
+            with self.SessionLocal() as session:
+                row = session.scalars(select(self.model).where(self.model.key == key)).first()
+                if row is not None and self.ttl_seconds is not None and now - row.created_at > self.ttl_seconds:
+                    session.delete(row)
+                    session.commit()
+                    self._count("expirations")
+                    row = None
+                if row is None:
+                    self._count("misses")
+                    return None
+                response = row.response
+                session.execute(update(self.model).where(self.model.id == row.id).values(last_accessed=now))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Prompt cache lookup failed: {e}")
+            raise StoreError("Prompt cache lookup failed.") from e
+        self._count("hits")
+        return response
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response under key, replacing any previous one."""
+        now = time.time()
+        try:
+            with self.SessionLocal() as session:
+                session.execute(delete(self.model).where(self.model.key == key))
+                session.add(self.model(
+                    key=key, model=model, response=response, size=len(response.encode()),
+                    created_at=now, last_accessed=now,
+                ))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to cache prompt response: {e}")
+            raise StoreError("Failed to cache prompt response.") from e
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self.SessionLocal() as session:
+            session.execute(delete(self.model))
+            session.commit()
+
+    def _evict(self) -> None:
+        with self.SessionLocal() as session:
+            count, total = session.execute(select(func.count(self.model.id), func.coalesce(func.sum(self.model.size), 0))).one()
+            ids = []
+            if count > self.max_entries:
+                ids = list(session.scalars(select(self.model.id).order_by(self.model.last_accessed).limit(count - self.max_entries)))
+            if self.max_bytes is not None and total > self.max_bytes:
+                ids, excess = [], total - self.max_bytes
+                for entry_id, size in session.execute(select(self.model.id, self.model.size).order_by(self.model.last_accessed)):
+                    if excess <= 0 and len(ids) >= count - self.max_entries:
+                        break
+                    ids.append(entry_id)
+                    excess -= size
+            if ids:
+                session.execute(delete(self.model).where(self.model.id.in_(ids)))
+                session.commit()
+                self._count("evictions", len(ids))
+                logger.debug(f"Evicted {len(ids)} cached prompt responses")
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += n
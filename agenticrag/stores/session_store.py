@@ -0,0 +1,185 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+from sqlalchemy import Column, Float, Integer, String, delete, func, select
+
+from agenticrag.stores.backends.sql_backend import Base, SQLBackend
+from agenticrag.types.core import ChatMessage
+from agenticrag.types.exceptions import StoreError
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BaseSessionStore(ABC):
+    """
+    Abstract base class for stores keeping chat history per conversation, so one RAGAgent can serve many sessions.
+    Messages are dicts with `role` and `content` keys.
+    """
+    @abstractmethod
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """Return recent messages of a session, oldest first."""
+        pass
+
+    @abstractmethod
+    def append(self, session_id: str, message: Dict[str, str]) -> List[Dict[str, str]]:
+        """Append a message to a session and return its updated recent history."""
+        pass
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None:
+        """Remove all messages of a session."""
+        pass
+
+
+class InMemorySessionStore(BaseSessionStore):
+    """
+    Thread-safe in-memory session store keeping the last `max_messages` messages of up to `max_sessions`
+    sessions, evicting the least recently used session first.
+    """
+    def __init__(self, max_messages: int = 10, max_sessions: int = 10000):
+        self.max_messages = max_messages
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, deque]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                return []
+            self._sessions.move_to_end(session_id)
+            return list(history)
+
+    def append(self, session_id: str, message: Dict[str, str]) -> List[Dict[str, str]]:
+        with self._lock:
+            history = self._sessions.get(session_id)
+            if history is None:
+                history = self._sessions[session_id] = deque(maxlen=self.max_messages)
+                while len(self._sessions) > self.max_sessions:
+                    evicted, _ = self._sessions.popitem(last=False)
+                    logger.debug(f"Evicted least recently used session '{evicted}'")
+            self._sessions.move_to_end(session_id)
+            history.append(dict(message))
+            return list(history)
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class ChatMessageModel(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String, nullable=False, index=True)
+    role = Column(String, nullable=False)
+    content = Column(String, nullable=False)
+    created_at = Column(Float, nullable=False, index=True)
+
+
+class SQLSessionStore(SQLBackend[ChatMessageModel, ChatMessage], BaseSessionStore):
+    """
+    A session store persisting chat messages in a SQL database, shared by every process connected to it.
+    Only the last `max_messages` messages of a session are kept, older ones are deleted as new ones are appended.
+    Sessions idle for longer than `ttl_seconds` read as empty, and are deleted by the next append to any session
+    once `expire_interval_seconds` have passed since the last sweep.
+    """
+    def __init__(
+        self,
+        connection_url: str = "sqlite:///.agenticrag_data/agenticrag.db",
+        max_messages: int = 10,
+        ttl_seconds: Optional[float] = None,
+        expire_interval_seconds: float = 60,
+    ):
+        """
+        Args:
+            connection_url (str): Database to persist chat messages in.
+            max_messages (int): Number of most recent messages kept per session.
+            ttl_seconds (float, optional): Time since its last message after which a session expires, sessions never expire if not provided.
+            expire_interval_seconds (float): Minimum time between two sweeps deleting expired sessions.
+        """
+        super().__init__(ChatMessageModel, ChatMessage, connection_url)
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self.expire_interval_seconds = expire_interval_seconds
+        self._expired_at: Optional[float] = None
+        self._expire_lock = threading.Lock()
+        try:
+            # Tables created before the created_at index existed don't get it from create(checkfirst=True).
+            for index in self.model.__table__.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+        except Exception as e:
+            logger.error(f"Failed to create chat message indexes: {e}")
+            raise StoreError("Failed to create chat message indexes.") from e
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        try:
+            with self.SessionLocal() as session:
+                stmt = (
+                    select(self.model)
+                    .where(self.model.session_id == session_id)
+                    .order_by(self.model.id.desc())
+                    .limit(self.max_messages)
+                )
+                rows = session.scalars(stmt).all()
+                if rows and self.ttl_seconds is not None and time.time() - rows[0].created_at > self.ttl_seconds:
+                    return []
+                return [{"role": row.role, "content": row.content} for row in reversed(rows)]
+        except Exception as e:
+            logger.error(f"Failed to load history of session '{session_id}': {e}")
+            raise StoreError("Failed to load session history.") from e
+
+    def append(self, session_id: str, message: Dict[str, str]) -> List[Dict[str, str]]:
+        now = time.time()
+        try:
+            with self.SessionLocal() as session:
+                if self.ttl_seconds is not None and self._expire_due(now):
+                    self._expire(session, now - self.ttl_seconds)
+                session.add(self.model(session_id=session_id, role=message["role"], content=message["content"], created_at=now))
+                session.flush()
+                oldest_kept = session.scalars(
+                    select(self.model.id)
+                    .where(self.model.session_id == session_id)
+                    .order_by(self.model.id.desc())
+                    .offset(self.max_messages - 1)
+                    .limit(1)
+                ).first()
+                if oldest_kept is not None:
+                    session.execute(delete(self.model).where(self.model.session_id == session_id, self.model.id < oldest_kept))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to append to session '{session_id}': {e}")
+            raise StoreError("Failed to append to session.") from e
+        return self.get_history(session_id)
+
+    def clear(self, session_id: str) -> None:
+        try:
+            with self.SessionLocal() as session:
+                session.execute(delete(self.model).where(self.model.session_id == session_id))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to clear session '{session_id}': {e}")
+            raise StoreError("Failed to clear session.") from e
+
+    def _expire_due(self, now: float) -> bool:
+        with self._expire_lock:
+            if self._expired_at is not None and now - self._expired_at < self.expire_interval_seconds:
+                return False
+            self._expired_at = now
+            return True
+
+    def _expire(self, session, cutoff: float) -> None:
+        # Only sessions with a message older than the cutoff can be idle, found through the created_at index.
+        candidates = select(self.model.session_id).where(self.model.created_at < cutoff).distinct()
+        expired = list(session.scalars(
+            select(self.model.session_id)
+            .where(self.model.session_id.in_(candidates))
+            .group_by(self.model.session_id)
+            .having(func.max(self.model.created_at) < cutoff)
+        ))
+        if expired:
+            session.execute(delete(self.model).where(self.model.session_id.in_(expired)))
+            logger.debug(f"Expired {len(expired)} idle sessions")
@@ -1,5 +1,7 @@
-from typing import Callable, Literal, List, Union
+from typing import Callable, Literal, List, Optional, Union
 from agenticrag.stores.backends.chroma_backend import ChromaBackend
+from agenticrag.stores.backends.numpy_backend import NumpyBackend
+from agenticrag.stores.embedding_cache import EmbeddingCache
 from agenticrag.types.core import TextData
 
 
@@ -8,5 +10,30 @@ class TextStore(ChromaBackend[TextData]):
     A specialized vector-based store for text data using ChromaDB.
     """
 
-    def __init__(self, persistent_dir: str = ".agenticrag_data", embedding_function: Union[Literal['default'], Callable[[str], List[float]]] = 'default'):
-        super().__init__(schema=TextData, persistent_dir=persistent_dir, embedding_function=embedding_function)
+    def __init__(self, persistent_dir: str = ".agenticrag_data", embedding_function: Union[Literal['default'], Callable[[str], List[float]]] = 'default', batch_size: int = 256, embedding_cache: EmbeddingCache = None):
+        super().__init__(schema=TextData, persistent_dir=persistent_dir, embedding_function=embedding_function, batch_size=batch_size, embedding_cache=embedding_cache)
+
+
+class NumpyTextStore(NumpyBackend[TextData]):
+    """
+    A drop-in replacement for `TextStore` searching an in-process, memory-mapped matrix instead of ChromaDB.
+    """
+
+    def __init__(
+        self,
+        persistent_dir: str = ".agenticrag_data/numpy_store",
+        embedding_function: Union[Literal['default'], Callable[[str], List[float]]] = 'default',
+        batch_size: int = 256,
+        embedding_cache: EmbeddingCache = None,
+        quantization: Optional[Literal['int8', 'binary']] = None,
+        rescore_multiplier: int = None,
+    ):
+        super().__init__(
+            schema=TextData,
+            persistent_dir=persistent_dir,
+            embedding_function=embedding_function,
+            batch_size=batch_size,
+            embedding_cache=embedding_cache,
+            quantization=quantization,
+            rescore_multiplier=rescore_multiplier,
+        )
@@ -1,5 +1,21 @@
-from .question_answering_agent import QuestionAnsweringTask
-from .chart_generation_task import ChartGenerationTask
-from .base import BaseTask
+from typing import TYPE_CHECKING
 
-__all__ = ["QuestionAnsweringTask", "ChartGenerationTask", "BaseTask"]
\ No newline at end of file
+from agenticrag.utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .question_answering_agent import QuestionAnsweringTask
+    from .chart_generation_task import ChartGenerationTask
+    from .base import BaseTask
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "QuestionAnsweringTask": ".question_answering_agent",
+    "ChartGenerationTask": ".chart_generation_task",
+    "BaseTask": ".base",
+})
+
+
+__all__ = [
+    "QuestionAnsweringTask",
+    "ChartGenerationTask",
+    "BaseTask"
+]
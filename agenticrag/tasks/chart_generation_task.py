@@ -8,8 +8,10 @@ from agenticrag.tasks.utils.prompts import CHART_GENERATION_PROMPT
 from agenticrag.loaders.utils.extract_csv_structure import extract_csv_structure
 from agenticrag.utils.local_sandbox_executor import LocalPythonExecutor
 from agenticrag.utils.helpers import parse_code_blobs
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.artifacts import artifact_path
+from agenticrag.utils.llm import get_gateway
 from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.tracing import span
 from agenticrag.types.exceptions import TaskExecutionError
 
 logger = setup_logger(__name__)
@@ -22,7 +24,7 @@ class ChartGenerationTask(BaseTask):
     """
 
     def __init__(self, llm:BaseChatModel = None, save_charts_at=".agenticrag_data/charts"):
-        self.llm = llm or get_default_llm()
+        self.llm = get_gateway(llm)
         self.save_charts_at = save_charts_at
 
     @property
@@ -32,7 +34,7 @@ class ChartGenerationTask(BaseTask):
     @property
     def description(self):
         return (
-            "This task takes a CSV file path and a chart query, "
+            "This task takes a CSV file path (or table reference returned by a retriever) and a chart query, "
             "generates Python code via LLM to create the chart, "
             "executes it, and returns the chart's saved path."
         )
@@ -45,15 +47,16 @@ class ChartGenerationTask(BaseTask):
         and returns the path to the saved chart image.
 
         Args:
-            file_path (str): Path to the input CSV file.
+            file_path (str): Path to the input CSV file or a table artifact reference.
             query (str): Natural language query describing the desired chart.
         """
         try:
             logger.info(f"Starting chart generation for: {file_path}, query: '{query}'")
 
-            structure = extract_csv_structure(file_path)
             output_path = f"{self.save_charts_at}/"
             os.makedirs(output_path, exist_ok=True)
+            file_path = artifact_path(file_path)
+            structure = extract_csv_structure(file_path)
 
             base_messages = ChatPromptTemplate.from_messages(
                 [
@@ -80,7 +83,8 @@ class ChartGenerationTask(BaseTask):
                 try:
                     llm_response = self.llm.invoke(messages).content
                     code = parse_code_blobs(llm_response)
-                    chart_path = executor(code)
+                    with span("sandbox.execute"):
+                        chart_path = executor(code)
                     logger.info(f"Chart successfully saved at: {chart_path}")
                     return f"Relevant chart saved at {chart_path}"
                 except ValueError as e:
@@ -4,7 +4,8 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from agenticrag.tasks.base import BaseTask
 from agenticrag.tasks.utils.prompts import QA_PROMPT
 from agenticrag.utils.logging_config import setup_logger
-from agenticrag.utils.llm import get_default_llm
+from agenticrag.utils.llm import get_gateway
+from agenticrag.utils.artifacts import load_artifact_text
 from agenticrag.types.exceptions import TaskExecutionError
 
 logger = setup_logger(__name__)
@@ -17,7 +18,7 @@ class QuestionAnsweringTask(BaseTask):
     """
 
     def __init__(self, llm: BaseChatModel = None):
-        self.llm = llm or get_default_llm()
+        self.llm = get_gateway(llm)
 
     @property
     def name(self):
@@ -27,7 +28,7 @@ class QuestionAnsweringTask(BaseTask):
     def description(self):
         return (
             "This task answers questions based on given file content. "
-            "It takes a query and file path as input and returns the answer."
+            "It takes a query and file path (or artifact reference returned by a retriever) as input and returns the answer."
         )
 
     def execute(self, query: str, file_path: str) -> str:
@@ -36,13 +37,12 @@ class QuestionAnsweringTask(BaseTask):
 
         Args:
             query: The user's question.
-            file_path: Path to the file containing context.
+            file_path: Path to the file or artifact reference containing context.
         """
         try:
             logger.info(f"Running QuestionAnswering task for query: '{query}' on file: '{file_path}'")
 
-            with open(file_path, 'r') as file:
-                context = file.read()
+            context = load_artifact_text(file_path)
 
             if not context.strip():
                 raise TaskExecutionError("Context file is empty.")
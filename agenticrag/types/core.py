@@ -50,6 +50,55 @@ class ExternalDBData(BaseData):
             raise ValueError("Either 'connection_url' or 'connection_url_env_var' must be provided.")
         return self
 
+class CachedAnswer(BaseData):
+    id: Optional[int] = None
+    query: str
+    answer: str
+    embedding: bytes
+    dataset_versions: str
+    created_at: float
+    last_accessed: float
+
+class CachedPrompt(BaseData):
+    id: Optional[int] = None
+    key: str
+    model: str
+    response: str
+    size: int
+    created_at: float
+    last_accessed: float
+
+class ChatMessage(BaseData):
+    id: Optional[int] = None
+    session_id: str
+    role: str
+    content: str
+    created_at: float
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time_ns: int = 0
+    end_time_ns: Optional[int] = None
+    attributes: dict = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_time_ns is None else (self.end_time_ns - self.start_time_ns) / 1e6
+
+@dataclass
+class Trace:
+    trace_id: str
+    spans: list = field(default_factory=list)
+
+    def find(self, name: str) -> list:
+        """Return finished spans with given name."""
+        return [span for span in self.spans if span.name == name]
+
 @dataclass
 class RAGAgentResponse:
     success: bool
@@ -57,4 +106,50 @@ class RAGAgentResponse:
     iterations: Optional[int] = None
     datasets: list = field(default_factory=list)
     retrievers: list = field(default_factory=list)
-    tasks: list = field(default_factory=list)
\ No newline at end of file
+    tasks: list = field(default_factory=list)
+    error: Optional[str] = None
+    cached: bool = False
+    tokens_saved: int = 0
+    trace: Optional[Trace] = None
+
+@dataclass
+class RAGAgentEvent:
+    """Base class for events yielded by `RAGAgent.stream`."""
+    pass
+
+@dataclass
+class TasksSelectedEvent(RAGAgentEvent):
+    tasks: list = field(default_factory=list)
+
+@dataclass
+class DatasetsSelectedEvent(RAGAgentEvent):
+    datasets: list = field(default_factory=list)
+
+@dataclass
+class RetrieversSelectedEvent(RAGAgentEvent):
+    retrievers: list = field(default_factory=list)
+
+@dataclass
+class ToolCallEvent(RAGAgentEvent):
+    tool: str
+    args: dict = field(default_factory=dict)
+    iteration: int = 0
+
+@dataclass
+class ToolOutputEvent(RAGAgentEvent):
+    tool: str
+    output: str
+    iteration: int = 0
+
+@dataclass
+class AnswerTokenEvent(RAGAgentEvent):
+    token: str
+
+@dataclass
+class AnswerRetractedEvent(RAGAgentEvent):
+    # Answer tokens streamed since the previous retraction belong to a controller turn that was rejected, discard them.
+    iteration: int = 0
+
+@dataclass
+class ResponseEvent(RAGAgentEvent):
+    response: RAGAgentResponse
@@ -0,0 +1,172 @@
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from agenticrag.utils.helpers import unique_output_path
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+ARTIFACT_PREFIX = "artifact://"
+
+
+class ArtifactStore:
+    """
+    Hands data from retrievers to tasks in memory instead of through files. Within `scope()`, typically one
+    agent invocation, `save_artifact` keeps text and DataFrames in memory and returns a handle like
+    `artifact://text_data_1a2b3c4d.txt`, which tasks resolve with `load_artifact` or `artifact_path`.
+    Values larger than `spill_threshold_bytes`, or saved outside a scope, are written to disk as before.
+    Files a scope writes, spilled values and artifacts materialized for `artifact_path`, are deleted when it exits.
+    """
+    def __init__(self, spill_threshold_bytes: int = 10 * 1024 * 1024):
+        """
+        Args:
+            spill_threshold_bytes (int): Size above which artifacts are written to disk instead of kept in memory.
+        """
+        self.spill_threshold_bytes = spill_threshold_bytes
+
+    @contextmanager
+    def scope(self) -> Iterator["_ArtifactScope"]:
+        """Open an artifact scope, handles saved and files written within it are released when it exits."""
+        scope = _ArtifactScope(self.spill_threshold_bytes)
+        token = _current_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            try:
+                _current_scope.reset(token)
+            except ValueError:
+                # An abandoned stream may be closed by garbage collection from another context.
+                pass
+            scope.clear()
+
+
+class _ArtifactScope:
+    def __init__(self, spill_threshold_bytes: int):
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self._artifacts: Dict[str, Any] = {}
+        self._paths: Dict[str, str] = {}
+        self._files: List[str] = []
+        self._temp_dir: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def put(self, value: Any, filename: str) -> str:
+        stem, ext = os.path.splitext(filename)
+        handle = f"{ARTIFACT_PREFIX}{stem}_{uuid.uuid4().hex[:8]}{ext}"
+        with self._lock:
+            self._artifacts[handle] = value
+        return handle
+
+    def get(self, handle: str) -> Any:
+        with self._lock:
+            if handle not in self._artifacts:
+                raise KeyError(f"Unknown artifact `{handle}`, it may belong to another invocation.")
+            return self._artifacts[handle]
+
+    def path(self, handle: str, directory: str = None) -> str:
+        with self._lock:
+            path = self._paths.get(handle)
+            if path is None and directory is None:
+                if self._temp_dir is None:
+                    self._temp_dir = tempfile.mkdtemp(prefix="agenticrag_artifacts_")
+                directory = self._temp_dir
+        if path is None:
+            path = _write(self.get(handle), directory, handle[len(ARTIFACT_PREFIX):])
+            with self._lock:
+                self._paths[handle] = path
+                self._files.append(path)
+        return path
+
+    def track(self, path: str) -> None:
+        """Delete a file written on behalf of this scope when it is cleared."""
+        with self._lock:
+            self._files.append(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._artifacts.clear()
+            self._paths.clear()
+            files, self._files = self._files, []
+            temp_dir, self._temp_dir = self._temp_dir, None
+        for path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Failed to remove artifact file {path}: {e}")
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+_current_scope: ContextVar[Optional[_ArtifactScope]] = ContextVar("agenticrag_artifact_scope", default=None)
+
+
+def save_artifact(value: Any, directory: str, filename: str) -> str:
+    """
+    Save text or a DataFrame produced by a retriever and return a reference to it: an in-memory handle
+    inside an artifact scope, or the path of a file written under directory otherwise. Files spilled
+    within a scope are deleted with it.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return _write(value, directory, filename)
+    if _size(value) <= scope.spill_threshold_bytes:
+        return scope.put(value, filename)
+    path = _write(value, directory, filename)
+    scope.track(path)
+    return path
+
+
+def load_artifact(ref: str) -> Any:
+    """Return the value behind a reference, text of a file if it is a path."""
+    if ref.startswith(ARTIFACT_PREFIX):
+        return _require_scope(ref).get(ref)
+    with open(ref, "r") as f:
+        return f.read()
+
+
+def load_artifact_text(ref: str) -> str:
+    """Return the value behind a reference as text, DataFrames are rendered as CSV."""
+    value = load_artifact(ref)
+    return value if isinstance(value, str) else value.to_csv(index=False)
+
+
+def artifact_path(ref: str, directory: str = None) -> str:
+    """
+    Return a file path for a reference. In-memory artifacts are written under directory when a path is needed,
+    or under a temporary directory of the scope if none is given, and deleted when the scope exits.
+    """
+    if ref.startswith(ARTIFACT_PREFIX):
+        return _require_scope(ref).path(ref, directory)
+    return ref
+
+
+def _require_scope(ref: str) -> _ArtifactScope:
+    scope = _current_scope.get()
+    if scope is None:
+        raise KeyError(f"Artifact `{ref}` can't be resolved outside of an artifact scope.")
+    return scope
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    return int(value.memory_usage(deep=True).sum())
+
+
+def _write(value: Any, directory: str, filename: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    output_path = unique_output_path(directory, filename)
+    if isinstance(value, str):
+        with open(output_path, "w") as f:
+            f.write(value)
+    else:
+        value.to_csv(output_path, index=False)
+    logger.debug(f"Artifact written to {output_path}")
+    return output_path
@@ -0,0 +1,83 @@
+import importlib.util
+import threading
+from typing import Any, Dict, List
+
+from agenticrag.types.core import Vector
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class EmbeddingModelRegistry:
+    """
+    Loads each SentenceTransformer model once per process, on first use, and shares it between every store
+    embedding with it. Models are thread-safe for encoding, so a single copy serves all stores and projects.
+    """
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = DEFAULT_EMBEDDING_MODEL) -> Any:
+        """Return the model, loading it if this is the first time it is needed."""
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+        with self._lock:
+            lock = self._locks.setdefault(model_name, threading.Lock())
+        # Loading takes seconds, so other models stay available while this one loads.
+        with lock:
+            model = self._models.get(model_name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                logger.info(f"Loading embedding model {model_name}")
+                model = self._models[model_name] = SentenceTransformer(model_name)
+        return model
+
+    def loaded(self) -> List[str]:
+        """Names of models loaded so far."""
+        return list(self._models)
+
+    def unload(self, model_name: str) -> None:
+        """Drop a model, it is loaded again the next time a store embeds with it."""
+        with self._lock:
+            self._models.pop(model_name, None)
+
+
+embedding_models = EmbeddingModelRegistry()
+
+
+class SharedEmbeddingFunction:
+    """Embedding function backed by a shared registry model, the model is only loaded on the first call."""
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, registry: EmbeddingModelRegistry = None):
+        if importlib.util.find_spec("sentence_transformers") is None:
+            raise ImportError("SentenceTransformers is not installed, either use own embedding function or install it via `pip install sentence_transformers`.")
+        self.model_name = model_name
+        self.registry = registry or embedding_models
+
+    def __call__(self, text: str) -> Vector:
+        return self.registry.get(self.model_name).encode(text)
+
+    def embed_many(self, texts: List[str], batch_size: int = 32) -> List[Vector]:
+        """Embed several texts with batched encoder calls."""
+        return list(self.registry.get(self.model_name).encode(texts, batch_size=batch_size))
+
+    def warmup(self) -> None:
+        """Load the model now instead of on the first call."""
+        self.registry.get(self.model_name)
+
+
+def get_embedding_function(model_name: str = DEFAULT_EMBEDDING_MODEL) -> SharedEmbeddingFunction:
+    """Return an embedding function sharing the process-wide copy of a SentenceTransformer model."""
+    return SharedEmbeddingFunction(model_name)
+
+
+def warmup(*model_names: str) -> None:
+    """
+    Load embedding models ahead of the first query, e.g. when a server starts.
+    Loads the default model if no name is given.
+    """
+    for model_name in model_names or (DEFAULT_EMBEDDING_MODEL,):
+        embedding_models.get(model_name)
@@ -1,7 +1,20 @@
-from typing import Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
+import asyncio
+import contextvars
+import os
 import re
 import json
 import ast
+import uuid
+
+
+async def run_in_executor(func: Callable, *args) -> Any:
+    """
+    Run a blocking call on the event loop's default executor with a copy of the caller's context,
+    so context variables such as the current trace and LLM priority carry over into the thread.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, contextvars.copy_context().run, func, *args)
 
 
 def format_tool_metadata(tools_dict):
@@ -23,6 +36,13 @@ def format_datasets(datasets):
 """
     return result
 
+def unique_output_path(directory: str, filename: str) -> str:
+    """
+    Build a per-call output path in directory, so concurrent tool calls don't overwrite each other's files.
+    """
+    stem, ext = os.path.splitext(filename)
+    return f"{directory}/{stem}_{uuid.uuid4().hex[:8]}{ext}"
+
 def extract_blocks_from_llm_response(content: str, start_sep: str, end_sep: str, multiple: bool = False) -> Union[List[str], str]:
     """
     Extract text blocks between two separators.
@@ -50,6 +70,64 @@ def extract_json_blocks(content: str, multiple: bool = False) -> Union[List[Dict
 
     return parsed if multiple else parsed[0] if parsed else {}
 
+class FinalAnswerStreamer:
+    """
+    Accumulates streamed controller output and incrementally extracts the `answer` argument of a `final_answer` tool call,
+    so its tokens can be forwarded while the LLM is still generating.
+    """
+    FINAL_ANSWER_PATTERN = re.compile(r'"tool"\s*:\s*"final_answer".*?"answer"\s*:\s*"', re.DOTALL)
+
+    def __init__(self):
+        self.content = ""
+        self.emitted = ""
+        self._answer_start = None
+        self._closed = False
+
+    def feed(self, chunk: Union[str, list]) -> str:
+        """Add a streamed chunk and return newly available answer text, if any."""
+        if not isinstance(chunk, str):
+            chunk = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in chunk)
+        self.content += chunk
+        if self._closed:
+            return ""
+        if self._answer_start is None:
+            match = self.FINAL_ANSWER_PATTERN.search(self.content)
+            if not match:
+                return ""
+            self._answer_start = match.end()
+
+        raw = self.content[self._answer_start:]
+        end = self._complete_prefix_length(raw)
+        try:
+            decoded = json.loads(f'"{raw[:end]}"', strict=False)
+        except json.JSONDecodeError:
+            return ""
+        if not self._closed and decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            decoded = decoded[:-1]  # wait for the low surrogate of a split pair
+        new_text = decoded[len(self.emitted):]
+        self.emitted = decoded
+        return new_text
+
+    def remainder(self, answer: str) -> str:
+        """Return part of the final answer that was not streamed yet."""
+        return answer[len(self.emitted):] if answer.startswith(self.emitted) else ""
+
+    def _complete_prefix_length(self, raw: str) -> int:
+        i = 0
+        while i < len(raw):
+            char = raw[i]
+            if char == "\\":
+                step = 6 if raw[i + 1:i + 2] == "u" else 2
+                if i + step > len(raw):
+                    return i
+                i += step
+            elif char == '"':
+                self._closed = True
+                return i
+            else:
+                i += 1
+        return i
+
 def parse_code_blobs(blob: str) -> str:
     """
     Extract code blocks from a string. If no block is found, attempts to validate the string as code.
@@ -0,0 +1,23 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level `__getattr__` and `__dir__` for a package whose public names are imported on first access.
+    exports maps each name to the submodule defining it, relative to the package, e.g. `{"RAGAgent": ".rag_agent"}`.
+    """
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Cache on the package so later lookups don't come back here.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | exports.keys())
+
+    return __getattr__, __dir__
@@ -1,10 +1,81 @@
 # utils/llm.py
 
 import os
+import threading
+from typing import Optional
 from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from agenticrag.stores.prompt_cache import PromptCache
+from agenticrag.utils.llm_gateway import LLMGateway
+from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.scheduler import LLMScheduler
 load_dotenv()
 
+logger = setup_logger(__name__)
+
+# The default prompt cache is off unless this is set, to "1" for DEFAULT_PROMPT_CACHE_URL or to a database url.
+PROMPT_CACHE_ENV = "AGENTICRAG_PROMPT_CACHE"
+DEFAULT_PROMPT_CACHE_URL = "sqlite:///.agenticrag_data/agenticrag.db"
+DEFAULT_PROMPT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+_default_llm = None
+_default_scheduler = None
+_default_prompt_cache = None
+_default_lock = threading.Lock()
+
+
 def get_default_llm():
+    """
+    Return the default LLM, a process-wide `LLMGateway` around Gemini-2.0-flash shared by every component
+    created without an explicit LLM, with the default scheduler and, if enabled, the default prompt cache.
+    """
+    global _default_llm
+    with _default_lock:
+        if _default_llm is None:
+            _default_llm = LLMGateway(llm=_create_gemini_llm(), scheduler=_scheduler(), prompt_cache=_prompt_cache())
+        return _default_llm
+
+
+def get_gateway(llm: Optional[BaseChatModel] = None) -> BaseChatModel:
+    """
+    Return the gateway a component should call: the default LLM if llm is None, llm itself if it already is
+    a gateway or isn't a chat model, and otherwise a gateway around llm sharing the default scheduler and
+    prompt cache, so explicitly passed models are queued, rate limited and cached like the default one.
+    """
+    if llm is None:
+        return get_default_llm()
+    if isinstance(llm, LLMGateway) or not isinstance(llm, BaseChatModel):
+        return llm
+    with _default_lock:
+        return LLMGateway(llm=llm, scheduler=_scheduler(), prompt_cache=_prompt_cache())
+
+
+def _scheduler() -> LLMScheduler:
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = LLMScheduler()
+    return _default_scheduler
+
+
+def _prompt_cache() -> Optional[PromptCache]:
+    global _default_prompt_cache
+    setting = os.getenv(PROMPT_CACHE_ENV, "0")
+    if setting == "0":
+        return None
+    if _default_prompt_cache is None:
+        try:
+            _default_prompt_cache = PromptCache(
+                connection_url=DEFAULT_PROMPT_CACHE_URL if setting == "1" else setting,
+                ttl_seconds=DEFAULT_PROMPT_CACHE_TTL_SECONDS,
+            )
+        except Exception as e:
+            logger.error(f"Default prompt cache unavailable, LLM responses won't be cached: {e}")
+            return None
+    return _default_prompt_cache
+
+
+def _create_gemini_llm():
     try:
         from langchain_google_genai import ChatGoogleGenerativeAI
     except ImportError:
@@ -19,7 +90,9 @@ def get_default_llm():
             "Alternatively, pass a custom LLM (any instance of `BaseChatModel` from `langchain_core` is supported)."
         )
 
+    # The gateway's scheduler retries rate-limited calls, retrying in the client too would multiply the attempts.
     return ChatGoogleGenerativeAI(
         model="gemini-2.0-flash",
         api_key=gemini_api_key,
+        max_retries=0,
     )
@@ -0,0 +1,198 @@
+import hashlib
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from langchain_core.callbacks import CallbackManager
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agenticrag.stores.prompt_cache import PromptCache
+from agenticrag.utils.helpers import run_in_executor
+from agenticrag.utils.logging_config import setup_logger
+from agenticrag.utils.scheduler import LLMScheduler
+
+logger = setup_logger(__name__)
+
+
+class LLMGateway(BaseChatModel):
+    """
+    A chat model wrapper every component can share, so cross-cutting concerns live in one place.
+    With a `PromptCache`, responses are cached on exact match of model, call parameters and normalized messages,
+    cache hits return without calling the wrapped model and report no token usage. Calls sampling with a
+    temperature above 0 are never cached.
+    With an `LLMScheduler`, calls that reach the model are queued by priority, rate limited and retried on 429 errors.
+    """
+    llm: BaseChatModel
+    prompt_cache: Optional[PromptCache] = None
+    scheduler: Optional[LLMScheduler] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway:{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"llm_type": self.llm._llm_type, **self.llm._identifying_params}
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Prompt cache and scheduler metrics, empty if neither is configured."""
+        metrics = dict(self.prompt_cache.metrics) if self.prompt_cache else {}
+        if self.scheduler:
+            metrics.update(self.scheduler.metrics)
+        return metrics
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._cache_key(messages, stop, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        result = self._call(self._generate_inner, messages, stop, run_manager, **kwargs)
+        self._store(key, result.generations[0].message)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        key = self._cache_key(messages, stop, kwargs)
+        cached = await run_in_executor(self._lookup, key)
+        if cached is not None:
+            return cached
+        result = await self._acall(self._agenerate_inner, messages, stop, run_manager, **kwargs)
+        await run_in_executor(self._store, key, result.generations[0].message)
+        return result
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        key = self._cache_key(messages, stop, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield self._as_chunk(cached.generations[0].message)
+            return
+        if type(self.llm)._stream == BaseChatModel._stream:
+            result = self._call(self._generate_inner, messages, stop, run_manager, **kwargs)
+            self._store(key, result.generations[0].message)
+            yield self._as_chunk(result.generations[0].message)
+            return
+
+        merged = None
+        for chunk in self._iter(self._stream_inner, messages, stop, run_manager, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+            yield chunk
+        if merged is not None:
+            self._store(key, merged.message)
+
+    async def _astream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._cache_key(messages, stop, kwargs)
+        cached = await run_in_executor(self._lookup, key)
+        if cached is not None:
+            yield self._as_chunk(cached.generations[0].message)
+            return
+        if type(self.llm)._astream == BaseChatModel._astream and type(self.llm)._stream == BaseChatModel._stream:
+            result = await self._acall(self._agenerate_inner, messages, stop, run_manager, **kwargs)
+            await run_in_executor(self._store, key, result.generations[0].message)
+            yield self._as_chunk(result.generations[0].message)
+            return
+
+        merged = None
+        async for chunk in self._aiter(self._astream_inner, messages, stop, run_manager, **kwargs):
+            merged = chunk if merged is None else merged + chunk
+            yield chunk
+        if merged is not None:
+            await run_in_executor(self._store, key, merged.message)
+
+    # The wrapped model is called through its public API, so its own rate limiter, cache and callbacks still apply.
+    def _generate_inner(self, messages, stop, run_manager, **kwargs) -> ChatResult:
+        result = self.llm.generate([messages], stop=stop, callbacks=_child(run_manager), **kwargs)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
+
+    async def _agenerate_inner(self, messages, stop, run_manager, **kwargs) -> ChatResult:
+        result = await self.llm.agenerate([messages], stop=stop, callbacks=_child(run_manager), **kwargs)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
+
+    def _stream_inner(self, messages, stop, run_manager, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for chunk in self.llm.stream(messages, stop=stop, config={"callbacks": _child(run_manager)}, **kwargs):
+            yield ChatGenerationChunk(message=chunk) if isinstance(chunk, AIMessageChunk) else self._as_chunk(chunk)
+
+    async def _astream_inner(self, messages, stop, run_manager, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in self.llm.astream(messages, stop=stop, config={"callbacks": _child(run_manager)}, **kwargs):
+            yield ChatGenerationChunk(message=chunk) if isinstance(chunk, AIMessageChunk) else self._as_chunk(chunk)
+
+    def _call(self, func, *args, **kwargs):
+        return self.scheduler.call(func, *args, **kwargs) if self.scheduler else func(*args, **kwargs)
+
+    async def _acall(self, func, *args, **kwargs):
+        return await (self.scheduler.acall(func, *args, **kwargs) if self.scheduler else func(*args, **kwargs))
+
+    def _iter(self, func, *args, **kwargs):
+        return self.scheduler.stream(func, *args, **kwargs) if self.scheduler else func(*args, **kwargs)
+
+    def _aiter(self, func, *args, **kwargs):
+        return self.scheduler.astream(func, *args, **kwargs) if self.scheduler else func(*args, **kwargs)
+
+    def _cache_key(self, messages: List[BaseMessage], stop, kwargs) -> Optional[str]:
+        if self.prompt_cache is None or self._samples(kwargs):
+            return None
+        payload = {
+            "model": type(self.llm).__name__,
+            "llm_type": self.llm._llm_type,
+            "params": self.llm._identifying_params,
+            "stop": stop,
+            "kwargs": kwargs,
+            "messages": [self._normalize(message) for message in messages],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _samples(self, kwargs) -> bool:
+        """Whether the call samples with a temperature above 0, its response isn't meant to be repeated."""
+        temperature = kwargs.get("temperature", getattr(self.llm, "temperature", None))
+        return temperature is not None and temperature > 0
+
+    @staticmethod
+    def _normalize(message: BaseMessage) -> Dict[str, Any]:
+        content = message.content
+        if isinstance(content, str):
+            content = "\n".join(line.rstrip() for line in content.replace("\r\n", "\n").strip().split("\n"))
+        return {
+            "type": message.type,
+            "name": message.name,
+            "content": content,
+            "tool_calls": getattr(message, "tool_calls", None) or None,
+        }
+
+    def _lookup(self, key: Optional[str]) -> Optional[ChatResult]:
+        if key is None:
+            return None
+        try:
+            payload = self.prompt_cache.lookup(key)
+        except Exception as e:
+            logger.error(f"Prompt cache unavailable, calling model: {e}")
+            return None
+        if payload is None:
+            return None
+        message = messages_from_dict([json.loads(payload)])[0]
+        logger.debug(f"Prompt cache hit for {self.llm._llm_type}")
+        return ChatResult(generations=[ChatGeneration(message=message, generation_info={"cached": True})])
+
+    def _store(self, key: Optional[str], message: BaseMessage) -> None:
+        if key is None:
+            return
+        if isinstance(message, AIMessageChunk):
+            message = AIMessage(content=message.content, additional_kwargs=message.additional_kwargs, response_metadata=message.response_metadata)
+        message = message.model_copy(update={"usage_metadata": None}) if isinstance(message, AIMessage) else message
+        try:
+            self.prompt_cache.put(key, self.llm._llm_type, json.dumps(message_to_dict(message), default=str))
+        except Exception as e:
+            logger.error(f"Failed to cache LLM response: {e}")
+
+    @staticmethod
+    def _as_chunk(message: BaseMessage) -> ChatGenerationChunk:
+        return ChatGenerationChunk(message=AIMessageChunk(content=message.content, additional_kwargs=message.additional_kwargs))
+
+
+def _child(run_manager) -> Optional[CallbackManager]:
+    """Callbacks for the wrapped model's run, nested under the gateway's like `ParentRunManager.get_child()`."""
+    if run_manager is None:
+        return None
+    manager = CallbackManager(handlers=[], parent_run_id=run_manager.run_id)
+    manager.set_handlers(run_manager.inheritable_handlers)
+    manager.add_tags(run_manager.inheritable_tags)
+    manager.add_metadata(run_manager.inheritable_metadata)
+    return manager
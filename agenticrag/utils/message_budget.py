@@ -0,0 +1,104 @@
+import re
+from typing import List, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class MessageBudget:
+    """
+    Keeps the controller conversation small as iterations pile up. Each tool output is capped when appended,
+    outputs older than the last `keep_recent` turns are replaced with short digests, and if `max_tokens` is set,
+    the oldest turns are digested and then dropped until the prompt fits. Tokens are approximated as 4 characters each.
+    """
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        max_tokens: int = None,
+        max_tool_output_tokens: int = 2000,
+        keep_recent: int = 2,
+        digest_tokens: int = 50,
+    ):
+        """
+        Args:
+            max_tokens (int, optional): Budget for the whole controller prompt, unlimited if not provided.
+            max_tool_output_tokens (int, optional): Maximum size of a single tool output, unlimited if None.
+            keep_recent (int): Number of latest tool outputs kept verbatim.
+            digest_tokens (int): Size of the digest replacing older tool outputs.
+        """
+        self.max_tokens = max_tokens
+        self.max_tool_output_tokens = max_tool_output_tokens
+        self.keep_recent = keep_recent
+        self.digest_tokens = digest_tokens
+
+    @classmethod
+    def count_tokens(cls, text: str) -> int:
+        """Approximate number of tokens in text."""
+        return (len(text) + cls.CHARS_PER_TOKEN - 1) // cls.CHARS_PER_TOKEN
+
+    def messages_tokens(self, messages: List[BaseMessage]) -> int:
+        return sum(self.count_tokens(str(m.content)) for m in messages)
+
+    def cap(self, output: str) -> Tuple[str, int]:
+        """Truncate a tool output to `max_tool_output_tokens`, returning it with the number of tokens saved."""
+        if self.max_tool_output_tokens is None:
+            return output, 0
+        limit = self.max_tool_output_tokens * self.CHARS_PER_TOKEN
+        if len(output) <= limit:
+            return output, 0
+        capped = output[:limit] + f"\n...[truncated {len(output) - limit} characters]" + self._files_note(output, limit)
+        saved = self.count_tokens(output) - self.count_tokens(capped)
+        return (capped, saved) if saved > 0 else (output, 0)
+
+    def digest(self, content: str) -> str:
+        """Short summary of a tool output keeping its start and any file paths it mentions."""
+        limit = self.digest_tokens * self.CHARS_PER_TOKEN
+        content = content.split("\nOriginal User query:")[0]
+        if len(content) <= limit:
+            return f"[Earlier output] {content}"
+        return f"[Earlier output, compacted] {content[:limit]}..." + self._files_note(content, limit)
+
+    def compact(self, messages: List[BaseMessage]) -> int:
+        """
+        Compact controller messages in place, returns number of tokens saved.
+        The system prompt and the first user message are never touched.
+        """
+        saved = 0
+        outputs = self._output_indices(messages)
+        for i in outputs[:-self.keep_recent] if self.keep_recent else outputs:
+            saved += self._digest_message(messages, i)
+
+        if self.max_tokens is None or self.messages_tokens(messages) <= self.max_tokens:
+            return saved
+
+        for i in self._output_indices(messages)[:-1]:
+            saved += self._digest_message(messages, i)
+            if self.messages_tokens(messages) <= self.max_tokens:
+                return saved
+
+        while self.messages_tokens(messages) > self.max_tokens and len(messages) > 4:
+            dropped = messages[2:4]
+            del messages[2:4]
+            saved += self.messages_tokens(dropped)
+        if self.messages_tokens(messages) > self.max_tokens:
+            logger.warning(f"Controller prompt still exceeds budget of {self.max_tokens} tokens after compaction")
+        return saved
+
+    def _files_note(self, content, limit):
+        """Paths in backticks cut off by truncation, so later tool calls can still reference them."""
+        paths = [p for p in re.findall(r"`([^`]+)`", content) if f"`{p}`" not in content[:limit]]
+        return " Files: " + ", ".join(f"`{p}`" for p in paths) if paths else ""
+
+    def _output_indices(self, messages):
+        return [i for i in range(2, len(messages)) if isinstance(messages[i], HumanMessage)]
+
+    def _digest_message(self, messages, i):
+        message = messages[i]
+        if message.additional_kwargs.get("compacted"):
+            return 0
+        digest = self.digest(str(message.content))
+        messages[i] = HumanMessage(name=message.name, content=digest, additional_kwargs={"compacted": True})
+        return max(self.count_tokens(str(message.content)) - self.count_tokens(digest), 0)
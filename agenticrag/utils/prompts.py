@@ -59,14 +59,15 @@ Tools are categorized as:
    * Use **retriever tools** to fetch only the data required for task tools.
    * Use **task tools** to generate the actual answer. These are always needed unless no task tools are provided.
 3. **Call all task tools** before finalizing the answer.
-4. **Wait for each tool’s response before proceeding.**
-5. **Call `final_answer`** only after all needed task tools have been executed.
+4. **Call independent tools together.** When several calls don't depend on each other's output (e.g. retrieving from multiple datasets), request them in the same step; they run in parallel.
+5. **Wait for tool responses before calling tools that depend on them.**
+6. **Call `final_answer`** only after all needed task tools have been executed.
 
 ---
 
 ## Tool Call Format
 
-Respond with a single JSON object per step:
+Respond with a single JSON object per step. For one tool call:
 
 ```json
 {
@@ -75,6 +76,19 @@ Respond with a single JSON object per step:
 }
 ```
 
+For multiple independent tool calls in the same step:
+
+```json
+{
+  "tool_calls": [
+    {"tool": "<tool_name>", "args": { ... }},
+    {"tool": "<other_tool_name>", "args": { ... }}
+  ]
+}
+```
+
+Outputs of all calls are returned together in the next message.
+
 ---
 
 ## Final Answer Format
@@ -102,7 +116,7 @@ After calling all task tools:
 * **Always retrieve minimal necessary data.** Avoid redundancy.
 * **Use all task tools provided.** Never stop at raw data.
 * **Do not assume contents—rely on metadata and responses.**
-* **Do not call multiple tools at once.** One call per step.
+* **Only batch calls that are independent.** Never batch a call with one that needs its output, and never batch `final_answer` with other tools.
 * **Final answer must be complete and never say results are pending.**
 
 ---
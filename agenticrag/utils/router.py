@@ -0,0 +1,127 @@
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import numpy as np
+
+from agenticrag.tasks.base import BaseTask
+from agenticrag.types.core import MetaData, Vector
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Router:
+    """
+    Resolves task and dataset selection locally when the answer is obvious, so the LLM is only asked when needed.
+    With a single candidate it is picked without a call. If an `embedding_function` is given, a nearest-neighbour
+    classifier over task/dataset descriptions and past LLM decisions routes queries whose confidence reaches
+    `confidence_threshold`, and every LLM decision is remembered as a new example.
+    """
+    def __init__(
+        self,
+        embedding_function: Callable[[str], Vector] = None,
+        confidence_threshold: float = 0.85,
+        k: int = 5,
+        resolve_single: bool = True,
+        max_examples: int = 1000,
+        max_descriptions: int = 1000,
+    ):
+        """
+        Args:
+            embedding_function (Callable, optional): Function mapping text to a vector, the classifier is disabled if not provided.
+            confidence_threshold (float): Minimum confidence, the winning label's summed similarity over `k` neighbours, to skip the LLM.
+            k (int): Number of nearest examples voting on a decision.
+            resolve_single (bool): Whether to pick the only available task or dataset without asking the LLM.
+            max_examples (int): Number of past decisions remembered per kind, oldest are forgotten first.
+            max_descriptions (int): Number of task/dataset description vectors cached, least recently used are dropped first.
+        """
+        self.embedding_function = embedding_function
+        self.confidence_threshold = confidence_threshold
+        self.k = k
+        self.resolve_single = resolve_single
+
+        self._lock = threading.Lock()
+        self._examples: Dict[str, deque] = {
+            "tasks": deque(maxlen=max_examples),
+            "datasets": deque(maxlen=max_examples),
+        }
+        self.max_descriptions = max_descriptions
+        self._description_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def route_tasks(self, query: str, tasks: Sequence[BaseTask]) -> Optional[List[BaseTask]]:
+        """Return tasks for the query if they can be decided locally, None if the LLM should decide."""
+        names = self._route("tasks", query, {task.name: task.description for task in tasks})
+        return None if names is None else [task for task in tasks if task.name in names]
+
+    def route_datasets(self, query: str, datasets: Sequence[MetaData]) -> Optional[List[MetaData]]:
+        """Return datasets for the query if they can be decided locally, None if the LLM should decide."""
+        names = self._route("datasets", query, {data.name: data.description for data in datasets})
+        return None if names is None else [data for data in datasets if data.name in names]
+
+    def record_tasks(self, query: str, tasks: Sequence[BaseTask]) -> None:
+        """Remember task selection made by the LLM as a classifier example."""
+        self._record("tasks", query, [task.name for task in tasks])
+
+    def record_datasets(self, query: str, datasets: Sequence[MetaData]) -> None:
+        """Remember dataset selection made by the LLM as a classifier example."""
+        self._record("datasets", query, [data.name for data in datasets])
+
+    def _route(self, kind: str, query: str, candidates: Dict[str, str]) -> Optional[FrozenSet[str]]:
+        if self.resolve_single and len(candidates) == 1:
+            logger.debug(f"Routed {kind} locally, single candidate")
+            return frozenset(candidates)
+        if self.embedding_function is None or not candidates:
+            return None
+
+        label, confidence = self._classify(kind, query, candidates)
+        if label is None or confidence < self.confidence_threshold:
+            return None
+        logger.debug(f"Routed {kind} locally to {sorted(label)} with confidence {confidence:.2f}")
+        return label
+
+    def _classify(self, kind: str, query: str, candidates: Dict[str, str]) -> Tuple[Optional[FrozenSet[str]], float]:
+        examples = [(self._describe(name, description), frozenset([name])) for name, description in candidates.items()]
+        with self._lock:
+            examples += [example for example in self._examples[kind] if example[1] <= candidates.keys()]
+
+        vectors = np.stack([vector for vector, _ in examples])
+        scores = vectors @ self._embed(query)
+        k = min(self.k, len(examples))
+        top = np.argpartition(-scores, k - 1)[:k]
+
+        votes: Dict[FrozenSet[str], float] = {}
+        for i in top:
+            label = examples[i][1]
+            votes[label] = votes.get(label, 0.0) + max(float(scores[i]), 0.0)
+        label = max(votes, key=votes.get)
+        return label, votes[label] / k
+
+    def _record(self, kind: str, query: str, names: List[str]) -> None:
+        if self.embedding_function is None or not names:
+            return
+        vector = self._embed(query)
+        with self._lock:
+            self._examples[kind].append((vector, frozenset(names)))
+
+    def _describe(self, name: str, description: str) -> np.ndarray:
+        text = f"{name}: {description}"
+        key = hashlib.sha256(text.encode()).hexdigest()
+        with self._lock:
+            vector = self._description_vectors.get(key)
+            if vector is not None:
+                self._description_vectors.move_to_end(key)
+                return vector
+        # Embedded outside the lock, concurrent misses on the same description only embed it twice.
+        vector = self._embed(text)
+        with self._lock:
+            self._description_vectors[key] = vector
+            self._description_vectors.move_to_end(key)
+            while len(self._description_vectors) > self.max_descriptions:
+                self._description_vectors.popitem(last=False)
+        return vector
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedding_function(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,297 @@
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Queue an LLM call waits in, lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar("agenticrag_llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """Run LLM calls made within the block, including ones in tool threads, at the given priority."""
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        try:
+            _current_priority.reset(token)
+        except ValueError:
+            # An abandoned stream may be closed by garbage collection from another context.
+            pass
+
+
+class LLMScheduler:
+    """
+    Shares a provider quota between everything calling the model. Calls wait in per-priority queues,
+    interactive ones before background ones such as ingestion, at most `max_concurrency` run at once, and if
+    `requests_per_minute` is set a token bucket spaces them out. Calls failing with a rate-limit (429) error
+    are retried with jittered exponential backoff, giving the slot back while they wait.
+    """
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        requests_per_minute: float = None,
+        burst: int = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        """
+        Args:
+            max_concurrency (int): Maximum number of calls in flight at once.
+            requests_per_minute (float, optional): Sustained request rate, unlimited if not provided.
+            burst (int, optional): Number of requests that may start back to back, defaults to `max_concurrency`.
+            max_retries (int): Number of retries of a call failing with a rate-limit error.
+            base_delay (float): Backoff before the first retry in seconds, doubled on every further retry.
+            max_delay (float): Upper bound of the backoff in seconds.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._waiting: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._timer: Optional[threading.Timer] = None
+        self._capacity = float(burst or max_concurrency)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0}
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """Calls started, retries and rate-limit errors seen, with calls currently running and queued."""
+        with self._lock:
+            return {**self._stats, "active": self._active, "queued": len(self._waiting)}
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one concurrency slot for the block, waiting for it at the current priority."""
+        event = threading.Event()
+        waiter = self._enqueue(event.set)
+        try:
+            event.wait()
+        except BaseException:
+            self._cancel(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        """Async version of `slot()`, waiting without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = self._enqueue(lambda: loop.call_soon_threadsafe(_resolve, future))
+        try:
+            await future
+        except BaseException:
+            self._cancel(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func in a slot, retrying it on rate-limit errors."""
+        for attempt in itertools.count():
+            with self.slot():
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+            time.sleep(self._backoff(attempt))
+
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Async version of `call()` for coroutine functions."""
+        for attempt in itertools.count():
+            async with self.aslot():
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    if not self._should_retry(e, attempt):
+                        raise
+            await asyncio.sleep(self._backoff(attempt))
+
+    def stream(self, func: Callable[..., Iterator[Any]], *args, **kwargs) -> Iterator[Any]:
+        """Iterate func in a slot held until the stream ends, retrying only if it fails before the first item."""
+        for attempt in itertools.count():
+            with self.slot():
+                started = False
+                try:
+                    for item in func(*args, **kwargs):
+                        started = True
+                        yield item
+                    return
+                except Exception as e:
+                    if started or not self._should_retry(e, attempt):
+                        raise
+            time.sleep(self._backoff(attempt))
+
+    async def astream(self, func: Callable[..., AsyncIterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+        """Async version of `stream()`."""
+        for attempt in itertools.count():
+            async with self.aslot():
+                started = False
+                try:
+                    async for item in func(*args, **kwargs):
+                        started = True
+                        yield item
+                    return
+                except Exception as e:
+                    if started or not self._should_retry(e, attempt):
+                        raise
+            await asyncio.sleep(self._backoff(attempt))
+
+    def _enqueue(self, grant: Callable[[], None]) -> "_Waiter":
+        waiter = _Waiter(int(_current_priority.get()), next(self._seq), grant)
+        with self._lock:
+            heapq.heappush(self._waiting, waiter)
+            self._dispatch()
+        return waiter
+
+    def _cancel(self, waiter: "_Waiter") -> None:
+        with self._lock:
+            if waiter.granted:
+                self._active -= 1
+            else:
+                self._waiting.remove(waiter)
+                heapq.heapify(self._waiting)
+            self._dispatch()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to queued calls in priority order, must be called holding the lock."""
+        while self._waiting and self._active < self.max_concurrency:
+            wait = self._take_token()
+            if wait > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            waiter = heapq.heappop(self._waiting)
+            waiter.granted = True
+            self._active += 1
+            self._stats["calls"] += 1
+            waiter.grant()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+    def _take_token(self) -> float:
+        """Take a token from the bucket, returns 0 on success or seconds until one is available."""
+        if not self.requests_per_minute:
+            return 0.0
+        rate = self.requests_per_minute / 60.0
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / rate
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if not is_rate_limit_error(error):
+            return False
+        with self._lock:
+            self._stats["rate_limited"] += 1
+            if attempt >= self.max_retries:
+                return False
+            self._stats["retries"] += 1
+        logger.warning(f"LLM call rate limited, retry {attempt + 1}/{self.max_retries}: {error}")
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class _Waiter:
+    __slots__ = ("level", "seq", "grant", "granted")
+
+    def __init__(self, level: int, seq: int, grant: Callable[[], None]):
+        self.level = level
+        self.seq = seq
+        self.grant = grant
+        self.granted = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.level, self.seq) < (other.level, other.seq)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Exception types providers raise for rate limited requests, matched by name so no provider SDK has to be imported.
+_RATE_LIMIT_TYPES = {"RateLimitError", "RateLimitExceeded", "TooManyRequests", "ResourceExhausted"}
+# Wrappers that re-raise provider errors with only their message, the one case where the message is inspected.
+_WRAPPER_TYPES = {"ChatGoogleGenerativeAIError", "GoogleGenerativeAIError", "RetryError"}
+_RATE_LIMIT_MESSAGE = re.compile(r"\b429\b|rate.?limit|too many requests|resource.?exhausted|resource has been exhausted", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an error raised by a model provider means the request was rate limited. The HTTP or gRPC status
+    and the exception type are checked first, on the error and the errors it was raised from. Messages are only
+    matched for known wrappers that drop both.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = _status_of(error)
+        if status is not None:
+            return status == 429 or status == "RESOURCE_EXHAUSTED"
+        names = {cls.__name__ for cls in type(error).__mro__}
+        if names & _RATE_LIMIT_TYPES:
+            return True
+        if names & _WRAPPER_TYPES and _RATE_LIMIT_MESSAGE.search(str(error)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _status_of(error: BaseException):
+    """HTTP status code, or gRPC status name, an error carries, if any."""
+    for status in (getattr(error, "status_code", None), getattr(getattr(error, "response", None), "status_code", None), getattr(error, "code", None)):
+        if isinstance(status, int) and not isinstance(status, bool):
+            return status
+        name = getattr(status, "name", None)
+        if isinstance(name, str):
+            return name
+    return None
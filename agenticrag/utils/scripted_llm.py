@@ -0,0 +1,96 @@
+import asyncio
+import json
+import re
+import time
+from typing import List
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+RETRIEVER_DATA_ARGS = {
+    "vector_search_retriever": "document_name",
+    "table_data_retriever": "data_name",
+    "sql_database_retriever": "db_name",
+}
+
+
+def _json_block(obj) -> str:
+    return f"```json\n{json.dumps(obj)}\n```"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for a chat model. It recognises agenticrag prompts by their system message and
+    answers them the way a well-behaved model would: pick question answering and the first dataset, call the
+    available retriever, answer from the retrieved reference, then give the final answer.
+    `controller_script` replaces that controller policy with fixed turns replayed in order, the last one repeating,
+    where `<last_output>` stands for the last reference in the latest tool output.
+    `latency_ms` simulates network and generation time per call. The benchmarks and test suite run agents on it,
+    and it can exercise an agent pipeline offline without an API key.
+    """
+    latency_ms: float = 0.0
+    chunk_size: int = 16
+    controller_script: List[dict] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        system = messages[0].content if messages else ""
+        last = messages[-1].content if messages else ""
+        if "select the list of required tasks" in system:
+            names = re.findall(r"'name': '([^']+)'", last)
+            return _json_block({"tasks": ["question_answering"] if "question_answering" in names else names[:1]})
+        if "list of various data source" in system:
+            return _json_block({"data_sources": re.findall(r"'name': '([^']+)'", last)[:1]})
+        if "controller agent" in system:
+            return self._controller_reply(messages)
+        if "decide required database tables" in system:
+            tables = re.search(r"Tables: \[(.*)\]", last)
+            return _json_block({"tables": [t.strip() for t in tables.group(1).split(",") if t.strip()] if tables else []})
+        if "extracting the relevant table from a file" in system:
+            paths = dict(re.findall(r"(File Path|Output Path): (.+)", last))
+            return f"```python\nimport pandas as pd\npd.read_csv({paths['File Path']!r}).head(20).to_csv({paths['Output Path']!r}, index=False)\n```"
+        if "writing SQL queries" in system:
+            table = re.search(r'"table_name": "([^"]+)"', last)
+            sql = f"SELECT * FROM {table.group(1)} LIMIT 20" if table else None
+            return _json_block({"sql": sql, "explanation": "Select a sample of rows."})
+        return f"Answer based on {len(last)} characters of context."
+
+    def _controller_reply(self, messages: List[BaseMessage]) -> str:
+        system = messages[0].content
+        step = sum(isinstance(m, AIMessage) for m in messages)
+        if self.controller_script:
+            reply = _json_block(self.controller_script[min(step, len(self.controller_script) - 1)])
+            refs = re.findall(r"`([^`]+)`", messages[-1].content)
+            return reply.replace("<last_output>", refs[-1] if refs else "")
+        retrievers = re.findall(r"\*\*(\w+)\*\*: Type: `retriever tool`", system)
+        datasets = re.findall(r"- Name: (.+)", system)
+        if step == 0 and retrievers and datasets:
+            retriever = retrievers[0]
+            args = {"query": "benchmark query", RETRIEVER_DATA_ARGS.get(retriever, "document_name"): datasets[0].strip()}
+            return _json_block({"tool": retriever, "args": args})
+        if step == 1:
+            refs = re.findall(r"`([^`]+)`", messages[-1].content)
+            if refs:
+                return _json_block({"tool": "question_answering", "args": {"query": "benchmark query", "file_path": refs[-1]}})
+        output = messages[-1].content.split("\nOriginal User query:")[0].replace("Tool Output: ", "")
+        return _json_block({"tool": "final_answer", "args": {"answer": output[:200]}})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        reply = self._reply(messages)
+        for i in range(0, len(reply), self.chunk_size):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=reply[i:i + self.chunk_size]))
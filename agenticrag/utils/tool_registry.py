@@ -0,0 +1,53 @@
+from typing import Dict, Iterable, List, Tuple
+from langchain.tools import StructuredTool
+
+from agenticrag.retrievers.base import BaseRetriever
+from agenticrag.tasks.base import BaseTask
+from agenticrag.utils.generate_args_schema import generate_args_schema_from_method
+from agenticrag.utils.helpers import format_tool_metadata
+
+
+class ToolRegistry:
+    """
+    Compiles retrievers and tasks into controller tools once, and caches their argument schemas,
+    rendered metadata and the task list used in task selection prompt.
+    """
+    def __init__(self, retrievers: List[BaseRetriever], tasks: List[BaseTask]):
+        self.tools: Dict[str, StructuredTool] = {}
+        self._metadata: Dict[str, str] = {}
+        self._metadata_cache: Dict[Tuple[str, ...], str] = {}
+
+        for retriever in retrievers:
+            self._register(
+                func=retriever.retrieve,
+                name=retriever.name,
+                description=f"Type: `retriever tool`\n{retriever.description}"
+            )
+        for task in tasks:
+            self._register(
+                func=task.execute,
+                name=task.name,
+                description=f"Type: `agent tool`\n{task.description}"
+            )
+        self.task_list = [{"name": task.name, "description": task.description} for task in tasks]
+
+    def _register(self, func, name: str, description: str):
+        tool = StructuredTool.from_function(
+            func=func,
+            name=name,
+            description=description,
+            args_schema=generate_args_schema_from_method(func)
+        )
+        self.tools[name] = tool
+        self._metadata[name] = format_tool_metadata({name: tool})
+
+    def get_tools(self, names: Iterable[str]) -> Dict[str, StructuredTool]:
+        """Return compiled tools for given names, preserving the given order."""
+        return {name: self.tools[name] for name in names if name in self.tools}
+
+    def tool_metadata(self, names: Iterable[str]) -> str:
+        """Return rendered metadata of given tools, as used in controller prompt."""
+        key = tuple(name for name in names if name in self._metadata)
+        if key not in self._metadata_cache:
+            self._metadata_cache[key] = "\n\n".join(self._metadata[name] for name in key)
+        return self._metadata_cache[key]
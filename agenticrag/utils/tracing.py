@@ -0,0 +1,259 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from agenticrag.types.core import Span, Trace
+from agenticrag.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("agenticrag_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("agenticrag_span", default=None)
+_llm_callback: ContextVar[Optional["TracingCallbackHandler"]] = ContextVar("agenticrag_llm_callback", default=None)
+
+# Every LangChain model call made while a trace is active, including ones inside tasks and retrievers, reports to it.
+register_configure_hook(_llm_callback, inheritable=True)
+
+
+class BaseTraceExporter(ABC):
+    """Receives every finished trace."""
+    @abstractmethod
+    def export(self, trace: Trace) -> None:
+        pass
+
+
+class JSONFileExporter(BaseTraceExporter):
+    """Appends each trace to a file as one line of OTLP-compatible JSON."""
+    def __init__(self, path: str = ".agenticrag_data/traces.jsonl", service_name: str = "agenticrag"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(to_otlp(trace, self.service_name))
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+class Tracer:
+    """
+    Records spans of agent invocations and hands finished traces to exporters.
+    Spans are opened with `span()` or `@traced` anywhere in the call stack and attach to the active trace.
+    """
+    def __init__(self, exporters: List[BaseTraceExporter] = None):
+        """
+        Args:
+            exporters (List[BaseTraceExporter], optional): Exporters receiving each finished trace.
+        """
+        self.exporters = exporters or []
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes) -> Iterator[Trace]:
+        """Start a new trace with a root span, exporting it when the block exits."""
+        trace = Trace(trace_id=uuid.uuid4().hex)
+        trace_token = _current_trace.set(trace)
+        callback_token = _llm_callback.set(TracingCallbackHandler())
+        try:
+            with span(name, **attributes):
+                yield trace
+        finally:
+            try:
+                _llm_callback.reset(callback_token)
+                _current_trace.reset(trace_token)
+            except ValueError:
+                # An abandoned stream may be closed by garbage collection from another context.
+                pass
+            for exporter in self.exporters:
+                try:
+                    exporter.export(trace)
+                except Exception as e:
+                    logger.error(f"Trace exporter {type(exporter).__name__} failed: {e}")
+
+
+def _start_span(name: str, attributes: Dict[str, Any], parent: Optional[Span]) -> Span:
+    return Span(
+        name=name,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        start_time_ns=time.time_ns(),
+        attributes=dict(attributes),
+    )
+
+
+def _end_span(trace: Trace, span: Span, error: BaseException = None) -> None:
+    span.end_time_ns = time.time_ns()
+    if error is not None:
+        span.status = "error"
+        span.error = str(error)
+    trace.spans.append(span)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Record a span nested under the current one, does nothing outside a trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = _start_span(name, attributes, _current_span.get())
+    token = _current_span.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            pass
+        _end_span(trace, current, error)
+
+
+def traced(name: str):
+    """
+    Decorator recording each call as a span. `{cls}` in name is replaced with the class of the instance
+    a method is called on, e.g. `@traced("{cls}.add")` gives `MetaStore.add`.
+    """
+    def span_name(args):
+        return name.format(cls=type(args[0]).__name__) if "{cls}" in name and args else name
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name(args)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name(args)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Records a span per chat model call with latency and token usage reported by the model."""
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, tuple] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, **kwargs) -> None:
+        self._start(serialized, run_id, kwargs)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs) -> None:
+        self._start(serialized, run_id, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        run = self._pop(run_id)
+        if run is None:
+            return
+        trace, llm_span = run
+        llm_span.attributes.update(_token_usage(response))
+        _end_span(trace, llm_span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        run = self._pop(run_id)
+        if run is not None:
+            _end_span(run[0], run[1], error)
+
+    def _start(self, serialized, run_id, kwargs):
+        trace = _current_trace.get()
+        if trace is None:
+            return
+        with self._lock:
+            # A model called by a wrapper such as LLMGateway is already covered by the wrapper's span.
+            if kwargs.get("parent_run_id") in self._runs:
+                return
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or (serialized or {}).get("name") or params.get("_type")
+        llm_span = _start_span("llm", {"model": model} if model else {}, _current_span.get())
+        with self._lock:
+            self._runs[run_id] = (trace, llm_span)
+
+    def _pop(self, run_id):
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+
+def _token_usage(response: LLMResult) -> Dict[str, int]:
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+        }
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return {
+                    "prompt_tokens": metadata.get("input_tokens", 0),
+                    "completion_tokens": metadata.get("output_tokens", 0),
+                }
+    return {}
+
+
+def to_otlp(trace: Trace, service_name: str = "agenticrag") -> Dict[str, Any]:
+    """Render a trace in OTLP/JSON format, as accepted by OpenTelemetry collectors."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "agenticrag"},
+                "spans": [_otlp_span(trace.trace_id, span) for span in trace.spans],
+            }],
+        }]
+    }
+
+
+def _otlp_span(trace_id: str, span: Span) -> Dict[str, Any]:
+    otlp = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+        "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items() if v is not None],
+        "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
@@ -0,0 +1,6 @@
+"""
+Offline benchmarks for agenticrag. Everything runs against a scripted chat model, synthetic data and a
+hashing embedder, so no API key, network access or model download is needed.
+
+Run `python -m benchmarks --size small --output results.json` from the repository root.
+"""
@@ -0,0 +1,43 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.scenarios import SCENARIOS, SIZES, run_scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run offline agenticrag benchmarks.")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Size of synthetic data and iteration counts.")
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="Scenarios to run, all by default.")
+    parser.add_argument("--output", help="File to write JSON results to, printed to stdout if not given.")
+    parser.add_argument("--workdir", help="Directory keeping synthetic data and stores of each run in a new subdirectory, a temporary one by default.")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(SCENARIOS)
+    with tempfile.TemporaryDirectory(prefix="agenticrag-bench-") as tmp:
+        if args.workdir:
+            os.makedirs(args.workdir, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="run-", dir=args.workdir) if args.workdir else tmp
+        results = run_scenarios(names, args.size, workdir)
+
+    report = {
+        "size": args.size,
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [result.to_dict() for result in results],
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
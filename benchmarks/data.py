@@ -0,0 +1,91 @@
+import hashlib
+import os
+import random
+import re
+import sqlite3
+from typing import List
+import numpy as np
+import pandas as pd
+
+WORDS = (
+    "revenue region product customer order invoice shipment warehouse forecast quarter margin growth "
+    "apple banana cherry mango orange harvest climate rainfall soil yield export market price demand "
+    "engine model vector index query latency throughput memory cache cluster replica shard batch"
+).split()
+REGIONS = ["north", "south", "east", "west", "central"]
+PRODUCTS = ["widget", "gadget", "gizmo", "doohickey", "sprocket", "flange"]
+
+
+def hashing_embedding(text: str, dim: int = 256) -> List[float]:
+    """Stable bag-of-words embedding using hashed token buckets, a cheap stand-in for a sentence model."""
+    vector = np.zeros(dim, dtype=np.float32)
+    for token in re.findall(r"\w+", text.lower()):
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).tolist()
+
+
+def make_sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_corpus(n_docs: int, sentences: int = 5, seed: int = 0) -> List[str]:
+    """Return `n_docs` synthetic text chunks."""
+    rng = random.Random(seed)
+    return [" ".join(make_sentence(rng) for _ in range(sentences)) for _ in range(n_docs)]
+
+
+def make_markdown(n_sections: int, paragraphs: int = 3, seed: int = 0) -> str:
+    """Return a synthetic markdown document with headings, paragraphs and small tables."""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(n_sections):
+        parts.append(f"{'#' * (1 + i % 3)} Section {i}: {rng.choice(WORDS).title()}")
+        for _ in range(paragraphs):
+            parts.append(" ".join(make_sentence(rng) for _ in range(4)))
+        if i % 4 == 0:
+            parts.append("| region | product | units |\n| --- | --- | --- |")
+            parts.extend(f"| {rng.choice(REGIONS)} | {rng.choice(PRODUCTS)} | {rng.randint(1, 500)} |" for _ in range(5))
+    return "\n\n".join(parts)
+
+
+def make_embeddings(n: int, dim: int = 384, rank: int = 48, seed: int = 0) -> np.ndarray:
+    """
+    Normalized vectors with low intrinsic dimension like sentence embeddings: points of a shared random
+    `rank`-dimensional subspace plus noise. Calls with different seeds sample the same space, e.g. corpus and queries.
+    """
+    basis = np.random.default_rng(1234).normal(size=(rank, dim)).astype(np.float32)
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, rank)).astype(np.float32) @ basis + rng.normal(scale=0.5, size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_sales_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "region": rng.choice(REGIONS, rows),
+        "product": rng.choice(PRODUCTS, rows),
+        "units": rng.integers(1, 500, rows),
+        "price": rng.uniform(1, 100, rows).round(2),
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+    })
+
+
+def make_csv(path: str, rows: int, seed: int = 0) -> str:
+    """Write a synthetic sales table as CSV and return its path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    make_sales_frame(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def make_sqlite(path: str, rows: int, seed: int = 0) -> str:
+    """Write a synthetic sales table into a SQLite database and return its connection url."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df = make_sales_frame(rows, seed)
+    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    with sqlite3.connect(path) as connection:
+        df.to_sql("sales", connection, index=False, if_exists="replace")
+    return f"sqlite:///{path}"
@@ -0,0 +1,83 @@
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    latency_ms: Dict[str, float]
+    throughput_per_s: float
+    peak_traced_mb: float
+    max_rss_mb: Optional[float]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of the process so far, None where the platform doesn't report it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_benchmark(
+    name: str,
+    fn: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 1,
+    ops_per_call: int = 1,
+    self_timed: bool = False,
+    **params,
+) -> BenchmarkResult:
+    """
+    Time `iterations` calls of `fn(i)` after `warmup` untimed calls.
+    Throughput counts `ops_per_call` operations per call, e.g. queries in a batch.
+    With `self_timed`, fn returns its own latency in ms, which is recorded instead of the wall time of the call,
+    for work measured elsewhere such as in a child process.
+    Peak memory is tracked with tracemalloc during the timed calls only.
+    """
+    for i in range(warmup):
+        fn(-1 - i)
+    gc.collect()
+
+    latencies = []
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        for i in range(iterations):
+            t0 = time.perf_counter()
+            sample = fn(i)
+            latencies.append(sample if self_timed else (time.perf_counter() - t0) * 1000)
+        elapsed = sum(latencies) / 1000 if self_timed else time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    values = np.array(latencies)
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        latency_ms={
+            "p50": float(np.percentile(values, 50)),
+            "p90": float(np.percentile(values, 90)),
+            "p99": float(np.percentile(values, 99)),
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        },
+        throughput_per_s=iterations * ops_per_call / elapsed if elapsed else float("inf"),
+        peak_traced_mb=peak / (1024 * 1024),
+        max_rss_mb=max_rss_mb(),
+        params=params,
+    )
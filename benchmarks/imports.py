@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+# Regression budget for `import agenticrag` in a fresh interpreter, well above the few milliseconds it takes.
+IMPORT_BUDGET_MS = 250.0
+
+# Dependencies that must only be imported when a component needing them is first used.
+HEAVY_MODULES = ["langchain_core", "langchain", "sqlalchemy", "pandas", "numpy", "chromadb", "docling", "sentence_transformers", "bs4", "matplotlib"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module: str = "agenticrag") -> Tuple[float, List[str]]:
+    """Import module in a fresh interpreter, returning the import time in ms and the heavy modules it loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    loaded = set(result["modules"])
+    return result["ms"], [name for name in HEAVY_MODULES if name in loaded]
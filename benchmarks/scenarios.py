@@ -0,0 +1,342 @@
+import json
+import os
+from typing import Callable, Dict, List
+import numpy as np
+
+from agenticrag import RAGAgent
+from agenticrag.loaders.utils.extract_csv_structure import extract_csv_structure
+from agenticrag.loaders.utils.markdown_splitter import MarkdownSplitter
+from agenticrag.retrievers import SQLRetriever, VectorRetriever
+from agenticrag.retrievers.vector_retriever import reciprocal_rank_fusion
+from agenticrag.stores import ExternalDBStore, MetaStore, NumpyTextStore, TextStore
+from agenticrag.tasks import QuestionAnsweringTask
+from agenticrag.types.core import DataFormat, ExternalDBData, MetaData, TextData
+from agenticrag.utils.llm_gateway import LLMGateway
+from agenticrag.utils.local_sandbox_executor import LocalPythonExecutor
+from agenticrag.utils.scheduler import LLMScheduler
+from agenticrag.utils.scripted_llm import ScriptedChatModel
+
+from benchmarks.data import hashing_embedding, make_corpus, make_csv, make_embeddings, make_markdown, make_sqlite
+from benchmarks.harness import BenchmarkResult, run_benchmark
+from benchmarks.imports import IMPORT_BUDGET_MS, measure_import
+
+SIZES: Dict[str, Dict[str, int]] = {
+    "tiny": {"docs": 20, "rows": 200, "sections": 10, "iterations": 5, "meta_entries": 20, "vectors": 5_000},
+    "small": {"docs": 500, "rows": 10_000, "sections": 50, "iterations": 30, "meta_entries": 200, "vectors": 100_000},
+    "medium": {"docs": 5_000, "rows": 100_000, "sections": 200, "iterations": 100, "meta_entries": 2_000, "vectors": 1_000_000},
+}
+
+Scenario = Callable[[Dict[str, int], str], BenchmarkResult]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str):
+    def register(fn: Scenario) -> Scenario:
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def _text_store(workdir: str, name: str) -> TextStore:
+    return TextStore(persistent_dir=os.path.join(workdir, name), embedding_function=hashing_embedding)
+
+
+def _scripted_llm(latency_ms: float = 0.0) -> LLMGateway:
+    """A gateway of its own without a prompt cache, so runs never time cached responses whatever the environment."""
+    return LLMGateway(llm=ScriptedChatModel(latency_ms=latency_ms), scheduler=LLMScheduler())
+
+
+def _text_agent(size, workdir, latency_ms: float = 0.0) -> RAGAgent:
+    text_store = _text_store(workdir, "agent_chroma")
+    for i, text in enumerate(make_corpus(size["docs"])):
+        text_store.add(TextData(id=f"corpus_{i}", name="corpus", text=text))
+    meta_store = MetaStore(connection_url=f"sqlite:///{workdir}/agent_text.db")
+    meta_store.add(MetaData(name="corpus", description="Synthetic business and agriculture notes", format=DataFormat.TEXT))
+    llm = _scripted_llm(latency_ms)
+    return RAGAgent(
+        llm=llm,
+        persistent_dir=os.path.join(workdir, "agent_text"),
+        meta_store=meta_store,
+        tasks=[QuestionAnsweringTask(llm=llm)],
+        retrievers=[VectorRetriever(store=text_store, persistent_dir=os.path.join(workdir, "agent_text_retrieved"))],
+    )
+
+
+def _checked(response):
+    """Fail the run instead of timing a broken pipeline."""
+    responses = response if isinstance(response, list) else [response]
+    for r in responses:
+        if not r.success:
+            raise RuntimeError(f"Agent run failed: {r.content}")
+    return response
+
+
+@scenario("import_agenticrag")
+def bench_import_agenticrag(size, workdir):
+    heavy = measure_import("agenticrag")[1]
+    return run_benchmark(
+        "import_agenticrag",
+        lambda i: measure_import("agenticrag")[0],
+        min(size["iterations"], 10),
+        self_timed=True,
+        budget_ms=IMPORT_BUDGET_MS,
+        heavy_modules_loaded=heavy,
+    )
+
+
+@scenario("markdown_splitter")
+def bench_markdown_splitter(size, workdir):
+    document = make_markdown(size["sections"])
+    splitter = MarkdownSplitter(chunk_size=1000)
+    return run_benchmark("markdown_splitter", lambda i: splitter.split(document), size["iterations"], sections=size["sections"])
+
+
+@scenario("extract_csv_structure")
+def bench_extract_csv_structure(size, workdir):
+    path = make_csv(os.path.join(workdir, "structure.csv"), size["rows"])
+    return run_benchmark("extract_csv_structure", lambda i: extract_csv_structure(path), size["iterations"], rows=size["rows"])
+
+
+@scenario("chroma_add")
+def bench_chroma_add(size, workdir):
+    store = _text_store(workdir, "chroma_add")
+    corpus = make_corpus(size["docs"])
+
+    def add(i):
+        i = i % len(corpus)
+        store.add(TextData(id=f"doc_{i}_{add.calls}", name="corpus", text=corpus[i]))
+        add.calls += 1
+    add.calls = 0
+    return run_benchmark("chroma_add", add, size["docs"], docs=size["docs"])
+
+
+@scenario("chroma_add_many")
+def bench_chroma_add_many(size, workdir):
+    store = _text_store(workdir, "chroma_add_many")
+    corpus = make_corpus(size["docs"])
+    batches = max(1, size["iterations"] // 5)
+
+    def add_many(i):
+        store.add_many([TextData(id=f"doc_{j}_{i}", name="corpus", text=text) for j, text in enumerate(corpus)])
+    return run_benchmark("chroma_add_many", add_many, batches, ops_per_call=len(corpus), docs=size["docs"])
+
+
+@scenario("chroma_search_similar")
+def bench_chroma_search_similar(size, workdir):
+    store = _text_store(workdir, "chroma_search")
+    for i, text in enumerate(make_corpus(size["docs"])):
+        store.add(TextData(id=f"doc_{i}", name="corpus", text=text))
+    queries = make_corpus(size["iterations"] + 1, sentences=1, seed=1)
+    return run_benchmark(
+        "chroma_search_similar",
+        lambda i: store.search_similar(text_query=queries[i], top_k=5),
+        size["iterations"],
+        docs=size["docs"],
+    )
+
+
+@scenario("chroma_search_similar_many")
+def bench_chroma_search_similar_many(size, workdir, queries_per_call: int = 4, documents: int = 4):
+    """`search_similar_many` fanning out over several queries and documents, against one `search_similar` per pair."""
+    store = _text_store(workdir, "chroma_search_many")
+    store.add_many([TextData(id=f"doc_{i}", name=f"document_{i % 8}", text=text) for i, text in enumerate(make_corpus(size["docs"]))])
+    queries = make_corpus(queries_per_call, sentences=1, seed=1)
+    names = [f"document_{i}" for i in range(documents)]
+    sequential = run_benchmark(
+        "chroma_search_similar_pairs",
+        lambda i: [store.search_similar(text_query=q, document_name=n, top_k=5) for q in queries for n in names],
+        size["iterations"],
+    )
+    result = run_benchmark(
+        "chroma_search_similar_many",
+        lambda i: store.search_similar_many(queries, document_names=names, top_k=5),
+        size["iterations"],
+        docs=size["docs"],
+        queries=queries_per_call,
+        documents=documents,
+    )
+    result.params["sequential_p50_ms"] = sequential.latency_ms["p50"]
+    return result
+
+
+@scenario("chroma_iter_all")
+def bench_chroma_iter_all(size, workdir):
+    """Finding entries by name with `iter_all` over ids and names, against loading everything with `get_all`."""
+    store = _text_store(workdir, "chroma_iter_all")
+    store.add_many([TextData(id=f"doc_{i}", name=f"document_{i % 8}", text=text) for i, text in enumerate(make_corpus(size["docs"]))])
+    iterations = max(1, size["iterations"] // 10)
+    full = run_benchmark(
+        "chroma_get_all",
+        lambda i: [item.id for item in store.get_all() if item.name == "document_0"],
+        iterations,
+    )
+    result = run_benchmark(
+        "chroma_iter_all",
+        lambda i: [item["id"] for item in store.iter_all(fields=["id", "name"]) if item["name"] == "document_0"],
+        iterations,
+        docs=size["docs"],
+    )
+    result.params.update(get_all_p50_ms=full.latency_ms["p50"], get_all_peak_mb=full.peak_traced_mb)
+    return result
+
+
+@scenario("numpy_search_similar")
+def bench_numpy_search_similar(size, workdir):
+    store = NumpyTextStore(persistent_dir=os.path.join(workdir, "numpy_search"), embedding_function=hashing_embedding)
+    store.add_many([TextData(id=f"doc_{i}", name="corpus", text=text) for i, text in enumerate(make_corpus(size["docs"]))])
+    queries = make_corpus(size["iterations"] + 1, sentences=1, seed=1)
+    return run_benchmark(
+        "numpy_search_similar",
+        lambda i: store.search_similar(text_query=queries[i], top_k=5),
+        size["iterations"],
+        docs=size["docs"],
+    )
+
+
+def _bench_vector_search(name, quantization, size, workdir, top_k: int = 10):
+    """Latency of `NumpyTextStore.search_similar` over synthetic embeddings, with recall@k against exact search."""
+    vectors = make_embeddings(size["vectors"])
+    queries = make_embeddings(size["iterations"] + 1, seed=1)
+    lookup = {f"v{i}": vector for i, vector in enumerate(vectors)}
+    lookup.update({f"q{i}": vector for i, vector in enumerate(queries)})
+    store = NumpyTextStore(persistent_dir=os.path.join(workdir, name), embedding_function=lookup.__getitem__, quantization=quantization)
+    store.add_many([TextData(id=str(i), name="vectors", text=f"v{i}") for i in range(len(vectors))], batch_size=10_000)
+
+    found = []
+    result = run_benchmark(
+        name,
+        lambda i: found.append([int(r.id) for r in store.search_similar(f"q{i % len(queries)}", top_k=top_k)]),
+        size["iterations"],
+    )
+    exact = np.argsort(-(queries[:size["iterations"]] @ vectors.T), axis=1)[:, :top_k]
+    recall = np.mean([len(set(ids) & set(expected)) / top_k for ids, expected in zip(found[-size["iterations"]:], exact)])
+    result.params = {"vectors": len(vectors), "dim": vectors.shape[1], "recall_at_k": float(recall), "k": top_k, "index_mb": store.index_nbytes / 2**20}
+    return result
+
+
+@scenario("vector_search_float32")
+def bench_vector_search_float32(size, workdir):
+    return _bench_vector_search("vector_search_float32", None, size, workdir)
+
+
+@scenario("vector_search_int8")
+def bench_vector_search_int8(size, workdir):
+    return _bench_vector_search("vector_search_int8", "int8", size, workdir)
+
+
+@scenario("vector_search_binary")
+def bench_vector_search_binary(size, workdir):
+    return _bench_vector_search("vector_search_binary", "binary", size, workdir)
+
+
+@scenario("hybrid_search")
+def bench_hybrid_search(size, workdir, top_k: int = 5):
+    """
+    Dense plus BM25 retrieval fused by reciprocal rank, as `VectorRetriever` does, for questions naming an error code
+    that appears in a single chunk. Reports how often that chunk is in the top k with dense search alone and fused.
+    """
+    store = NumpyTextStore(persistent_dir=os.path.join(workdir, "hybrid_search"), embedding_function=hashing_embedding)
+    corpus = make_corpus(size["docs"])
+    store.add_many([TextData(id=str(i), name="corpus", text=f"{text} Logged as ERR-{i:05d}.") for i, text in enumerate(corpus)])
+    targets = list(range(0, size["docs"], max(1, size["docs"] // size["iterations"])))[:size["iterations"]]
+    queries = [f"What causes the ERR-{i:05d} warehouse shipment error?" for i in targets]
+
+    def hybrid(query):
+        dense = store.search_similar(query, top_k=top_k * 2)
+        keyword = store.search_keywords(query, top_k=top_k * 2)
+        return reciprocal_rank_fusion([dense, keyword])[:top_k]
+
+    result = run_benchmark("hybrid_search", lambda i: hybrid(queries[i % len(queries)]), len(queries), docs=size["docs"])
+    dense_hits = sum(str(i) in {r.id for r in store.search_similar(q, top_k=top_k)} for i, q in zip(targets, queries))
+    hybrid_hits = sum(str(i) in {r.id for r in hybrid(q)} for i, q in zip(targets, queries))
+    result.params.update(k=top_k, dense_hit_rate=dense_hits / len(queries), hybrid_hit_rate=hybrid_hits / len(queries))
+    return result
+
+
+@scenario("sql_backend_index")
+def bench_sql_backend_index(size, workdir):
+    store = MetaStore(connection_url=f"sqlite:///{workdir}/index.db")
+    for i in range(size["meta_entries"]):
+        store.add(MetaData(name=f"dataset_{i}", description=f"Synthetic dataset {i}", format=DataFormat.TEXT))
+    return run_benchmark(
+        "sql_backend_index",
+        lambda i: store.index(name=f"dataset_{i % size['meta_entries']}"),
+        size["iterations"],
+        entries=size["meta_entries"],
+    )
+
+
+@scenario("local_python_executor")
+def bench_local_python_executor(size, workdir):
+    path = make_csv(os.path.join(workdir, "executor.csv"), size["rows"])
+    code = (
+        "import pandas as pd\n"
+        f"df = pd.read_csv('{path}')\n"
+        "result = df.groupby('region')['units'].sum().sort_values(ascending=False)\n"
+        "print(result.head())\n"
+    )
+    return run_benchmark(
+        "local_python_executor",
+        lambda i: LocalPythonExecutor(additional_authorized_imports=["pandas"])(code),
+        size["iterations"],
+        rows=size["rows"],
+    )
+
+
+@scenario("rag_agent_text")
+def bench_rag_agent_text(size, workdir):
+    agent = _text_agent(size, workdir)
+    return run_benchmark(
+        "rag_agent_text",
+        lambda i: _checked(agent.invoke(f"What do the notes say about revenue? #{i}")),
+        size["iterations"],
+        docs=size["docs"],
+    )
+
+
+@scenario("rag_agent_text_batch")
+def bench_rag_agent_text_batch(size, workdir):
+    agent = _text_agent(size, workdir, latency_ms=5.0)
+    queries = [f"What do the notes say about growth? #{i}" for i in range(8)]
+    return run_benchmark(
+        "rag_agent_text_batch",
+        lambda i: _checked(agent.batch(queries, max_concurrency=8)),
+        max(size["iterations"] // 5, 1),
+        ops_per_call=len(queries),
+        docs=size["docs"],
+        simulated_llm_latency_ms=5.0,
+    )
+
+
+@scenario("rag_agent_sql")
+def bench_rag_agent_sql(size, workdir):
+    url = make_sqlite(os.path.join(workdir, "sales.sqlite"), size["rows"])
+    db_store = ExternalDBStore(connection_url=f"sqlite:///{workdir}/agent_sql_meta.db")
+    fields = ["id", "region", "product", "units", "price", "date"]
+    db_store.add(ExternalDBData(name="sales_db", connection_url=url, db_structure=json.dumps({"sales": fields})))
+    meta_store = MetaStore(connection_url=f"sqlite:///{workdir}/agent_sql_meta.db")
+    meta_store.add(MetaData(name="sales_db", description="Synthetic sales database", format=DataFormat.EXTERNAL_DB))
+    llm = _scripted_llm()
+    agent = RAGAgent(
+        llm=llm,
+        persistent_dir=os.path.join(workdir, "agent_sql"),
+        meta_store=meta_store,
+        tasks=[QuestionAnsweringTask(llm=llm)],
+        retrievers=[SQLRetriever(store=db_store, llm=llm, persistent_dir=os.path.join(workdir, "agent_sql_retrieved"))],
+    )
+    return run_benchmark(
+        "rag_agent_sql",
+        lambda i: _checked(agent.invoke(f"Show sales by region #{i}")),
+        size["iterations"],
+        rows=size["rows"],
+    )
+
+
+def run_scenarios(names: List[str], size_name: str, workdir: str) -> List[BenchmarkResult]:
+    size = SIZES[size_name]
+    results = []
+    for name in names:
+        scenario_dir = os.path.join(workdir, name)
+        os.makedirs(scenario_dir, exist_ok=True)
+        results.append(SCENARIOS[name](size, scenario_dir))
+    return results
@@ -0,0 +1,39 @@
+import os
+import pandas as pd
+import pytest
+
+from agenticrag.utils.artifacts import ArtifactStore, artifact_path, load_artifact, load_artifact_text, save_artifact
+
+
+def test_artifacts_stay_in_memory_within_scope(tmp_path):
+    df = pd.DataFrame({"fruit": ["apple", "banana"], "color": ["red", "yellow"]})
+    with ArtifactStore().scope():
+        text_ref = save_artifact("Apples are red.", str(tmp_path), "text_data.txt")
+        table_ref = save_artifact(df, str(tmp_path), "table_data.csv")
+        assert text_ref.startswith("artifact://") and table_ref.endswith(".csv")
+        assert os.listdir(tmp_path) == []
+        assert load_artifact(text_ref) == "Apples are red."
+        assert load_artifact(table_ref) is df
+        assert load_artifact_text(table_ref).splitlines()[0] == "fruit,color"
+
+        path = artifact_path(table_ref, str(tmp_path))
+        assert pd.read_csv(path).equals(df)
+        assert artifact_path(table_ref, str(tmp_path)) == path
+        temp_path = artifact_path(text_ref)
+        assert not temp_path.startswith(str(tmp_path)) and load_artifact(temp_path) == "Apples are red."
+
+    with pytest.raises(KeyError):
+        load_artifact(text_ref)
+    assert not os.path.exists(path) and not os.path.exists(os.path.dirname(temp_path))
+
+
+def test_large_artifacts_and_unscoped_saves_spill_to_disk(tmp_path):
+    with ArtifactStore(spill_threshold_bytes=4).scope():
+        ref = save_artifact("Apples are red.", str(tmp_path), "text_data.txt")
+        assert os.path.exists(ref)
+        assert load_artifact(ref) == "Apples are red."
+    assert not os.path.exists(ref)
+
+    ref = save_artifact("Bananas are yellow.", str(tmp_path), "text_data.txt")
+    assert load_artifact_text(ref) == "Bananas are yellow."
+    assert artifact_path(ref, str(tmp_path)) == ref
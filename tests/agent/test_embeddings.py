@@ -0,0 +1,52 @@
+import importlib.machinery
+import sys
+import threading
+import types
+import pytest
+
+from agenticrag.utils.embeddings import EmbeddingModelRegistry, SharedEmbeddingFunction
+
+
+@pytest.fixture
+def fake_sentence_transformers(monkeypatch):
+    """Stand-in for sentence_transformers that counts how often a model is constructed."""
+    module = types.ModuleType("sentence_transformers")
+    module.__spec__ = importlib.machinery.ModuleSpec("sentence_transformers", None)
+    module.loads = []
+
+    class SentenceTransformer:
+        def __init__(self, name):
+            module.loads.append(name)
+            self.name = name
+
+        def encode(self, text):
+            return [float(len(text)), 1.0]
+
+    module.SentenceTransformer = SentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    return module
+
+
+def test_model_loaded_once_on_first_encode(fake_sentence_transformers):
+    registry = EmbeddingModelRegistry()
+    first = SharedEmbeddingFunction(registry=registry)
+    second = SharedEmbeddingFunction(registry=registry)
+    assert fake_sentence_transformers.loads == []
+
+    threads = [threading.Thread(target=fn, args=("hello",)) for fn in [first, second] * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert first("abc") == [3.0, 1.0]
+    assert fake_sentence_transformers.loads == ["all-MiniLM-L6-v2"]
+
+
+def test_warmup_and_unload(fake_sentence_transformers):
+    registry = EmbeddingModelRegistry()
+    fn = SharedEmbeddingFunction("other-model", registry=registry)
+    fn.warmup()
+    assert registry.loaded() == ["other-model"]
+    registry.unload("other-model")
+    fn("x")
+    assert fake_sentence_transformers.loads == ["other-model", "other-model"]
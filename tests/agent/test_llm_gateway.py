@@ -0,0 +1,113 @@
+import asyncio
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+import pytest
+
+from agenticrag.stores import PromptCache
+from agenticrag.utils.llm_gateway import LLMGateway
+
+
+class CountingLLM(BaseChatModel):
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        message = AIMessage(content=f"reply to {messages[-1].content}", usage_metadata={"input_tokens": 5, "output_tokens": 3, "total_tokens": 8})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        for word in f"reply to {messages[-1].content}".split(" "):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+@pytest.fixture
+def gateway(tmp_path):
+    return LLMGateway(llm=CountingLLM(), prompt_cache=PromptCache(connection_url=f"sqlite:///{tmp_path}/prompts.db"))
+
+
+def test_identical_prompts_hit_cache(gateway):
+    messages = [SystemMessage("Describe"), HumanMessage("file.csv")]
+    first = gateway.invoke(messages)
+    second = gateway.invoke([SystemMessage("Describe  \r\n"), HumanMessage("file.csv")])
+    assert first.content == second.content == "reply to file.csv"
+    assert gateway.llm.calls == 1
+    assert second.usage_metadata is None
+    assert gateway.metrics["hits"] == 1 and gateway.metrics["misses"] == 1
+
+    gateway.invoke([HumanMessage("other.csv")])
+    gateway.invoke(messages, stop=["\n"])
+    assert gateway.llm.calls == 3
+
+
+def test_stream_and_async_share_cache(gateway):
+    streamed = "".join(chunk.content for chunk in gateway.stream([HumanMessage("q")]))
+    assert streamed == "reply to q "
+    assert gateway.invoke([HumanMessage("q")]).content == "reply to q "
+    assert asyncio.run(gateway.ainvoke([HumanMessage("q")])).content == "reply to q "
+    assert gateway.llm.calls == 1
+
+
+def test_sampled_calls_are_not_cached(gateway):
+    gateway.invoke("hi", temperature=0.7)
+    gateway.invoke("hi", temperature=0.7)
+    gateway.invoke("hi", temperature=0)
+    gateway.invoke("hi", temperature=0)
+    assert gateway.llm.calls == 3
+
+
+def test_gateway_without_cache_passes_through():
+    gateway = LLMGateway(llm=CountingLLM())
+    gateway.invoke("hi")
+    gateway.invoke("hi")
+    assert gateway.llm.calls == 2
+    assert gateway.metrics == {}
+
+
+def test_explicit_models_are_wrapped_with_opt_in_default_cache(monkeypatch, tmp_path):
+    from agenticrag.utils import llm as llm_module
+
+    monkeypatch.setattr(llm_module, "_default_prompt_cache", None)
+    monkeypatch.delenv(llm_module.PROMPT_CACHE_ENV, raising=False)
+    assert llm_module.get_gateway(CountingLLM()).prompt_cache is None
+
+    monkeypatch.setenv(llm_module.PROMPT_CACHE_ENV, f"sqlite:///{tmp_path}/default.db")
+    model = CountingLLM()
+    gateway = llm_module.get_gateway(model)
+    assert isinstance(gateway, LLMGateway) and gateway.llm is model
+    assert gateway.prompt_cache is not None and gateway.scheduler is llm_module._scheduler()
+    assert llm_module.get_gateway(gateway) is gateway
+    gateway.invoke("hi")
+    llm_module.get_gateway(model).invoke("hi")
+    assert model.calls == 1
+
+
+def test_wrapped_model_keeps_its_rate_limiter_and_callbacks():
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+
+    acquired = []
+
+    class Acquires(InMemoryRateLimiter):
+        def acquire(self, *, blocking=True):
+            acquired.append(blocking)
+            return True
+
+    class Recorder(BaseCallbackHandler):
+        def __init__(self):
+            self.starts = []
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+            self.starts.append(parent_run_id)
+
+    recorder = Recorder()
+    gateway = LLMGateway(llm=CountingLLM(rate_limiter=Acquires(), callbacks=[recorder]))
+    gateway.invoke("hi", config={"callbacks": [recorder]})
+    list(gateway.stream("hi"))
+    assert gateway.llm.calls == 2 and len(acquired) == 2
+    assert len(recorder.starts) == 3 and recorder.starts[1] is not None
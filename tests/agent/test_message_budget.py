@@ -0,0 +1,46 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from agenticrag.utils.message_budget import MessageBudget
+
+
+def _conversation(turns, output_size=2000):
+    messages = [SystemMessage(content="system"), HumanMessage(content="User: question")]
+    for i in range(turns):
+        messages.append(AIMessage(content=f'{{"tool": "t{i}"}}'))
+        messages.append(HumanMessage(name=f"t{i}", content=f"Saved at `out_{i}.txt` " + "x" * output_size + "\nOriginal User query: question"))
+    return messages
+
+
+def test_cap_truncates_long_output():
+    budget = MessageBudget(max_tool_output_tokens=10)
+    capped, saved = budget.cap("a" * 400)
+    assert capped.startswith("a" * 40) and "truncated 360 characters" in capped
+    assert saved > 0
+    assert budget.cap("short") == ("short", 0)
+
+
+def test_older_outputs_are_digested():
+    budget = MessageBudget(keep_recent=1, digest_tokens=10)
+    messages = _conversation(3)
+    saved = budget.compact(messages)
+    assert saved > 0
+    assert messages[3].additional_kwargs["compacted"]
+    assert "`out_0.txt`" in messages[3].content
+    assert "Original User query" not in messages[3].content
+    assert not messages[-1].additional_kwargs.get("compacted")
+    assert budget.compact(messages) == 0
+
+
+def test_max_tokens_drops_oldest_turns():
+    budget = MessageBudget(max_tokens=700, keep_recent=3)
+    messages = _conversation(3)
+    budget.compact(messages)
+    assert budget.messages_tokens(messages) <= 700
+    assert messages[0].content == "system" and messages[1].content == "User: question"
+    assert messages[-1].name == "t2"
+
+
+def test_cap_keeps_file_paths():
+    capped, _ = MessageBudget(max_tool_output_tokens=5).cap("Relevant text content saved at `data/out.txt`" + "x" * 200)
+    assert capped.endswith("Files: `data/out.txt`")
+    assert "x" * 200 not in capped
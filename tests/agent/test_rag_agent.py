@@ -0,0 +1,399 @@
+import asyncio
+import contextvars
+import json
+import os
+import pytest
+import numpy as np
+
+from agenticrag import RAGAgent
+from agenticrag.retrievers import TableRetriever, VectorRetriever
+from agenticrag.stores import AnswerCache, InMemorySessionStore, TableStore, TextStore, MetaStore
+from agenticrag.tasks import QuestionAnsweringTask
+from agenticrag.utils.helpers import FinalAnswerStreamer
+from agenticrag.utils.message_budget import MessageBudget
+from agenticrag.utils.scheduler import Priority, _current_priority
+from agenticrag.utils.scripted_llm import ScriptedChatModel
+from agenticrag.utils.tracing import JSONFileExporter, Tracer
+from agenticrag.types.core import (
+    AnswerRetractedEvent,
+    AnswerTokenEvent,
+    DataFormat,
+    DatasetsSelectedEvent,
+    MetaData,
+    ResponseEvent,
+    TasksSelectedEvent,
+    TableData,
+    TextData,
+    ToolCallEvent,
+    ToolOutputEvent,
+)
+
+
+def _embedding(text: str):
+    rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+    return rng.standard_normal(8, dtype=np.float32)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    text_store = TextStore(persistent_dir=str(tmp_path / "chroma"), embedding_function=_embedding)
+    meta_store = MetaStore(connection_url=f"sqlite:///{tmp_path}/meta.db")
+    meta_store.add(MetaData(name="fruits", description="Facts about fruits", format=DataFormat.TEXT))
+    text_store.add(TextData(id="fruits_0", name="fruits", text="Apples are red."))
+
+    retrieved_dir = str(tmp_path / "retrieved")
+    llm = ScriptedChatModel(controller_script=[
+        {"tool": "vector_search_retriever", "args": {"query": "apple color", "document_name": "fruits"}},
+        {"tool": "question_answering", "args": {"query": "apple color", "file_path": "<last_output>"}},
+        {"tool": "final_answer", "args": {"answer": "Apples are red."}},
+    ])
+    return RAGAgent(
+        llm=llm,
+        persistent_dir=str(tmp_path),
+        meta_store=meta_store,
+        tasks=[QuestionAnsweringTask(llm=llm)],
+        retrievers=[VectorRetriever(store=text_store, persistent_dir=retrieved_dir)],
+    )
+
+
+def test_invoke(agent):
+    response = agent.invoke("What color are apples?")
+    assert response.success
+    assert response.content == "Apples are red."
+    assert [d.name for d in response.datasets] == ["fruits"]
+    assert response.iterations == 2
+
+
+def test_ainvoke(agent):
+    response = asyncio.run(agent.ainvoke("What color are apples?"))
+    assert response.success
+    assert response.content == "Apples are red."
+    assert [t.name for t in response.tasks] == ["question_answering"]
+
+
+def test_ainvoke_runs_blocking_calls_in_the_callers_context(agent):
+    request_id = contextvars.ContextVar("request_id", default=None)
+    seen = []
+
+    class RecordingSessionStore(InMemorySessionStore):
+        def append(self, session_id, message):
+            seen.append(request_id.get())
+            return super().append(session_id, message)
+
+    async def handle():
+        request_id.set("req-1")
+        return await agent.ainvoke("What color are apples?")
+
+    agent.session_store = RecordingSessionStore()
+    assert asyncio.run(handle()).success
+    assert seen and all(value == "req-1" for value in seen)
+
+
+def test_tool_registry_is_reused_until_tools_change(agent):
+    registry = agent.tool_registry
+    agent.invoke("What color are apples?")
+    assert agent.tool_registry is registry
+    assert set(registry.tools) == {"vector_search_retriever", "question_answering"}
+
+    agent.tasks = [QuestionAnsweringTask(llm=agent.llm)]
+    assert agent.tool_registry is not registry
+
+
+def test_stream_yields_events_in_order(agent):
+    events = list(agent.stream("What color are apples?"))
+    kinds = [type(e) for e in events]
+    assert kinds[:2] == [TasksSelectedEvent, DatasetsSelectedEvent]
+    assert [e.tool for e in events if isinstance(e, ToolCallEvent)] == ["vector_search_retriever", "question_answering"]
+    assert len([e for e in events if isinstance(e, ToolOutputEvent)]) == 2
+
+    tokens = [e.token for e in events if isinstance(e, AnswerTokenEvent)]
+    assert len(tokens) > 1
+    assert "".join(tokens) == "Apples are red."
+    assert isinstance(events[-1], ResponseEvent)
+    assert events[-1].response.content == "Apples are red."
+
+
+def test_astream_builds_response(agent):
+    async def collect():
+        return [event async for event in agent.astream("What color are apples?")]
+    events = asyncio.run(collect())
+    assert "".join(e.token for e in events if isinstance(e, AnswerTokenEvent)) == "Apples are red."
+    assert events[-1].response.success
+
+
+def test_final_answer_streamer_handles_split_escapes():
+    streamer = FinalAnswerStreamer()
+    payload = '```json\n{"tool": "final_answer", "args": {"answer": "Line\\none \\u00e9 \\"q\\""}}\n```'
+    tokens = [streamer.feed(payload[i:i + 3]) for i in range(0, len(payload), 3)]
+    assert "".join(tokens) == 'Line\none \u00e9 "q"'
+    assert streamer.remainder('Line\none \u00e9 "q"') == ""
+
+
+def test_batch_returns_results_in_order(agent):
+    queries = [f"What color are apples? #{i}" for i in range(4)]
+    responses = agent.batch(queries, max_concurrency=2)
+    assert len(responses) == 4
+    assert all(r.success and r.content == "Apples are red." for r in responses)
+    assert len(agent.chat_history) == 0
+
+
+def test_batch_reports_errors_per_query(agent, monkeypatch):
+    original = agent._select_tasks
+
+    def flaky_select_tasks(query):
+        if "boom" in query:
+            raise RuntimeError("selection failed")
+        return original(query)
+
+    monkeypatch.setattr(agent, "_select_tasks", flaky_select_tasks)
+    responses = agent.batch(["What color are apples?", "boom"])
+    assert responses[0].success
+    assert not responses[1].success and "selection failed" in responses[1].error
+
+
+def test_abatch(agent):
+    responses = asyncio.run(agent.abatch(["a", "b", "c"], max_concurrency=2))
+    assert [r.content for r in responses] == ["Apples are red."] * 3
+
+
+def test_batch_runs_behind_interactive_queries(agent, monkeypatch):
+    levels = set()
+    original = ScriptedChatModel._reply
+
+    def recording_reply(self, messages):
+        levels.add(_current_priority.get())
+        return original(self, messages)
+
+    monkeypatch.setattr(ScriptedChatModel, "_reply", recording_reply)
+    agent.invoke("What color are apples?")
+    assert levels == {Priority.INTERACTIVE}
+    levels.clear()
+    agent.batch(["What color are apples?"])
+    asyncio.run(agent.abatch(["What color are apples?"]))
+    assert levels == {Priority.BACKGROUND}
+    levels.clear()
+    agent.batch(["What color are apples?"], level=Priority.INTERACTIVE)
+    assert levels == {Priority.INTERACTIVE}
+
+
+def test_answer_cache_short_circuits_repeated_query(agent, tmp_path):
+    agent.answer_cache = AnswerCache(agent.meta_store, embedding_function=_embedding, connection_url=f"sqlite:///{tmp_path}/cache.db")
+    first = agent.batch(["What color are apples?"])[0]
+    second = agent.batch(["What color are apples?"])[0]
+    assert not first.cached
+    assert second.cached and second.content == first.content
+    assert [d.name for d in second.datasets] == ["fruits"]
+
+
+def test_answer_cache_keys_on_the_current_message(agent, tmp_path):
+    agent.answer_cache = AnswerCache(agent.meta_store, embedding_function=_embedding, connection_url=f"sqlite:///{tmp_path}/cache.db")
+    assert not agent.invoke("What color are apples?", session_id="a").cached
+    assert agent.invoke("What color are apples?", session_id="b").cached
+    assert not agent.invoke("And bananas?", session_id="b").cached
+    assert not agent.invoke("And bananas?", session_id="c").cached
+
+
+def test_parallel_tool_calls_in_one_turn(agent):
+    agent.llm.llm.controller_script = [
+        {"tool_calls": [
+            {"tool": "vector_search_retriever", "args": {"query": "apple", "document_name": "fruits"}},
+            {"tool": "vector_search_retriever", "args": {"query": "red", "document_name": "fruits"}},
+        ]},
+        {"tool": "final_answer", "args": {"answer": "Apples are red."}},
+    ]
+    events = list(agent.stream("What color are apples?"))
+    outputs = [e for e in events if isinstance(e, ToolOutputEvent)]
+    assert len(outputs) == 2
+    assert outputs[0].output != outputs[1].output
+    assert all("saved at" in e.output for e in outputs)
+    assert events[-1].response.iterations == 1
+
+
+def test_tool_timeout_is_reported(agent, monkeypatch):
+    import time
+    retriever = agent.retrievers[0]
+    monkeypatch.setattr(retriever.store, "search_similar", lambda **kwargs: time.sleep(0.5) or [])
+    agent.tool_timeout = 0.05
+    agent.llm.llm.controller_script = [
+        {"tool": "vector_search_retriever", "args": {"query": "apple", "document_name": "fruits"}},
+        {"tool": "final_answer", "args": {"answer": "done"}},
+    ]
+    outputs = [e.output for e in agent.stream("apples?") if isinstance(e, ToolOutputEvent)]
+    assert outputs == ["Error executing vector_search_retriever tool: timed out after 0.05 seconds"]
+
+
+def test_tool_timeout_starts_when_the_tool_runs(agent, monkeypatch):
+    import time
+    retriever = agent.retrievers[0]
+    monkeypatch.setattr(retriever.store, "search_similar", lambda **kwargs: time.sleep(0.2) or [])
+    agent.tool_timeout = 0.5
+    agent.max_parallel_tools = 1
+    agent.llm.llm.controller_script = [
+        {"tool_calls": [
+            {"tool": "vector_search_retriever", "args": {"query": q, "document_name": "fruits"}} for q in ("a", "b", "c")
+        ]},
+        {"tool": "final_answer", "args": {"answer": "done"}},
+    ]
+    outputs = [e.output for e in agent.stream("apples?") if isinstance(e, ToolOutputEvent)]
+    assert len(outputs) == 3 and not any("timed out" in output for output in outputs)
+
+
+def test_timed_out_tools_free_their_slot(agent, monkeypatch):
+    import time
+    retriever = agent.retrievers[0]
+    monkeypatch.setattr(retriever.store, "search_similar", lambda **kwargs: time.sleep(1) or [])
+    agent.tool_timeout = 0.1
+    agent.max_parallel_tools = 1
+    agent.llm.llm.controller_script = [
+        {"tool_calls": [
+            {"tool": "vector_search_retriever", "args": {"query": q, "document_name": "fruits"}} for q in ("a", "b")
+        ]},
+        {"tool": "final_answer", "args": {"answer": "done"}},
+    ]
+    started = time.monotonic()
+    outputs = [e.output for e in agent.stream("apples?") if isinstance(e, ToolOutputEvent)]
+    assert time.monotonic() - started < 0.8
+    assert len(outputs) == 2 and all("timed out" in output for output in outputs)
+
+
+@pytest.mark.parametrize("run", ["sync", "async"])
+def test_parallel_tools_are_bounded(agent, monkeypatch, run):
+    import threading
+    import time
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def search_similar(**kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return []
+
+    monkeypatch.setattr(agent.retrievers[0].store, "search_similar", search_similar)
+    agent.max_parallel_tools = 2
+    agent.llm.llm.controller_script = [
+        {"tool_calls": [
+            {"tool": "vector_search_retriever", "args": {"query": str(q), "document_name": "fruits"}} for q in range(5)
+        ]},
+        {"tool": "final_answer", "args": {"answer": "done"}},
+    ]
+    response = agent.invoke("apples?") if run == "sync" else asyncio.run(agent.ainvoke("apples?"))
+    assert response.content == "done"
+    assert peak[0] == 2
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_final_answer_mixed_with_tool_calls_is_rejected(agent, mode):
+    agent.llm.llm.controller_script = [
+        {"tool_calls": [
+            {"tool": "vector_search_retriever", "args": {"query": "apple", "document_name": "fruits"}},
+            {"tool": "final_answer", "args": {"answer": "guess"}},
+        ]},
+        {"tool": "final_answer", "args": {"answer": "Apples are red."}},
+    ]
+    if mode == "sync":
+        events = list(agent.stream("What color are apples?"))
+    else:
+        async def collect():
+            return [event async for event in agent.astream("What color are apples?")]
+        events = asyncio.run(collect())
+    response = events[-1].response
+    assert response.content == "Apples are red." and response.iterations == 1
+
+    # Tokens of the rejected "guess" were streamed, then retracted before the accepted answer.
+    retracted = [i for i, e in enumerate(events) if isinstance(e, AnswerRetractedEvent)]
+    assert len(retracted) == 1 and events[retracted[0]].iteration == 0
+    assert "".join(e.token for e in events[:retracted[0]] if isinstance(e, AnswerTokenEvent)) == "guess"
+    assert "".join(e.token for e in events[retracted[0]:] if isinstance(e, AnswerTokenEvent)) == "Apples are red."
+
+
+def test_sessions_keep_separate_history(agent):
+    agent.invoke("What color are apples?", session_id="alice")
+    agent.invoke("And bananas?", session_id="bob")
+    agent.invoke("Thanks", session_id="alice")
+    assert [m["content"] for m in agent.session_store.get_history("alice")] == ["What color are apples?", "Thanks"]
+    assert [m["content"] for m in agent.session_store.get_history("bob")] == ["And bananas?"]
+    assert agent.chat_history == []
+    agent.invoke("What color are apples?")
+    assert len(agent.chat_history) == 1
+
+
+def test_tool_outputs_are_passed_whole_without_message_budget(agent):
+    output = "Relevant text " + "x" * 20000
+    messages = []
+    assert agent._append_tool_outputs(messages, "{}", [{"tool": "question_answering", "args": {}}], [output], "q") == 0
+    assert output in messages[-1].content
+
+    agent.message_budget = MessageBudget()
+    assert agent._append_tool_outputs(messages, "{}", [{"tool": "question_answering", "args": {}}], [output], "q") > 0
+    assert "[truncated" in messages[-1].content
+
+
+def test_message_budget_reports_tokens_saved(agent):
+    agent.message_budget = MessageBudget(keep_recent=0)
+    response = agent.invoke("What color are apples? " * 50)
+    assert response.success
+    assert response.tokens_saved > 0
+
+
+def test_retrieved_text_is_handed_over_in_memory(agent, tmp_path):
+    events = list(agent.stream("What color are apples?"))
+    outputs = [e.output for e in events if isinstance(e, ToolOutputEvent)]
+    assert "artifact://" in outputs[0]
+    assert outputs[1].startswith("Answer based on")
+    assert not os.listdir(tmp_path / "retrieved")
+
+
+def test_retrieved_table_is_handed_over_in_memory(tmp_path):
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text("month,sales\njan,10\nfeb,20\n")
+    table_store = TableStore(connection_url=f"sqlite:///{tmp_path}/tables.db")
+    table_store.add(TableData(name="sales", path=str(csv_path), structure_summary="month,sales"))
+    meta_store = MetaStore(connection_url=f"sqlite:///{tmp_path}/meta.db")
+    meta_store.add(MetaData(name="sales", description="Monthly sales", format=DataFormat.TABLE))
+    llm = ScriptedChatModel(controller_script=[
+        {"tool": "table_data_retriever", "args": {"query": "sales", "data_name": "sales"}},
+        {"tool": "question_answering", "args": {"query": "sales", "file_path": "<last_output>"}},
+        {"tool": "final_answer", "args": {"answer": "30"}},
+    ])
+    retrieved_dir = tmp_path / "retrieved"
+    agent = RAGAgent(
+        llm=llm,
+        persistent_dir=str(tmp_path),
+        meta_store=meta_store,
+        tasks=[QuestionAnsweringTask(llm=llm)],
+        retrievers=[TableRetriever(store=table_store, llm=llm, persistent_dir=str(retrieved_dir))],
+    )
+    outputs = [e.output for e in agent.stream("Total sales?") if isinstance(e, ToolOutputEvent)]
+    assert "artifact://" in outputs[0]
+    assert outputs[1].startswith("Answer based on")
+    assert not os.listdir(retrieved_dir)
+
+
+def test_response_trace_covers_stages(agent, tmp_path):
+    agent.tracer = Tracer(exporters=[JSONFileExporter(path=str(tmp_path / "traces.jsonl"))])
+    trace = agent.invoke("What color are apples?").trace
+    by_id = {s.span_id: s for s in trace.spans}
+
+    root = trace.find("rag_agent.invoke")[0]
+    assert root.parent_id is None and root.duration_ms >= 0
+    assert by_id[trace.find("select_tasks")[0].parent_id] is root
+    search = trace.find("TextStore.search_similar")[0]
+    assert by_id[search.parent_id].name == "tool.vector_search_retriever"
+    qa_llm = [s for s in trace.find("llm") if by_id[s.parent_id].name == "tool.question_answering"]
+    assert len(qa_llm) == 1
+    assert len(trace.find("llm")) >= 4
+
+    with open(tmp_path / "traces.jsonl") as f:
+        exported = json.loads(f.readline())
+    spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {s["traceId"] for s in spans} == {trace.trace_id}
+    assert len(spans) == len(trace.spans)
+
+
+def test_astream_trace(agent):
+    response = asyncio.run(agent.ainvoke("What color are apples?"))
+    names = {s.name for s in response.trace.spans}
+    assert {"rag_agent.invoke", "select_tasks", "select_datasets", "tool.question_answering", "llm"} <= names
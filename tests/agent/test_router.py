@@ -0,0 +1,71 @@
+import re
+from collections import Counter
+import numpy as np
+
+from agenticrag.tasks import QuestionAnsweringTask
+from agenticrag.tasks.chart_generation_task import ChartGenerationTask
+from agenticrag.types.core import DataFormat, MetaData
+from agenticrag.utils.router import Router
+
+VOCAB = ["chart", "plot", "graph", "answer", "question", "sales", "fruits", "color"]
+
+
+def _embedding(text: str):
+    counts = Counter(re.findall(r"\w+", text.lower()))
+    return np.array([counts[word] for word in VOCAB] + [0.01], dtype=np.float32)
+
+
+def _datasets():
+    return [
+        MetaData(id=1, name="sales", description="Monthly sales", format=DataFormat.TABLE),
+        MetaData(id=2, name="fruits", description="Facts about fruits", format=DataFormat.TEXT),
+    ]
+
+
+def test_single_candidate_is_resolved_without_classifier():
+    router = Router()
+    task = QuestionAnsweringTask(llm=object())
+    assert router.route_tasks("anything", [task]) == [task]
+    assert router.route_datasets("anything", _datasets()[:1]) == _datasets()[:1]
+    assert router.route_datasets("anything", _datasets()) is None
+    assert Router(resolve_single=False).route_tasks("anything", [task]) is None
+
+
+def test_classifier_uses_past_decisions():
+    router = Router(embedding_function=_embedding, confidence_threshold=0.8, k=2)
+    datasets = _datasets()
+    assert router.route_datasets("sales chart", datasets) is None
+
+    router.record_datasets("sales chart", datasets[:1])
+    router.record_datasets("plot sales chart", datasets[:1])
+    assert router.route_datasets("sales chart", datasets) == datasets[:1]
+    assert router.route_datasets("fruits color", datasets) is None
+
+
+def test_classifier_ignores_decisions_over_missing_datasets():
+    router = Router(embedding_function=_embedding, confidence_threshold=0.8, k=2)
+    datasets = _datasets()
+    router.record_datasets("sales chart", datasets[:1])
+    router.record_datasets("sales chart", datasets[:1])
+    others = [datasets[1], MetaData(id=3, name="weather", description="Daily weather", format=DataFormat.TEXT)]
+    assert router.route_datasets("sales chart", others) is None
+
+
+def test_task_classifier():
+    router = Router(embedding_function=_embedding, confidence_threshold=0.8, k=2)
+    qa, chart = QuestionAnsweringTask(llm=object()), ChartGenerationTask(llm=object())
+    router.record_tasks("plot a chart", [chart])
+    router.record_tasks("plot a chart graph", [chart])
+    assert router.route_tasks("plot a chart", [qa, chart]) == [chart]
+
+
+def test_description_vectors_are_bounded_and_shared_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    router = Router(embedding_function=_embedding, max_descriptions=2)
+    batches = [
+        [MetaData(id=i, name=f"data_{i}_{j}", description="Monthly sales", format=DataFormat.TABLE) for j in range(2)]
+        for i in range(20)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda datasets: router.route_datasets("sales chart", datasets), batches))
+    assert len(router._description_vectors) == 2
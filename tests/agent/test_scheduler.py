@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from langchain_core.messages import HumanMessage
+import pytest
+
+from agenticrag.utils.llm_gateway import LLMGateway
+from agenticrag.utils.scheduler import LLMScheduler, Priority, is_rate_limit_error, priority
+from tests.agent.test_llm_gateway import CountingLLM
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_interactive_calls_run_before_background():
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = []
+    release = threading.Event()
+
+    def submit(level, name):
+        def run():
+            with priority(level):
+                scheduler.call(order.append, name)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    holder = threading.Thread(target=scheduler.call, args=(release.wait,))
+    holder.start()
+    while scheduler.metrics["active"] == 0:
+        time.sleep(0.01)
+    threads = [submit(Priority.BACKGROUND, "background")]
+    while scheduler.metrics["queued"] < 1:
+        time.sleep(0.01)
+    threads.append(submit(Priority.INTERACTIVE, "interactive"))
+    while scheduler.metrics["queued"] < 2:
+        time.sleep(0.01)
+
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join()
+    assert order == ["interactive", "background"]
+
+
+def test_concurrency_cap_and_rate_limit():
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_minute=600, burst=1)
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=scheduler.call, args=(work,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak <= 2
+    # One request every 0.1s after the first
+    assert time.monotonic() - start >= 0.3
+    assert scheduler.metrics["calls"] == 4
+
+
+def test_retries_rate_limit_errors():
+    scheduler = LLMScheduler(max_retries=2, base_delay=0.01)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("Too Many Requests")
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok"
+    assert scheduler.metrics["retries"] == 2
+
+    with pytest.raises(RateLimitError):
+        scheduler.call(lambda: (_ for _ in ()).throw(RateLimitError("again")))
+    with pytest.raises(ValueError):
+        scheduler.call(lambda: (_ for _ in ()).throw(ValueError("bad input")))
+    assert scheduler.metrics["active"] == 0
+
+
+def test_is_rate_limit_error():
+    class ResourceExhausted(Exception):
+        pass
+
+    class ChatGoogleGenerativeAIError(Exception):
+        pass
+
+    class ServerError(Exception):
+        status_code = 500
+
+    assert is_rate_limit_error(RateLimitError())
+    assert is_rate_limit_error(ResourceExhausted("slow down"))
+    assert is_rate_limit_error(ChatGoogleGenerativeAIError("429 Resource has been exhausted (e.g. check quota)."))
+    try:
+        try:
+            raise RateLimitError()
+        except RateLimitError as e:
+            raise RuntimeError("model call failed") from e
+    except RuntimeError as wrapped:
+        assert is_rate_limit_error(wrapped)
+
+    assert not is_rate_limit_error(ValueError("invalid prompt"))
+    assert not is_rate_limit_error(ValueError("Table quota_2024 has 429 rows"))
+    assert not is_rate_limit_error(ServerError("429 in upstream logs"))
+
+
+def test_gateway_schedules_model_calls():
+    scheduler = LLMScheduler(max_concurrency=1)
+    gateway = LLMGateway(llm=CountingLLM(), scheduler=scheduler)
+
+    async def ask(i):
+        return (await gateway.ainvoke([HumanMessage(f"q{i}")])).content
+
+    async def ask_all():
+        return await asyncio.gather(*(ask(i) for i in range(3)))
+
+    replies = asyncio.run(ask_all())
+    assert replies == ["reply to q0", "reply to q1", "reply to q2"]
+    assert "".join(chunk.content for chunk in gateway.stream([HumanMessage("s")])) == "reply to s "
+    assert gateway.metrics["calls"] == 4 and gateway.metrics["active"] == 0
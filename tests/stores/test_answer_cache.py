@@ -0,0 +1,78 @@
+import time
+import pytest
+import numpy as np
+from agenticrag.stores import AnswerCache, MetaStore
+from agenticrag.types.core import DataFormat, MetaData
+
+VOCAB = ["revenue", "region", "weather", "rain", "q1", "q2"]
+
+def bag_of_words(text: str):
+    words = text.lower().replace("?", "").split()
+    return np.array([words.count(v) for v in VOCAB], dtype=np.float32) + 1e-3
+
+@pytest.fixture
+def meta_store():
+    return MetaStore(connection_url="sqlite:///:memory:")
+
+@pytest.fixture
+def sales(meta_store):
+    return meta_store.add(MetaData(name="sales", description="Sales by region", format=DataFormat.TABLE))
+
+@pytest.fixture
+def cache(meta_store, tmp_path):
+    return AnswerCache(meta_store, embedding_function=bag_of_words, connection_url=f"sqlite:///{tmp_path}/cache.db", similarity_threshold=0.9)
+
+def test_similar_query_hits(cache, sales):
+    cache.put("q1 revenue by region", "North leads", [sales])
+    hit = cache.lookup("Q1 revenue by region?")
+    assert hit is not None and hit.answer == "North leads"
+    assert cache.lookup("will it rain") is None
+
+def test_dataset_changes_invalidate(cache, meta_store, sales):
+    cache.put("q1 revenue by region", "North leads", [sales])
+    meta_store.update(sales.id, description="Sales by region, refreshed")
+    assert cache.lookup("q1 revenue by region") is None
+
+    sales = meta_store.index(name="sales")[0]
+    cache.put("q1 revenue by region", "South leads", [sales])
+    meta_store.delete(sales.id)
+    assert cache.lookup("q1 revenue by region") is None
+
+def test_persisted_entries_are_checked_against_current_versions(meta_store, sales, tmp_path):
+    url = f"sqlite:///{tmp_path}/cache.db"
+    AnswerCache(meta_store, embedding_function=bag_of_words, connection_url=url).put("q1 revenue", "North leads", [sales])
+
+    assert AnswerCache(meta_store, embedding_function=bag_of_words, connection_url=url).lookup("q1 revenue").answer == "North leads"
+    other_catalogue = MetaStore(connection_url="sqlite:///:memory:")
+    other_catalogue.add(MetaData(name="sales", description="Sales by region", format=DataFormat.TABLE, source="elsewhere"))
+    assert AnswerCache(other_catalogue, embedding_function=bag_of_words, connection_url=url).lookup("q1 revenue") is None
+
+def test_stale_nearest_entry_falls_back_to_next_candidate(cache, sales):
+    cache.put("q1 revenue by region region", "North leads", [sales])
+    archived = MetaData(name="sales_archive", description="Old sales", format=DataFormat.TABLE)
+    cache.put("q1 revenue by region", "From the archive", [archived])
+
+    assert cache.lookup("q1 revenue by region").answer == "North leads"
+    assert len(cache.get_all()) == 1
+
+def test_rebuilt_catalogue_with_same_content_keeps_answers(cache, meta_store, sales):
+    cache.put("q1 revenue by region", "North leads", [sales])
+    other_catalogue = MetaStore(connection_url="sqlite:///:memory:")
+    other_catalogue.add(MetaData(name="filler", description="", format=DataFormat.TEXT))
+    reloaded = other_catalogue.add(MetaData(name="sales", description="Sales by region", format=DataFormat.TABLE))
+    assert reloaded.id != sales.id
+    cache.meta_store = other_catalogue
+    assert cache.lookup("q1 revenue by region").answer == "North leads"
+
+def test_ttl_and_lru_eviction(meta_store, sales, tmp_path):
+    cache = AnswerCache(meta_store, embedding_function=bag_of_words, connection_url=f"sqlite:///{tmp_path}/c.db", max_entries=2, ttl_seconds=60)
+    cache.put("q1 revenue", "a", [sales])
+    cache.put("q2 revenue", "b", [sales])
+    cache.lookup("q1 revenue")
+    cache.put("rain weather", "c", [sales])
+    assert cache.lookup("q2 revenue") is None
+    assert cache.lookup("q1 revenue").answer == "a"
+
+    cache.ttl_seconds = 0.01
+    time.sleep(0.02)
+    assert cache.lookup("q1 revenue") is None
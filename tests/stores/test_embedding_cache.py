@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from agenticrag.stores import EmbeddingCache, TextStore
+from agenticrag.types.core import TextData
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "embeddings")
+
+
+def test_get_put_and_persistence(cache_dir):
+    cache = EmbeddingCache(directory=cache_dir, dtype="float32")
+    assert cache.get_many("model", ["a", "b"]) == [None, None]
+    cache.put_many("model", ["a", "b"], [[1.0, 2.0, 3.0], np.array([4.0, 5.0, 6.0])])
+
+    a, missing = cache.get_many("model", ["a", "c"])
+    assert a.tolist() == [1.0, 2.0, 3.0] and missing is None
+    assert cache.get_many("other-model", ["a"]) == [None]
+    assert cache.metrics["hits"] == 1 and cache.metrics["misses"] == 4
+
+    reopened = EmbeddingCache(directory=cache_dir, dtype="float32")
+    assert len(reopened) == 2
+    assert reopened.get_many("model", ["b"])[0].tolist() == [4.0, 5.0, 6.0]
+
+
+def test_least_recently_used_entries_are_evicted(cache_dir):
+    cache = EmbeddingCache(directory=cache_dir, max_entries=2)
+    cache.put_many("model", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["c"], [[0.5, 0.5]])
+
+    a, b, c = cache.get_many("model", ["a", "b", "c"])
+    assert b is None
+    assert a.tolist() == [1.0, 0.0] and c.tolist() == [0.5, 0.5]
+    assert cache.metrics["evictions"] == 1
+
+
+def embed(text):
+    embed.calls += 1
+    return np.array([len(text), 1.0, 0.5], dtype=np.float32)
+
+
+def test_text_store_reuses_cached_embeddings(tmp_path, cache_dir):
+    cache = EmbeddingCache(directory=cache_dir)
+    embed.calls = 0
+    first = TextStore(persistent_dir=str(tmp_path / "first"), embedding_function=embed, embedding_cache=cache)
+    first.add_many([TextData(id=str(i), name="doc", text=f"chunk {i}") for i in range(5)])
+    assert embed.calls == 5
+
+    rebuilt = TextStore(persistent_dir=str(tmp_path / "rebuilt"), embedding_function=embed, embedding_cache=cache)
+    rebuilt.add_many([TextData(id=str(i), name="doc", text=f"chunk {i}") for i in range(6)])
+    assert embed.calls == 6
+    assert len(rebuilt.search_similar("chunk 1", top_k=2)) == 2
+    assert embed.calls == 6
+    rebuilt.search_similar("a new query")
+    assert embed.calls == 7
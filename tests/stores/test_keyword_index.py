@@ -0,0 +1,82 @@
+import re
+import threading
+import numpy as np
+
+from agenticrag.retrievers import VectorRetriever
+from agenticrag.retrievers.vector_retriever import reciprocal_rank_fusion
+from agenticrag.stores import NumpyTextStore
+from agenticrag.stores.keyword_index import BM25Index, tokenize
+from agenticrag.types.core import TextData
+from agenticrag.utils.artifacts import load_artifact_text
+
+
+def test_tokenize_keeps_identifiers_whole_and_split():
+    assert tokenize("Check orders.customer_id for ERR-4021") == [
+        "check", "orders.customer_id", "orders", "customer_id", "for", "err-4021", "err", "4021",
+    ]
+
+
+def test_bm25_prefers_rare_terms_and_shorter_entries():
+    index = BM25Index()
+    index.add("1", "pump pump pump pressure")
+    index.add("2", "pump flange")
+    index.add("3", "pump pressure readings across the whole plant over many weeks", name="plant")
+    assert [id for id, _ in index.search("flange pump")] == ["2", "1", "3"]
+    assert [id for id, _ in index.search("pressure")] == ["1", "3"]
+    assert [id for id, _ in index.search("pressure", name="plant")] == ["3"]
+
+    index.add("2", "valve")
+    index.remove("1")
+    assert index.search("flange") == []
+    assert [id for id, _ in index.search("pump")] == ["3"]
+    assert len(index) == 2
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a, b, c = (TextData(id=i, name="doc", text=i) for i in "abc")
+    assert [d.id for d in reciprocal_rank_fusion([[a, b, c], [b, c]])] == ["b", "c", "a"]
+
+
+def one_hot(text: str):
+    vector = np.zeros(16, dtype=np.float32)
+    for word in text.lower().split():
+        vector[sum(map(ord, word)) % 16] = 1.0
+    return vector
+
+
+def test_hybrid_retriever_finds_exact_identifiers(tmp_path):
+    store = NumpyTextStore(persistent_dir=str(tmp_path / "store"), embedding_function=one_hot)
+    store.add_many([
+        TextData(id="1", name="manual", text="the pump manual covers pressure and maintenance"),
+        TextData(id="2", name="manual", text="ERR-4021 means the seal is worn"),
+        TextData(id="3", name="manual", text="pump pressure maintenance schedule"),
+    ])
+
+    def retrieved(hybrid):
+        retriever = VectorRetriever(store=store, persistent_dir=str(tmp_path / "retrieved"), top_k=2, hybrid=hybrid)
+        ref = re.search(r"`(.+)`", retriever.retrieve("pump maintenance ERR-4021")).group(1)
+        return load_artifact_text(ref)
+
+    assert "ERR-4021" not in retrieved(hybrid=False)
+    assert "ERR-4021" in retrieved(hybrid=True)
+
+
+def test_writes_during_the_keyword_index_build_are_indexed(tmp_path):
+    store = NumpyTextStore(persistent_dir=str(tmp_path / "store"), embedding_function=one_hot)
+    store.add(TextData(id="1", name="manual", text="pump pressure"))
+    writer = threading.Thread(target=store.add, args=(TextData(id="2", name="manual", text="ERR-4021 seal worn"),))
+    iter_all = store.iter_all
+
+    def iter_all_then_write(*args, **kwargs):
+        yield from iter_all(*args, **kwargs)
+        # The write lands after the build has read the store, and must wait for the index instead of skipping it.
+        writer.start()
+        writer.join(timeout=0.5)
+
+    store.iter_all = iter_all_then_write
+    assert [item.id for item in store.search_keywords("pump")] == ["1"]
+    writer.join()
+    assert [item.id for item in store.search_keywords("ERR-4021")] == ["2"]
+
+    other = NumpyTextStore(persistent_dir=str(tmp_path / "other"), embedding_function=one_hot)
+    assert store._keyword_lock is not other._keyword_lock
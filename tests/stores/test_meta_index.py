@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+from agenticrag.stores import MetaStore, MetaIndex
+from agenticrag.types.core import DataFormat, MetaData
+
+VOCAB = ["sales", "revenue", "weather", "rain", "employees", "salary"]
+
+def bag_of_words(text: str):
+    words = text.lower().split()
+    return np.array([sum(w.startswith(v) for w in words) for v in VOCAB], dtype=np.float32) + 1e-3
+
+@pytest.fixture
+def meta_store():
+    store = MetaStore(connection_url="sqlite:///:memory:")
+    store.add(MetaData(name="sales", description="Monthly sales and revenue", format=DataFormat.TABLE))
+    store.add(MetaData(name="weather", description="Daily weather and rain records", format=DataFormat.TABLE))
+    return store
+
+def test_search_ranks_by_similarity(meta_store):
+    index = MetaIndex(meta_store, embedding_function=bag_of_words, top_n=1)
+    results = index.search("how much revenue did sales make")
+    assert [data.name for data, _ in results] == ["sales"]
+
+def test_index_follows_store_writes(meta_store):
+    index = MetaIndex(meta_store, embedding_function=bag_of_words, top_n=1)
+    hr = meta_store.add(MetaData(name="hr", description="Employees and salary", format=DataFormat.TABLE))
+    assert len(index) == 3
+    assert index.search("employees salary")[0][0].name == "hr"
+
+    meta_store.delete(hr.id)
+    assert len(index) == 2
+    assert all(data.name != "hr" for data, _ in index.search("employees salary", top_n=5))
+
+def test_shortlist(meta_store):
+    index = MetaIndex(meta_store, embedding_function=bag_of_words, top_n=5)
+    candidates, skip_llm = index.shortlist("rain")
+    assert len(candidates) == 2 and not skip_llm
+
+    index = MetaIndex(meta_store, embedding_function=bag_of_words, top_n=1, min_similarity=0.3, llm_skip_threshold=1)
+    candidates, skip_llm = index.shortlist("rain")
+    assert [data.name for data in candidates] == ["weather"]
+    assert skip_llm
+
+def test_index_follows_bulk_writes(meta_store):
+    index = MetaIndex(meta_store, embedding_function=bag_of_words, top_n=5)
+    meta_store.update_where({"name": "weather"}, description="Employees and salary")
+    assert index.search("employees salary")[0][0].name == "weather"
+    assert meta_store.delete_where(format=DataFormat.TABLE.value) == 2
+    assert len(index) == 0
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from agenticrag.stores import NumpyTextStore
+from agenticrag.types.core import TextData
+
+
+def one_hot(text: str):
+    """Each distinct word sets one dimension, so similarity counts shared words."""
+    vector = np.zeros(16, dtype=np.float32)
+    for word in text.lower().split():
+        vector[sum(map(ord, word)) % 16] = 1.0
+    return vector
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NumpyTextStore(persistent_dir=str(tmp_path / "numpy"), embedding_function=one_hot)
+
+
+def test_search_ranks_by_similarity_and_filters_by_name(store):
+    store.add_many([
+        TextData(id="1", name="fruit", text="apple banana"),
+        TextData(id="2", name="fruit", text="cherry"),
+        TextData(id="3", name="cars", text="apple engine"),
+        TextData(id="4", name="cars", text="wheel"),
+    ], batch_size=3)
+    assert [r.id for r in store.search_similar("apple banana", top_k=2)] == ["1", "3"]
+    assert [r.id for r in store.search_similar("apple", document_name="cars", top_k=5)] == ["3", "4"]
+    assert store.search_similar("apple", document_name="missing") == []
+
+
+def test_deleted_rows_are_excluded_and_reused(store):
+    store.add_many([TextData(id=str(i), name="doc", text=f"word{i}") for i in range(3)])
+    store.delete("0")
+    assert "0" not in {r.id for r in store.search_similar("word0", top_k=10)}
+    store.add(TextData(id="new", name="doc", text="word0"))
+    assert store.search_similar("word0", top_k=1)[0].id == "new"
+    assert len(store) == 3
+
+
+def test_entries_persist_across_reopen(store, tmp_path):
+    store.add_many([TextData(id=str(i), name=f"doc{i % 2}", text=f"token{i}") for i in range(2000)])
+    store.update("5", name="renamed", text="something else")
+
+    reopened = NumpyTextStore(persistent_dir=str(tmp_path / "numpy"), embedding_function=one_hot)
+    assert len(reopened) == 2000
+    assert reopened.get("5").text == "something else"
+    assert [r.id for r in reopened.search_similar("something else", document_name="renamed")] == ["5"]
+    assert {r.name for r in reopened.index(name="doc1")} == {"doc1"}
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+def test_quantized_search_rescores_at_full_precision(tmp_path, quantization):
+    rng = np.random.default_rng(0)
+    vectors = {f"text {i}": rng.normal(size=64).astype(np.float32) for i in range(500)}
+    embed = lambda text: vectors[text]
+    exact = NumpyTextStore(persistent_dir=str(tmp_path / "exact"), embedding_function=embed)
+    quantized = NumpyTextStore(persistent_dir=str(tmp_path / quantization), embedding_function=embed, quantization=quantization, rescore_multiplier=10)
+    data = [TextData(id=str(i), name="doc", text=f"text {i}") for i in range(500)]
+    exact.add_many(data)
+    quantized.add_many(data)
+
+    assert quantized.index_nbytes * (4 if quantization == "int8" else 32) == exact.index_nbytes
+    for i in range(0, 500, 50):
+        expected = [r.id for r in exact.search_similar(f"text {i}", top_k=3)]
+        assert [r.id for r in quantized.search_similar(f"text {i}", top_k=3)][0] == expected[0] == str(i)
+
+    reopened = NumpyTextStore(persistent_dir=str(tmp_path / quantization), embedding_function=embed, quantization=quantization)
+    assert reopened.search_similar("text 7", top_k=1)[0].id == "7"
+
+
+def test_search_similar_many_keeps_entries_under_best_query(store):
+    store.add_many([
+        TextData(id="1", name="fruit", text="apple banana"),
+        TextData(id="2", name="fruit", text="cherry"),
+        TextData(id="3", name="cars", text="apple engine"),
+        TextData(id="4", name="cars", text="wheel"),
+    ])
+    fruit, engine = store.search_similar_many(["apple banana", "engine"], top_k=2)
+    assert [r.id for r in fruit] == ["1"]
+    assert engine[0].id == "3"
+    assert [[r.id for r in group] for group in store.search_similar_many(["apple", "wheel"], document_names=["cars"], top_k=1)] == [["3"], ["4"]]
+    assert store.search_similar_many(["apple"], document_names=["missing"]) == [[]]
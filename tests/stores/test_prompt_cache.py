@@ -0,0 +1,42 @@
+import time
+import pytest
+
+from agenticrag.stores import PromptCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PromptCache(connection_url=f"sqlite:///{tmp_path}/prompts.db", max_entries=3)
+
+
+def test_lookup_and_metrics(cache):
+    assert cache.lookup("a") is None
+    cache.put("a", "model", "response a")
+    assert cache.lookup("a") == "response a"
+    cache.put("a", "model", "response a2")
+    assert cache.lookup("a") == "response a2"
+    assert cache.metrics["hits"] == 2 and cache.metrics["misses"] == 1
+    assert cache.metrics["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for key in "abc":
+        cache.put(key, "model", key)
+        time.sleep(0.01)
+    cache.lookup("a")
+    cache.put("d", "model", "d")
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == "a"
+    assert cache.metrics["evictions"] == 1
+
+
+def test_size_limit_and_ttl(tmp_path):
+    cache = PromptCache(connection_url=f"sqlite:///{tmp_path}/prompts.db", max_bytes=10, ttl_seconds=0.5)
+    cache.put("a", "model", "x" * 6)
+    time.sleep(0.01)
+    cache.put("b", "model", "y" * 6)
+    assert cache.lookup("a") is None
+    assert cache.lookup("b") == "y" * 6
+    time.sleep(0.6)
+    assert cache.lookup("b") is None
+    assert cache.metrics["expirations"] == 1
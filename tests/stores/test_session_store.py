@@ -0,0 +1,73 @@
+import pytest
+
+from agenticrag.stores import InMemorySessionStore, SQLSessionStore
+
+
+@pytest.fixture(params=["memory", "sql"])
+def session_store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionStore(max_messages=3)
+    return SQLSessionStore(connection_url=f"sqlite:///{tmp_path}/sessions.db", max_messages=3)
+
+
+def test_sessions_are_isolated(session_store):
+    session_store.append("alice", {"role": "user", "content": "hi"})
+    history = session_store.append("bob", {"role": "user", "content": "hello"})
+    assert history == [{"role": "user", "content": "hello"}]
+    assert session_store.get_history("alice") == [{"role": "user", "content": "hi"}]
+    assert session_store.get_history("carol") == []
+
+
+def test_history_keeps_last_messages(session_store):
+    for i in range(5):
+        history = session_store.append("alice", {"role": "user", "content": str(i)})
+    assert [m["content"] for m in history] == ["2", "3", "4"]
+    session_store.clear("alice")
+    assert session_store.get_history("alice") == []
+
+
+def test_in_memory_store_evicts_least_recently_used_session():
+    store = InMemorySessionStore(max_sessions=2)
+    store.append("a", {"role": "user", "content": "1"})
+    store.append("b", {"role": "user", "content": "2"})
+    store.get_history("a")
+    store.append("c", {"role": "user", "content": "3"})
+    assert store.get_history("b") == []
+    assert store.get_history("a") == [{"role": "user", "content": "1"}]
+
+
+def test_sql_store_deletes_old_messages_and_idle_sessions(tmp_path, monkeypatch):
+    import time
+    store = SQLSessionStore(connection_url=f"sqlite:///{tmp_path}/sessions.db", max_messages=2, ttl_seconds=60)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    for i in range(5):
+        store.append("alice", {"role": "user", "content": str(i)})
+    store.append("bob", {"role": "user", "content": "hi"})
+    assert len(store.get_all()) == 3
+
+    now += 40
+    store.append("bob", {"role": "user", "content": "still here"})
+    now += 30
+    assert store.get_history("alice") == []
+    store.append("carol", {"role": "user", "content": "hello"})
+    assert sorted(m.session_id for m in store.get_all()) == ["bob", "bob", "carol"]
+
+
+def test_sql_store_sweeps_idle_sessions_at_most_once_per_interval(tmp_path, monkeypatch):
+    import time
+    from sqlalchemy import inspect
+    store = SQLSessionStore(connection_url=f"sqlite:///{tmp_path}/sessions.db", ttl_seconds=20, expire_interval_seconds=40)
+    assert any(index["column_names"] == ["created_at"] for index in inspect(store.engine).get_indexes("chat_messages"))
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    store.append("alice", {"role": "user", "content": "hi"})
+
+    now += 30
+    store.append("bob", {"role": "user", "content": "hi"})
+    assert store.get_history("alice") == []
+    assert sorted(m.session_id for m in store.get_all()) == ["alice", "bob"]
+
+    now += 15
+    store.append("bob", {"role": "user", "content": "again"})
+    assert sorted(m.session_id for m in store.get_all()) == ["bob", "bob"]
@@ -46,3 +46,21 @@ def test_index(store, sample_data):
     assert result[0] == store.get(sample_data.id)  
     empty = store.index(name="Nonexistent")
     assert empty == []
+
+def test_iter_all(store):
+    for i in range(5):
+        store.add(TableData(name=f"table_{i}", path=f"/data/{i}.csv", structure_summary="a, b"))
+    assert [item.name for item in store.iter_all(batch_size=2)] == [f"table_{i}" for i in range(5)]
+    assert list(store.iter_all(batch_size=2, fields=["name"])) == [{"name": f"table_{i}"} for i in range(5)]
+    with pytest.raises(ValueError):
+        next(store.iter_all(fields=["missing"]))
+
+def test_delete_and_update_where(store):
+    for name in ["a", "a", "b"]:
+        store.add(TableData(name=name, path=f"/data/{name}.csv", structure_summary="x"))
+    assert store.update_where({"name": "a"}, path="/data/moved.csv") == 2
+    assert {item.path for item in store.index(name="a")} == {"/data/moved.csv"}
+    assert store.delete_where(name="a") == 2
+    assert [item.name for item in store.get_all()] == ["b"]
+    with pytest.raises(ValueError):
+        store.update_where({"missing": 1}, name="c")
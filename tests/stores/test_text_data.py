@@ -4,15 +4,17 @@ import shutil
 from typing import List
 from agenticrag.types.core import TextData
 import random
-from agenticrag.stores.text_store import TextStore
+from agenticrag.stores.text_store import TextStore, NumpyTextStore
 
-@pytest.fixture(params=['custom', 'default'])
+@pytest.fixture(params=['custom', 'default', 'numpy'])
 def text_store(request):
     path = f".test_chroma_{request.param}-{random.randint(0, 10000)}"
     shutil.rmtree(path, ignore_errors=True)
     
     if request.param == 'default':
         store = TextStore(persistent_dir=path)
+    elif request.param == 'numpy':
+        store = NumpyTextStore(persistent_dir=path, embedding_function=lambda text: np.array([0.1, 0.2, 0.3], dtype=np.float32))
     else:
         # Custom embedding returns fixed vector
         def simple_embedding(text: str):
@@ -72,3 +74,61 @@ def test_index(text_store):
     results = text_store.index(name="Idx1")
     assert any(r.id == "8" for r in results)
     assert all(r.name == "Idx1" for r in results)
+
+def test_add_many(text_store):
+    data = [TextData(id=f"batch_{i}", name="Batch", text=f"Chunk number {i}") for i in range(7)]
+    text_store.add_many(data, batch_size=3)
+    fetched = {item.id: item.text for item in text_store.get_all()}
+    assert fetched == {d.id: d.text for d in data}
+
+def test_search_keywords(text_store):
+    text_store.add(TextData(id="10", name="Errors", text="Pump fails with code ERR-4021 after restart"))
+    text_store.add(TextData(id="11", name="Errors", text="Pump restarts cleanly"))
+    assert [r.id for r in text_store.search_keywords("what does ERR-4021 mean", top_k=5)] == ["10"]
+    text_store.add(TextData(id="12", name="Other", text="ERR-4021 is also logged by the valve"))
+    text_store.update("11", text="Restart clears ERR-4021")
+    text_store.delete("10")
+    assert {r.id for r in text_store.search_keywords("ERR-4021", top_k=5)} == {"11", "12"}
+    assert [r.id for r in text_store.search_keywords("ERR-4021", document_name="Other")] == ["12"]
+
+def test_search_similar_many(text_store):
+    text_store.add_many([
+        TextData(id="13", name="A", text="alpha"),
+        TextData(id="14", name="B", text="beta"),
+        TextData(id="15", name="C", text="gamma"),
+    ])
+    results = text_store.search_similar_many(["first", "second"], document_names=["A", "B"], top_k=2)
+    assert len(results) == 2
+    ids = [r.id for group in results for r in group]
+    assert sorted(ids) == ["13", "14"]
+    assert text_store.search_similar_many(["first"], document_names=["missing"]) == [[]]
+
+def test_iter_all(text_store):
+    text_store.add_many([TextData(id=f"page_{i}", name=f"Doc{i % 2}", text=f"Chunk {i}") for i in range(7)])
+    assert sorted(item.id for item in text_store.iter_all(batch_size=3)) == sorted(f"page_{i}" for i in range(7))
+    projected = list(text_store.iter_all(batch_size=2, fields=["id", "name"]))
+    assert sorted(projected, key=lambda item: item["id"]) == [{"id": f"page_{i}", "name": f"Doc{i % 2}"} for i in range(7)]
+    with pytest.raises(ValueError):
+        next(text_store.iter_all(fields=["missing"]))
+
+def test_delete_and_update_where(text_store):
+    text_store.add_many([TextData(id=f"bulk_{i}", name="Report" if i < 5 else "Keep", text=f"Section {i}") for i in range(8)])
+    assert text_store.update_where({"name": "Report"}, name="Renamed") == 5
+    assert text_store.get("bulk_0").name == "Renamed" and text_store.get("bulk_0").text == "Section 0"
+    assert text_store.delete_where(name="Renamed") == 5
+    assert sorted(item.id for item in text_store.get_all()) == ["bulk_5", "bulk_6", "bulk_7"]
+    assert text_store.delete_where(name="Missing") == 0
+    with pytest.raises(ValueError):
+        text_store.delete_where()
+
+def test_keyword_index_follows_writes_without_rereads(text_store, monkeypatch):
+    text_store.add(TextData(id="16", name="Parts", text="flange P-100"))
+    text_store.search_keywords("flange")
+    with monkeypatch.context() as patch:
+        patch.setattr(text_store, "get", lambda id: pytest.fail("keyword index re-read an entry"))
+        text_store.add_many([TextData(id="16", name="Parts", text="ignored duplicate"), TextData(id="17", name="Parts", text="valve P-200")])
+    text_store.update("16", text="gasket P-100")
+    text_store.update("17", name="Valves")
+    index = text_store._keyword_index
+    assert [id for id, _ in index.search("gasket")] == ["16"] and index.search("flange") == []
+    assert [id for id, _ in index.search("valve", name="Valves")] == ["17"]
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks.__main__ import main
+from benchmarks.data import hashing_embedding
+from benchmarks.imports import IMPORT_BUDGET_MS, measure_import
+
+
+def test_hashing_embedding_is_stable_and_normalized():
+    a, b = hashing_embedding("revenue by region"), hashing_embedding("revenue by region")
+    assert a == b
+    assert abs(sum(x * x for x in a) - 1) < 1e-5
+
+
+def test_benchmark_report(tmp_path):
+    output = tmp_path / "results.json"
+    main(["--size", "tiny", "--only", "sql_backend_index", "rag_agent_text", "--output", str(output), "--workdir", str(tmp_path)])
+    report = json.loads(output.read_text())
+    assert [r["name"] for r in report["results"]] == ["sql_backend_index", "rag_agent_text"]
+    for result in report["results"]:
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+        assert result["throughput_per_s"] > 0
+
+
+def test_import_stays_lazy_and_within_budget():
+    elapsed_ms, heavy = measure_import("agenticrag")
+    assert heavy == []
+    assert elapsed_ms < IMPORT_BUDGET_MS
+
+
+def test_benchmark_reruns_in_same_workdir(tmp_path):
+    for _ in range(2):
+        main(["--size", "tiny", "--only", "rag_agent_text", "--output", str(tmp_path / "results.json"), "--workdir", str(tmp_path / "work")])
+    assert len(list((tmp_path / "work").iterdir())) == 2
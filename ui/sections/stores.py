@@ -1,7 +1,11 @@
+from itertools import islice
 from narwhals import exclude
 import streamlit as st
 from agenticrag.types.core import MetaData, TextData, TableData, ExternalDBData, DataFormat
 
+MAX_DISPLAYED_ROWS = 1000
+
+
 def store_section(agent_bundle):
     comps = agent_bundle.components
     meta_store = comps.get("meta_store")
@@ -21,18 +25,14 @@ def store_section(agent_bundle):
         if old_row.name != new_row.name:
             target_store = store_map.get(new_row.format)
             if target_store:
-                for item in target_store.get_all():
-                    if hasattr(item, "name") and item.name == old_row.name:
-                        target_store.update(item.id, name=new_row.name)
+                target_store.update_where({"name": old_row.name}, name=new_row.name)
         meta_store.update(old_row.id, description=new_row.description, source=new_row.source, name=new_row.name)
 
     def handle_meta_delete(row):
         """Delete corresponding entries in relevant store"""
         target_store = store_map.get(row.format)
         if target_store:
-            for item in target_store.get_all():
-                if hasattr(item, "name") and item.name == row.name:
-                    target_store.delete(item.id)
+            target_store.delete_where(name=row.name)
         meta_store.delete(row.id)
 
     def render_meta_store():
@@ -61,11 +61,13 @@ def store_section(agent_bundle):
 
     def render_store(name, store_obj):
         """Render non-meta store as read-only"""
-        rows = store_obj.get_all() if store_obj else []
+        rows = list(islice(store_obj.iter_all(), MAX_DISPLAYED_ROWS + 1)) if store_obj else []
         with st.expander(name, expanded=False):
             if rows:
-                rows_dicts = [row.model_dump() if hasattr(row, "model_dump") else row for row in rows]
+                rows_dicts = [row.model_dump() if hasattr(row, "model_dump") else row for row in rows[:MAX_DISPLAYED_ROWS]]
                 st.dataframe(rows_dicts, width="stretch")
+                if len(rows) > MAX_DISPLAYED_ROWS:
+                    st.caption(f"Showing the first {MAX_DISPLAYED_ROWS} entries.")
             else:
                 st.write("No data yet.")
 